@@ -1,5 +1,18 @@
+import re
 import numpy as np
-import random
+from buffer_bits import BitBuffer, como_bytes, bits_de
+# O CRC-32 vive no módulo crc32; os nomes continuam disponíveis por aqui (o crc32 já é
+# carregado de qualquer forma, então reexportá-los não custa nada na importação)
+from crc32 import (
+    CRC32_TABLE,
+    gerar_tabela_crc32,
+    calcular_crc32_manual,
+    calcular_crc32,
+    crc32_combine,
+    Crc32
+)
+from paridade import aplicar_paridade_2d, paridade_par, verificar_paridade_2d
+from canal import ModeloIID, injetar_erros
 
 # === ENQUADRAMENTO ===
 
@@ -8,6 +21,7 @@ def enquadramento_contagem(mensagem: bytes) -> bytes:
     Enquadramento por contagem de caracteres.
     O primeiro byte representa o tamanho total do quadro (mensagem + 1).
     """
+    mensagem = como_bytes(mensagem)
     tamanho = len(mensagem) + 1
     if tamanho > 255:
         raise ValueError("Mensagem muito longa para enquadramento por contagem.")
@@ -18,88 +32,233 @@ def desenquadramento_contagem(quadro: bytes) -> bytes:
     Desenquadramento de contagem de caracteres.
     Verifica se o tamanho declarado no primeiro byte corresponde ao real.
     """
+    quadro = como_bytes(quadro)
     if not quadro:
         raise ValueError("Quadro vazio.")
     tamanho = quadro[0]
     if tamanho != len(quadro):
         raise ValueError("Erro no quadro.")
-    return quadro[1:]
+    return bytes(quadro[1:])
 
 def enquadramento_byte_stuffing(mensagem: bytes, flag=b'~', esc=b'\x1B') -> bytes:
     """
     Enquadramento com inserção de bytes (byte stuffing).
     Adiciona FLAGS no início e fim do quadro e insere ESC antes de FLAGS ou ESC dentro da mensagem.
     """
-    resultado = bytearray(flag)
-    for byte in mensagem:
-        if byte == flag[0] or byte == esc[0]:
-            resultado.extend(esc)
-        resultado.append(byte)
-    resultado.extend(flag)
-    return bytes(resultado)
+    mensagem = bytes(como_bytes(mensagem))
+    # Os ESC são duplicados antes, para não escapar os ESC inseridos antes das FLAGS
+    conteudo = mensagem.replace(esc, esc + esc).replace(flag, esc + flag)
+    return b''.join((flag, conteudo, flag))
+
+# Expressões que removem os ESC, compiladas uma vez por byte de escape
+_RE_ESCAPE = {}
+
+def _remover_escapes(conteudo, esc=b'\x1B') -> bytes:
+    """
+    Remove cada ESC e mantém o byte que ele protege.
+    """
+    padrao = _RE_ESCAPE.get(esc)
+    if padrao is None:
+        padrao = _RE_ESCAPE[esc] = re.compile(re.escape(esc) + b'(.)', re.DOTALL)
+    # Um número ímpar de ESC no fim significa um ESC sem o byte protegido
+    if (len(conteudo) - len(conteudo.rstrip(esc))) % 2:
+        raise ValueError("Quadro malformado.")
+    return padrao.sub(rb'\1', conteudo)
 
 def desenquadramento_byte_stuffing(quadro: bytes, flag=b'~', esc=b'\x1B') -> bytes:
     """
     Desenquadramento com remoção de bytes inseridos.
     Remove os bytes de escape (ESC) adicionados antes de FLAGS ou ESC.
     """
+    quadro = bytes(como_bytes(quadro))
     if not (quadro.startswith(flag) and quadro.endswith(flag)):
         raise ValueError("Quadro malformado.")
-    conteudo = quadro[1:-1]
-    resultado = bytearray()
-    i = 0
-    while i < len(conteudo):
-        if conteudo[i:i+1] == esc:
-            i += 1  # Ignora o ESC
-        resultado.append(conteudo[i])
-        i += 1
-    return bytes(resultado)
+    return _remover_escapes(quadro[1:-1], esc)
+
+class DesenquadradorByteStuffing:
+    """
+    Desenquadrador incremental para um fluxo de quadros com byte stuffing.
+    Recebe os pedaços lidos do socket e devolve cada quadro ~...~ completo, sem os ESC,
+    mesmo quando o quadro chega dividido em várias leituras ou quando uma leitura
+    traz vários quadros. FLAGS consecutivas (~~) não geram quadros vazios.
+    """
+
+    def __init__(self, flag=b'~', esc=b'\x1B'):
+        self.flag = flag
+        self.esc = esc
+        self._buffer = bytearray()   # bytes recebidos desde a última FLAG
+        self._busca = 0              # posição do buffer onde a busca por FLAG recomeça
+        self._sincronizado = False   # True depois da primeira FLAG
+
+    def alimentar(self, dados) -> list:
+        """
+        Processa mais um pedaço do fluxo e retorna a lista de quadros completados por ele.
+        """
+        buffer = self._buffer
+        buffer += dados
+        esc = self.esc[0]
+        quadros = []
+        inicio = 0
+        busca = self._busca
+        while True:
+            pos = buffer.find(self.flag, busca)
+            if pos < 0:
+                break
+            busca = pos + 1
+            if self._sincronizado:
+                # A FLAG está escapada se for precedida por um número ímpar de ESC
+                k = pos
+                while k > inicio and buffer[k - 1] == esc:
+                    k -= 1
+                if (pos - k) % 2:
+                    continue
+                if pos > inicio:
+                    quadros.append(_remover_escapes(bytes(buffer[inicio:pos]), self.esc))
+            self._sincronizado = True
+            inicio = busca
+
+        if not self._sincronizado:
+            inicio = len(buffer)  # sem FLAG, os bytes recebidos não pertencem a um quadro
+        del buffer[:inicio]
+        self._busca = max(busca - inicio, len(buffer) - len(self.flag) + 1, 0)
+        return quadros
+
+# FLAG 01111110 que delimita os quadros com bit stuffing
+FLAG_BIT_STUFFING = np.array([0, 1, 1, 1, 1, 1, 1, 0], dtype=np.uint8)
+
+def _quintos_uns(bits: np.ndarray) -> np.ndarray:
+    """
+    Retorna as posições de cada quinto bit '1' consecutivo (5º, 10º, ... de cada sequência).
+    Trabalha sobre as sequências de '1', sem percorrer o quadro bit a bit.
+    """
+    bordas = np.diff(bits.astype(np.int8), prepend=np.int8(0), append=np.int8(0))
+    inicios = np.flatnonzero(bordas == 1)
+    quintos = (np.flatnonzero(bordas == -1) - inicios) // 5
+    longas = quintos > 0
+    inicios, quintos = inicios[longas], quintos[longas]
+    # k-ésimo quinto de uma sequência que começa em i: posição i + 5k - 1
+    k = np.arange(quintos.sum()) - np.repeat(np.cumsum(quintos) - quintos, quintos) + 1
+    return np.repeat(inicios, quintos) + 5 * k - 1
+
+def _localizar_flags(bits: np.ndarray) -> np.ndarray:
+    """
+    Retorna as posições (em bits) onde a FLAG 01111110 começa.
+    """
+    n = bits.size - FLAG_BIT_STUFFING.size + 1
+    if n <= 0:
+        return np.zeros(0, dtype=np.int64)
+    mascara = np.ones(n, dtype=bool)
+    for k, b in enumerate(FLAG_BIT_STUFFING):
+        mascara &= bits[k:k + n] == b
+    return np.flatnonzero(mascara)
+
+def _inserir_bits(bits: np.ndarray) -> np.ndarray:
+    """
+    Insere um '0' após cada quinto bit '1' consecutivo.
+    """
+    return np.insert(bits, _quintos_uns(bits) + 1, 0)
+
+def _remover_bits(bits: np.ndarray) -> np.ndarray:
+    """
+    Remove o bit que segue cada quinto bit '1' consecutivo (o '0' inserido).
+    """
+    posicoes = _quintos_uns(bits) + 1
+    return np.delete(bits, posicoes[posicoes < bits.size])
 
 def enquadramento_bit_stuffing(mensagem: bytes) -> bytes:
     """
     Enquadramento com inserção de bits (bit stuffing).
     Após cinco bits '1' consecutivos, insere um bit '0'.
     Adiciona também a FLAG 01111110 no início e fim do quadro.
+    O último byte é completado com zeros após a FLAG final.
     """
-    bits = ''.join(f'{byte:08b}' for byte in mensagem)
-    stuffed = ''
-    cont = 0
-    for b in bits:
-        if b == '1':
-            cont += 1
-            stuffed += b
-            if cont == 5:
-                stuffed += '0'
-                cont = 0
-        else:
-            stuffed += b
-            cont = 0
-    stuffed = '01111110' + stuffed + '01111110'
-    return int(stuffed, 2).to_bytes((len(stuffed) + 7) // 8, byteorder='big')
+    stuffed = _inserir_bits(bits_de(mensagem))
+    quadro = np.concatenate((FLAG_BIT_STUFFING, stuffed, FLAG_BIT_STUFFING))
+    return BitBuffer.from_bits(quadro).tobytes()
 
 def desenquadramento_bit_stuffing(quadro: bytes) -> bytes:
     """
     Remove o bit stuffing e as FLAGS do quadro.
     Após cinco bits '1', remove o bit '0' inserido.
+    Os bits de preenchimento após a FLAG final são ignorados.
     """
-    bits = ''.join(f'{byte:08b}' for byte in quadro)
-    bits = bits[8:-8]  # Remove as flags (01111110)
-    destuffed = ''
-    cont = 0
-    i = 0
-    while i < len(bits):
-        b = bits[i]
-        if b == '1':
-            cont += 1
-            destuffed += b
-            if cont == 5:
-                i += 1  # Pula o bit '0' inserido
-                cont = 0
-        else:
-            destuffed += b
-            cont = 0
-        i += 1
-    return int(destuffed, 2).to_bytes((len(destuffed) + 7) // 8, byteorder='big')
+    bits = bits_de(quadro)
+    flags = _localizar_flags(bits)
+    if flags.size < 2 or flags[0] != 0:
+        raise ValueError("Quadro malformado.")
+    # Dentro do quadro não há seis '1' seguidos, então a primeira FLAG após a inicial é a final
+    fim = flags[flags >= FLAG_BIT_STUFFING.size][0]
+    destuffed = _remover_bits(bits[FLAG_BIT_STUFFING.size:fim])
+    if destuffed.size % 8 != 0:
+        raise ValueError("Quadro malformado.")
+    return BitBuffer.from_bits(destuffed).tobytes()
+
+class DesenquadradorBitStuffing:
+    """
+    Desenquadrador incremental para um fluxo contínuo de quadros com bit stuffing
+    (estilo HDLC). Recebe pedaços arbitrários do fluxo de bytes, encontra as FLAGS
+    01111110 mesmo quando divididas entre dois pedaços e devolve os quadros completos
+    já sem o bit stuffing.
+
+    Trechos vazios entre FLAGS ou que não formam um número inteiro de bytes (preenchimento
+    entre quadros ou quadros corrompidos) são descartados.
+    """
+
+    def __init__(self):
+        self._sincronizado = False   # True depois da primeira FLAG
+        self._fim_flag = 0           # posição absoluta logo após a última FLAG
+        self._total = 0              # total de bits recebidos
+        self._partes = []            # bits recebidos desde o fim da última FLAG
+        self._cauda = np.zeros(0, dtype=np.uint8)  # últimos 7 bits recebidos
+        self.descartados = 0
+
+    def alimentar(self, dados) -> list:
+        """
+        Processa mais um pedaço do fluxo e retorna a lista de quadros completados por ele.
+        """
+        novos = bits_de(dados)
+        tamanho_flag = FLAG_BIT_STUFFING.size
+
+        # A busca inclui os bits finais do pedaço anterior, para achar FLAGS divididas
+        janela = np.concatenate((self._cauda, novos))
+        flags = _localizar_flags(janela) + (self._total - self._cauda.size)
+
+        quadros = []
+        if flags.size:
+            origem = self._total - sum(parte.size for parte in self._partes)
+            trecho = np.concatenate(self._partes + [novos])
+            for posicao in flags:
+                if posicao < self._fim_flag:
+                    continue  # sobreposta à FLAG anterior
+                if self._sincronizado:
+                    conteudo = trecho[self._fim_flag - origem:posicao - origem]
+                    destuffed = _remover_bits(conteudo)
+                    if destuffed.size and destuffed.size % 8 == 0:
+                        quadros.append(BitBuffer.from_bits(destuffed).tobytes())
+                    elif destuffed.size >= 8:
+                        self.descartados += 1
+                self._sincronizado = True
+                self._fim_flag = posicao + tamanho_flag
+            self._partes = [trecho[self._fim_flag - origem:]] if self._sincronizado else []
+        elif self._sincronizado:
+            self._partes.append(novos)
+
+        self._total += novos.size
+        self._cauda = janela[-(tamanho_flag - 1):]
+        return quadros
+
+# Funções de enquadramento e desenquadramento pelo nome usado na interface
+ENQUADRAMENTOS = {
+    "Contagem": enquadramento_contagem,
+    "Byte Stuffing": enquadramento_byte_stuffing,
+    "Bit Stuffing": enquadramento_bit_stuffing
+}
+
+DESENQUADRAMENTOS = {
+    "Contagem": desenquadramento_contagem,
+    "Byte Stuffing": desenquadramento_byte_stuffing,
+    "Bit Stuffing": desenquadramento_bit_stuffing
+}
 
 # === DETECÇÃO DE ERROS ===
 
@@ -107,41 +266,16 @@ def aplicar_paridade_par(dados: bytes) -> bytes:
     """
     Aplica bit de paridade par no final do quadro.
     Adiciona '1' se a contagem de bits '1' for ímpar, senão adiciona '0'.
+    A contagem vem do motor de paridade (XOR de todos os bytes), sem desempacotar os bits.
     """
-    bits = ''.join(f'{b:08b}' for b in dados)
-    return dados + bytes([1]) if bits.count('1') % 2 != 0 else dados + bytes([0])
-
-# --- INÍCIO DA IMPLEMENTAÇÃO MANUAL DO CRC-32 ---
-
-def gerar_tabela_crc32() -> tuple:
-    """
-    Gera a tabela de consulta para o cálculo rápido do CRC-32.
-    O polinômio 0xEDB88320 é a representação refletida do polinômio padrão.
-    """
-    polinomio_refletido = 0xEDB88320
-    tabela_crc = []
-    for i in range(256):
-        crc = i
-        for _ in range(8):
-            if crc & 1:
-                crc = (crc >> 1) ^ polinomio_refletido
-            else:
-                crc = crc >> 1
-        tabela_crc.append(crc)
-    return tuple(tabela_crc)
+    dados = bytes(como_bytes(dados))
+    return dados + bytes([paridade_par(dados)])
 
-# A tabela é gerada uma única vez quando o módulo é carregado
-CRC32_TABLE = gerar_tabela_crc32()
+# A paridade bidimensional (aplicar_paridade_2d/verificar_paridade_2d), que também
+# corrige um bit errado, fica no módulo paridade.
 
-def calcular_crc32_manual(dados: bytes) -> int:
-    """
-    Calcula o checksum CRC-32 (padrão IEEE 802.3) para um conjunto de dados.
-    """
-    crc = 0xFFFFFFFF
-    for byte in dados:
-        indice = (crc ^ byte) & 0xFF
-        crc = (crc >> 8) ^ CRC32_TABLE[indice]
-    return crc ^ 0xFFFFFFFF
+# --- CRC-32 ---
+# A tabela, o cálculo manual e as variantes rápidas ficam no módulo crc32.
 
 def aplicar_crc32(dados: bytes) -> bytes:
     """
@@ -150,8 +284,8 @@ def aplicar_crc32(dados: bytes) -> bytes:
     """
     # Linha original foi substituída:
     # crc = zlib.crc32(dados) & 0xFFFFFFFF
-    crc = calcular_crc32_manual(dados)
-    return dados + crc.to_bytes(4, 'big')
+    crc = calcular_crc32(dados)
+    return bytes(como_bytes(dados)) + crc.to_bytes(4, 'big')
 
 # --- FIM DA IMPLEMENTAÇÃO DO CRC-32 ---
 
@@ -168,150 +302,279 @@ def calcular_bits_paridade(m: int) -> int:
         r += 1
     return r
 
+def _produto_mod2(a: np.ndarray, b: np.ndarray) -> np.ndarray:
+    """
+    Produto de matrizes de bits módulo 2.
+    O produto é feito em float32 (BLAS); as somas são inteiras e pequenas, portanto exatas.
+    """
+    return (a.astype(np.float32) @ b).astype(np.uint8) & 1
+
+class CodecHamming:
+    """
+    Codec Hamming(n, m) com as matrizes calculadas uma única vez:
+    G (m x n) gera as palavras-código, H (r x n) calcula a síndrome e a tabela de
+    síndromes indica qual bit inverter.
+    As posições seguem o layout clássico: bits de paridade nas posições potência de 2
+    (1, 2, 4, ...) e bits de dados nas demais, em ordem.
+    """
+
+    def __init__(self, m: int):
+        if m < 1:
+            raise ValueError("O número de bits de dados (m) deve ser pelo menos 1.")
+        self.m = m
+        self.r = calcular_bits_paridade(m)
+        self.n = m + self.r
+
+        posicoes = np.arange(1, self.n + 1)
+        eh_paridade = (posicoes & (posicoes - 1)) == 0
+        # Colunas (índices a partir de 0) ocupadas pelos bits de dados
+        self.colunas_dados = np.flatnonzero(~eh_paridade)
+
+        # Linha j de H: posições que têm o bit 2^j ligado
+        self.H = ((posicoes >> np.arange(self.r)[:, None]) & 1).astype(np.uint8)
+
+        # Linha i de G: palavra-código gerada pelo i-ésimo bit de dados isolado
+        self.G = np.zeros((m, self.n), dtype=np.uint8)
+        self.G[np.arange(m), self.colunas_dados] = 1
+        self.G[:, np.flatnonzero(eh_paridade)] = self.H[:, self.colunas_dados].T
+
+        # A síndrome, lida como inteiro, é a posição do bit errado (0 = sem erro)
+        self.pesos_sindrome = (1 << np.arange(self.r)).astype(np.float32)
+        sindromes = np.arange(2 ** self.r)
+        self.tabela_sindromes = np.where((sindromes >= 1) & (sindromes <= self.n), sindromes - 1, -1)
+
+        self._G = self.G.astype(np.float32)
+        self._Ht = self.H.T.astype(np.float32)
+
+    def codificar_bits(self, bits: np.ndarray) -> np.ndarray:
+        """
+        Codifica um fluxo de bits, completando o último bloco de m bits com zeros.
+        """
+        bits = np.asarray(bits, dtype=np.uint8)
+        blocos = np.zeros(-(-bits.size // self.m) * self.m, dtype=np.uint8)
+        blocos[:bits.size] = bits
+        return _produto_mod2(blocos.reshape(-1, self.m), self._G).reshape(-1)
+
+    def decodificar_bits(self, bits: np.ndarray, retornar_corrigidos: bool = False):
+        """
+        Decodifica um fluxo de palavras-código de n bits, corrigindo um bit por bloco.
+        Bits que não completam um bloco (padding) são ignorados.
+        Com retornar_corrigidos=True, retorna também quantos blocos foram corrigidos.
+        """
+        bits = np.asarray(bits, dtype=np.uint8)
+        dados, corrigidos = self.decodificar_blocos(bits[:bits.size // self.n * self.n].reshape(-1, self.n))
+        dados = dados.reshape(-1)
+        if retornar_corrigidos:
+            return dados, int(corrigidos.sum())
+        return dados
+
+    def decodificar_blocos(self, blocos: np.ndarray) -> tuple:
+        """
+        Decodifica uma matriz de palavras-código (uma por linha, n colunas).
+        Retorna (bits de dados, k x m; máscara dos blocos em que um bit foi corrigido).
+        """
+        blocos = np.array(blocos, dtype=np.uint8)
+        sindromes = (_produto_mod2(blocos, self._Ht) @ self.pesos_sindrome).astype(np.intp)
+        erros = self.tabela_sindromes[sindromes]
+        corrigidos = erros >= 0
+        linhas = np.flatnonzero(corrigidos)
+        blocos[linhas, erros[linhas]] ^= 1
+        return blocos[:, self.colunas_dados], corrigidos
+
+    def codificar(self, dados: bytes) -> bytes:
+        return BitBuffer.from_bits(self.codificar_bits(bits_de(dados))).tobytes()
+
+    def decodificar(self, codigo: bytes, retornar_corrigidos: bool = False):
+        dados, corrigidos = self.decodificar_bits(bits_de(codigo), retornar_corrigidos=True)
+        # Bits que não completam um byte são descartados
+        dados = BitBuffer.from_bits(dados[:dados.size // 8 * 8]).tobytes()
+        if retornar_corrigidos:
+            return dados, corrigidos
+        return dados
+
+# Um codec por valor de m, criado na primeira utilização
+_CODECS_HAMMING = {}
+
+def obter_codec_hamming(m: int) -> CodecHamming:
+    """
+    Retorna o codec Hamming para m bits de dados, criando-o apenas uma vez.
+    """
+    codec = _CODECS_HAMMING.get(m)
+    if codec is None:
+        codec = _CODECS_HAMMING[m] = CodecHamming(m)
+    return codec
+
 def codificar_hamming(dados: bytes, m: int) -> bytes:
     """
     Codifica dados usando o código de Hamming com m bits de dados.
     Os bits de paridade (r) são calculados e os blocos (n=m+r) são formados.
     """
-    if m < 1:
-        raise ValueError("O número de bits de dados (m) deve ser pelo menos 1.")
-
-    r = calcular_bits_paridade(m)
-    n = m + r
-
-    # 1. Converter bytes de entrada em um fluxo de bits
-    bits_dados = [int(b) for byte in dados for b in f"{byte:08b}"]
-    
-    # Adicionar padding para que o total de bits seja múltiplo de m
-    if len(bits_dados) % m != 0:
-        bits_dados.extend([0] * (m - (len(bits_dados) % m)))
-
-    bits_codificados = []
-    # 2. Processar em blocos de m bits
-    for i in range(0, len(bits_dados), m):
-        bloco = bits_dados[i:i+m]
-        
-        # 3. Construir o bloco codificado (n bits)
-        codeword = [0] * n
-        idx_dados = 0
-        # Inserir bits de dados nas posições que não são potência de 2
-        for j in range(n):
-            pos = j + 1
-            if (pos & (pos - 1)) != 0:  # Se não for potência de 2
-                if idx_dados < len(bloco):
-                    codeword[j] = bloco[idx_dados]
-                    idx_dados += 1
-        
-        # 4. Calcular e inserir os bits de paridade
-        for j in range(r):
-            pos_paridade = 2**j
-            xor_val = 0
-            for k in range(n):
-                pos_dado = k + 1
-                if (pos_dado != pos_paridade) and (pos_dado & pos_paridade):
-                    xor_val ^= codeword[k]
-            codeword[pos_paridade - 1] = xor_val
-        
-        bits_codificados.extend(codeword)
-        
-    # 5. Converter o fluxo de bits codificados de volta para bytes
-    # Adicionar padding para que o total seja múltiplo de 8
-    if len(bits_codificados) % 8 != 0:
-        bits_codificados.extend([0] * (8 - (len(bits_codificados) % 8)))
-        
-    resultado_bytes = bytearray()
-    for i in range(0, len(bits_codificados), 8):
-        byte = 0
-        for j in range(8):
-            byte = (byte << 1) | bits_codificados[i+j]
-        resultado_bytes.append(byte)
-        
-    return bytes(resultado_bytes)
+    return obter_codec_hamming(m).codificar(dados)
 
 
 def decodificar_hamming(codigo: bytes, m: int) -> bytes:
     """
     Decodifica e corrige erros em dados codificados com Hamming(n, m).
     """
-    if m < 1:
-        raise ValueError("O número de bits de dados (m) deve ser pelo menos 1.")
-
-    r = calcular_bits_paridade(m)
-    n = m + r
-    
-    # 1. Converter bytes codificados em um fluxo de bits
-    bits_codificados = [int(b) for byte in codigo for b in f"{byte:08b}"]
-
-    bits_decodificados = []
-    # 2. Processar em blocos de n bits
-    for i in range(0, len(bits_codificados), n):
-        bloco = bits_codificados[i:i+n]
-        if len(bloco) < n:
-            continue # Ignora blocos incompletos (padding)
-
-        # 3. Calcular a síndrome para detectar/localizar o erro
-        pos_erro = 0
-        for j in range(r):
-            pos_paridade = 2**j
-            xor_val = 0
-            for k in range(n):
-                pos_atual = k + 1
-                if pos_atual & pos_paridade:
-                    xor_val ^= bloco[k]
-            
-            if xor_val != 0:
-                pos_erro += pos_paridade
-        
-        # 4. Corrigir o erro, se houver
-        if pos_erro > 0 and pos_erro <= n:
-            bloco[pos_erro - 1] ^= 1 # Inverte o bit errado
-
-        # 5. Extrair os bits de dados originais
-        idx_dados = 0
-        for j in range(n):
-            pos = j + 1
-            if (pos & (pos - 1)) != 0: # Se não for potência de 2
-                bits_decodificados.append(bloco[j])
-
-    # 6. Converter o fluxo de bits decodificados de volta para bytes
-    resultado_bytes = bytearray()
-    for i in range(0, len(bits_decodificados) - 7, 8):
-        byte = 0
-        for j in range(8):
-            byte = (byte << 1) | bits_decodificados[i+j]
-        resultado_bytes.append(byte)
-        
-    return bytes(resultado_bytes)
-
-def introduzir_erro_por_taxa(dados: bytes, taxa_de_erro: float) -> bytes:
+    return obter_codec_hamming(m).decodificar(codigo)
+
+# === VARIANTES SEM CÓPIA (*_into) ===
+#
+# Escrevem o resultado em um buffer do chamador (bytearray, memoryview ou array NumPy)
+# e retornam o número de bytes escritos. As entradas podem ser memoryviews de outro
+# buffer (por exemplo, do buffer de recepção do socket), que são lidas sem cópia.
+# anexar_paridade_par/anexar_crc32 completam no próprio buffer um quadro que já está
+# nele, para que enquadramento e detecção de erros usem um único buffer:
+#   n = enquadramento_contagem_into(mensagem, buffer)
+#   n = anexar_crc32(buffer, n)
+#   sock.sendall(memoryview(buffer)[:n])
+
+def _visao(dados) -> memoryview:
+    """memoryview de bytes (formato 'B') sobre os dados, sem cópia."""
+    visao = memoryview(como_bytes(dados))
+    return visao if visao.format == 'B' and visao.ndim == 1 else visao.cast('B')
+
+def _verificar_espaco(saida, necessario: int) -> memoryview:
+    saida = _visao(saida)
+    if len(saida) < necessario:
+        raise ValueError(f"Buffer de saída pequeno demais ({len(saida)} < {necessario} bytes).")
+    return saida
+
+def enquadramento_contagem_into(mensagem, saida) -> int:
+    mensagem = _visao(mensagem)
+    tamanho = len(mensagem) + 1
+    if tamanho > 255:
+        raise ValueError("Mensagem muito longa para enquadramento por contagem.")
+    saida = _verificar_espaco(saida, tamanho)
+    saida[0] = tamanho
+    saida[1:tamanho] = mensagem
+    return tamanho
+
+def desenquadramento_contagem_into(quadro, saida) -> int:
+    quadro = _visao(quadro)
+    if not quadro:
+        raise ValueError("Quadro vazio.")
+    if quadro[0] != len(quadro):
+        raise ValueError("Erro no quadro.")
+    saida = _verificar_espaco(saida, len(quadro) - 1)
+    saida[:len(quadro) - 1] = quadro[1:]
+    return len(quadro) - 1
+
+def enquadramento_byte_stuffing_into(mensagem, saida, flag=b'~', esc=b'\x1B') -> int:
+    mensagem = _visao(mensagem)
+    # Sem FLAG nem ESC (o caso comum) a mensagem é copiada direto para a saída
+    if esc[0] in mensagem or flag[0] in mensagem:
+        conteudo = _visao(mensagem.tobytes().replace(esc, esc + esc).replace(flag, esc + flag))
+    else:
+        conteudo = mensagem
+    n = len(conteudo)
+    saida = _verificar_espaco(saida, n + 2)
+    saida[0] = saida[n + 1] = flag[0]
+    saida[1:n + 1] = conteudo
+    return n + 2
+
+def desenquadramento_byte_stuffing_into(quadro, saida, flag=b'~', esc=b'\x1B') -> int:
+    quadro = _visao(quadro)
+    if len(quadro) < 2 or quadro[0] != flag[0] or quadro[-1] != flag[0]:
+        raise ValueError("Quadro malformado.")
+    conteudo = quadro[1:-1]
+    saida = _verificar_espaco(saida, len(conteudo))
+    padrao = _RE_ESCAPE.get(esc)
+    if padrao is None:
+        padrao = _RE_ESCAPE[esc] = re.compile(re.escape(esc) + b'(.)', re.DOTALL)
+    # Copia os trechos entre os ESC; o byte protegido por um ESC abre o trecho seguinte
+    n = inicio = fim_escape = 0
+    for escape in padrao.finditer(conteudo):
+        k = escape.start()
+        saida[n:n + k - inicio] = conteudo[inicio:k]
+        n += k - inicio
+        inicio = k + 1
+        fim_escape = escape.end()
+    if conteudo and conteudo[-1] == esc[0] and fim_escape != len(conteudo):
+        raise ValueError("Quadro malformado.")
+    saida[n:n + len(conteudo) - inicio] = conteudo[inicio:]
+    return n + len(conteudo) - inicio
+
+def anexar_paridade_par(buffer, tamanho: int) -> int:
+    """Anexa o byte de paridade aos `tamanho` primeiros bytes do buffer."""
+    buffer = _verificar_espaco(buffer, tamanho + 1)
+    buffer[tamanho] = paridade_par(buffer[:tamanho])
+    return tamanho + 1
+
+def aplicar_paridade_par_into(dados, saida) -> int:
+    dados = _visao(dados)
+    saida = _verificar_espaco(saida, len(dados) + 1)
+    saida[:len(dados)] = dados
+    return anexar_paridade_par(saida, len(dados))
+
+def verificar_paridade_par(quadro) -> tuple:
+    """(tamanho do payload, True se a paridade não confere) de um quadro com paridade."""
+    quadro = _visao(quadro)
+    if not quadro:
+        raise ValueError("Quadro de paridade inválido.")
+    return len(quadro) - 1, quadro[-1] != paridade_par(quadro[:-1])
+
+def anexar_crc32(buffer, tamanho: int) -> int:
+    """Anexa o CRC-32 (4 bytes big-endian) aos `tamanho` primeiros bytes do buffer."""
+    buffer = _verificar_espaco(buffer, tamanho + 4)
+    buffer[tamanho:tamanho + 4] = calcular_crc32(buffer[:tamanho]).to_bytes(4, 'big')
+    return tamanho + 4
+
+def aplicar_crc32_into(dados, saida) -> int:
+    dados = _visao(dados)
+    saida = _verificar_espaco(saida, len(dados) + 4)
+    saida[:len(dados)] = dados
+    return anexar_crc32(saida, len(dados))
+
+def verificar_crc32(quadro) -> tuple:
+    """(tamanho do payload, True se o CRC não confere) de um quadro com CRC-32."""
+    quadro = _visao(quadro)
+    if len(quadro) < 4:
+        raise ValueError("Quadro de CRC inválido.")
+    return len(quadro) - 4, int.from_bytes(quadro[-4:], 'big') != calcular_crc32(quadro[:-4])
+
+# Variantes sem cópia pelo nome usado na interface
+ENQUADRAMENTOS_INTO = {
+    "Contagem": enquadramento_contagem_into,
+    "Byte Stuffing": enquadramento_byte_stuffing_into,
+}
+
+DESENQUADRAMENTOS_INTO = {
+    "Contagem": desenquadramento_contagem_into,
+    "Byte Stuffing": desenquadramento_byte_stuffing_into,
+}
+
+# === CADEIA DE TRANSMISSÃO ===
+
+def montar_quadro(dados: bytes, enq_tipo: str, err_tipo: str, m_bits: int = 4) -> bytes:
+    """
+    Aplica o enquadramento e depois a detecção/correção de erros, como o transmissor.
+    Os tipos usam os mesmos nomes da interface ("Contagem", "CRC", "Hamming", ...).
+    """
+    enquadrar = ENQUADRAMENTOS.get(enq_tipo)
+    if not enquadrar:
+        raise ValueError("Tipo de enquadramento desconhecido.")
+    quadro = enquadrar(dados)
+
+    if err_tipo == "Paridade":
+        return aplicar_paridade_par(quadro)
+    elif err_tipo == "CRC":
+        return aplicar_crc32(quadro)
+    elif err_tipo == "Paridade 2D":
+        return aplicar_paridade_2d(quadro)
+    elif err_tipo == "Hamming":
+        return codificar_hamming(quadro, m=m_bits)
+    raise ValueError("Tipo de detecção/correção desconhecido.")
+
+def introduzir_erro_por_taxa(dados: bytes, taxa_de_erro: float, semente=None) -> bytes:
     """
     Inverte bits em um quadro de dados com base em uma taxa de erro probabilística.
+    Para obter as posições invertidas ou usar outros modelos de erro, veja canal.injetar_erros.
 
     Args:
         dados: O quadro de bytes original.
         taxa_de_erro: A probabilidade (entre 0.0 e 1.0) de um bit ser invertido.
+        semente: Semente (ou numpy.random.Generator) para reproduzir os erros.
     """
-    if not (0.0 <= taxa_de_erro <= 1.0):
-        raise ValueError("A taxa de erro deve estar entre 0.0 e 1.0")
-
-    # Converte os bytes para uma lista mutável de bits (0s e 1s)
-    bits = [int(b) for byte in dados for b in f"{byte:08b}"]
-    
-    erros_introduzidos = 0
-    # Percorre cada bit
-    for i in range(len(bits)):
-        # Sorteia um número aleatório entre 0 e 1
-        if random.random() < taxa_de_erro:
-            # Se o número sorteado for menor que a taxa, inverte o bit
-            bits[i] ^= 1  # Operação XOR para inverter (0->1, 1->0)
-            erros_introduzidos += 1
-            
-    print(f"Taxa de erro de {taxa_de_erro*100:.2f}% aplicada. Total de {erros_introduzidos} bits invertidos.")
-
-    # Reagrupa os bits de volta em bytes
-    bytes_modificados = bytearray()
-    for i in range(0, len(bits), 8):
-        byte_str = "".join(map(str, bits[i:i+8]))
-        bytes_modificados.append(int(byte_str, 2))
-    
-    return bytes(bytes_modificados)
\ No newline at end of file
+    quadro, _ = injetar_erros(dados, ModeloIID(taxa_de_erro), semente)
+    return bytes(quadro)
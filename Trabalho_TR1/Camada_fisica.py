@@ -1,112 +1,305 @@
 import numpy as np
-import matplotlib.pyplot as plt
+from sinal import Signal
 
 # === MODULAÇÕES BANDA BASE ===
+#
+# Todos os moduladores retornam (t, signal). Com retornar_sinal=True retornam um Signal,
+# sem montar o eixo de tempo; dtype escolhe o tipo das amostras (por exemplo int8 para
+# os níveis de banda base e float32 para as portadoras, ver DTYPE_COMPACTO).
 
-def nrz_polar(bits, bit_duration=1, samples_per_bit=100):
+def _como_array_bits(bits) -> np.ndarray:
+    """
+    Converte os bits de entrada (lista de 0/1 ou array uint8) em um array uint8.
+    Arrays uint8 são usados diretamente, sem cópia.
+    """
+    return np.asarray(bits, dtype=np.uint8)
+
+
+def _eixo_tempo(total_amostras: int, bit_duration, samples_per_bit) -> np.ndarray:
+    """
+    Eixo de tempo uniforme: a amostra k ocorre em k * bit_duration / samples_per_bit.
+    A multiplicação vem antes da divisão, na mesma ordem dos codificadores originais,
+    para que os instantes sejam idênticos até o último bit.
+    """
+    return np.arange(total_amostras) * bit_duration / samples_per_bit
+
+
+def _resultado(signal, bit_duration, samples_per_bit, retornar_sinal):
+    if retornar_sinal:
+        return Signal(signal, bit_duration / samples_per_bit)
+    return _eixo_tempo(signal.size, bit_duration, samples_per_bit), signal
+
+
+def _niveis(niveis: np.ndarray, dtype) -> np.ndarray:
+    """Níveis de banda base no dtype pedido, convertidos antes de repetir as amostras."""
+    return niveis if dtype is None else niveis.astype(dtype)
+
+
+def nrz_polar(bits, bit_duration=1, samples_per_bit=100, dtype=None, retornar_sinal=False):
     """
     Modulação NRZ-Polar: 1 -> +1, 0 -> -1 (nível constante).
     """
-    t, signal = [], []
-    for bit in bits:
-        value = 1 if bit == 1 else -1
-        for _ in range(samples_per_bit):
-            t.append(len(signal) * bit_duration / samples_per_bit)
-            signal.append(value)
-    return np.array(t), np.array(signal)
+    bits = _como_array_bits(bits)
+    niveis = _niveis(np.where(bits == 1, 1, -1), dtype)
+    signal = np.repeat(niveis, samples_per_bit)
+    return _resultado(signal, bit_duration, samples_per_bit, retornar_sinal)
 
 
-def manchester(bits, bit_duration=1, samples_per_bit=100):
+def manchester(bits, bit_duration=1, samples_per_bit=100, dtype=None, retornar_sinal=False):
     """
     Modulação Manchester: 0 -> +1/-1, 1 -> -1/+1 (transição no meio do bit).
     """
-    t, signal = [], []
-    for bit in bits:
-        first = 1 if bit == 0 else -1
-        second = -first
-        for _ in range(samples_per_bit // 2):
-            t.append(len(signal) * bit_duration / samples_per_bit)
-            signal.append(first)
-        for _ in range(samples_per_bit // 2):
-            t.append(len(signal) * bit_duration / samples_per_bit)
-            signal.append(second)
-    return np.array(t), np.array(signal)
+    bits = _como_array_bits(bits)
+    first = _niveis(np.where(bits == 0, 1, -1), dtype)
+    # Cada bit vira o par (first, -first), cada metade com samples_per_bit // 2 amostras
+    metades = np.stack((first, -first), axis=1).reshape(-1)
+    signal = np.repeat(metades, samples_per_bit // 2)
+    return _resultado(signal, bit_duration, samples_per_bit, retornar_sinal)
 
 
-def bipolar(bits, bit_duration=1, samples_per_bit=100):
+def bipolar(bits, bit_duration=1, samples_per_bit=100, dtype=None, retornar_sinal=False):
     """
     Modulação Bipolar: 0 -> 0, 1 alterna entre +1 e -1.
     """
-    t, signal = [], []
-    last = -1
-    for bit in bits:
-        if bit == 0:
-            value = 0
-        else:
-            last *= -1
-            value = last
-        for _ in range(samples_per_bit):
-            t.append(len(signal) * bit_duration / samples_per_bit)
-            signal.append(value)
-    return np.array(t), np.array(signal)
+    bits = _como_array_bits(bits)
+    # Estado AMI: o k-ésimo bit '1' (contando a partir de 1) vale +1 se k for ímpar, -1 se par
+    contagem_uns = np.cumsum(bits == 1)
+    niveis = _niveis(np.where(bits == 1, np.where(contagem_uns % 2 == 1, 1, -1), 0), dtype)
+    signal = np.repeat(niveis, samples_per_bit)
+    return _resultado(signal, bit_duration, samples_per_bit, retornar_sinal)
+
+# === MOTOR DE SÍNTESE POR TEMPLATES ===
+
+# Cache das formas de onda pré-calculadas, preenchido sob demanda.
+# As chaves começam por (samples_per_bit, freq, bit_duration) da portadora.
+_CACHE_TEMPLATES = {}
+
+# Pontos (I, Q) da constelação 8-QAM, indexados pelo trio de bits b0b1b2 lido como inteiro
+QAM8_CONSTELACAO = np.array([
+    (1, 1),  (1, -1),  (-1, 1), (-1, -1),
+    (3, 1),  (3, -1),  (-3, 1), (-3, -1),
+])
+
+
+def _em_cache(chave, fabrica) -> np.ndarray:
+    """
+    Retorna a tabela associada à chave, calculando-a com fabrica() apenas na primeira vez.
+    As tabelas são somente leitura, pois são compartilhadas entre chamadas.
+    """
+    tabela = _CACHE_TEMPLATES.get(chave)
+    if tabela is None:
+        tabela = fabrica()
+        tabela.setflags(write=False)
+        _CACHE_TEMPLATES[chave] = tabela
+    return tabela
+
+
+def templates_portadora(samples_per_bit, freq, bit_duration=1) -> np.ndarray:
+    """
+    Seno e cosseno da portadora ao longo de um símbolo, com fase zero no início.
+    Retorna um array (2, samples_per_bit): linha 0 = seno, linha 1 = cosseno.
+    """
+    def fabrica():
+        fase = 2 * np.pi * freq * _eixo_tempo(samples_per_bit, bit_duration, samples_per_bit)
+        return np.stack((np.sin(fase), np.cos(fase)))
+    return _em_cache((samples_per_bit, freq, bit_duration), fabrica)
+
+
+def templates_ask(samples_per_bit, freq, bit_duration=1) -> np.ndarray:
+    """
+    Formas de onda ASK para os símbolos 0 (A=0.3) e 1 (A=1).
+    """
+    def fabrica():
+        seno = templates_portadora(samples_per_bit, freq, bit_duration)[0]
+        return np.stack((0.3 * seno, seno))
+    return _em_cache(("ASK", samples_per_bit, freq, bit_duration), fabrica)
+
+
+def templates_fsk(samples_per_bit, f0, f1, bit_duration=1) -> np.ndarray:
+    """
+    Formas de onda FSK para os símbolos 0 (f0) e 1 (f1).
+    Retorna um array (2, 2, samples_per_bit) indexado por [símbolo, seno/cosseno].
+    O cosseno é usado pela síntese com fase contínua.
+    """
+    def fabrica():
+        return np.stack((templates_portadora(samples_per_bit, f0, bit_duration),
+                         templates_portadora(samples_per_bit, f1, bit_duration)))
+    return _em_cache(("FSK", samples_per_bit, f0, f1, bit_duration), fabrica)
+
+
+def templates_qam8(samples_per_bit, carrier_freq, bit_duration=1) -> np.ndarray:
+    """
+    Formas de onda 8-QAM (I*cos + Q*sin) para os 8 símbolos da constelação.
+    """
+    def fabrica():
+        seno, cosseno = templates_portadora(samples_per_bit, carrier_freq, bit_duration)
+        I, Q = QAM8_CONSTELACAO[:, :1], QAM8_CONSTELACAO[:, 1:]
+        return I * cosseno + Q * seno
+    return _em_cache(("8-QAM", samples_per_bit, carrier_freq, bit_duration), fabrica)
+
+
+def _converter_templates(templates, dtype) -> np.ndarray:
+    """
+    Converte a tabela de templates antes da síntese, para o sinal já nascer no dtype pedido.
+    """
+    if dtype is None:
+        return templates
+    if not np.issubdtype(dtype, np.floating):
+        raise ValueError("Modulações por portadora precisam de amostras de ponto flutuante.")
+    return templates.astype(dtype, copy=False)
+
+
+def sintetizar(simbolos, templates, dtype=None) -> np.ndarray:
+    """
+    Monta o sinal de um quadro inteiro com uma única indexação: a forma de onda de cada
+    símbolo é copiada da tabela de templates e as linhas são concatenadas.
+    """
+    return _converter_templates(templates, dtype)[simbolos].reshape(-1)
 
 # === MODULAÇÕES POR PORTADORA ===
 
-def ask_modulation(bits, bit_duration=1, samples_per_bit=100, freq=5):
+def ask_modulation(bits, bit_duration=1, samples_per_bit=100, freq=5, dtype=None,
+                   retornar_sinal=False):
     """
     Modulação ASK (Amplitude Shift Keying): bit 1 → A=1, bit 0 → A=0.3.
     """
-    total_samples = len(bits) * samples_per_bit
-    t = np.linspace(0, bit_duration * len(bits), total_samples)
-    signal = np.zeros(total_samples)
-    for i, bit in enumerate(bits):
-        A = 1 if bit == 1 else 0.3
-        for j in range(samples_per_bit):
-            idx = i * samples_per_bit + j
-            signal[idx] = A * np.sin(2 * np.pi * freq * t[idx])
-    return t, signal
+    bits = _como_array_bits(bits)
+    signal = sintetizar(bits, templates_ask(samples_per_bit, freq, bit_duration), dtype)
+    return _resultado(signal, bit_duration, samples_per_bit, retornar_sinal)
 
 
-def fsk_modulation(bits, bit_duration=1, samples_per_bit=100, f0=5, f1=10):
+def fsk_modulation(bits, bit_duration=1, samples_per_bit=100, f0=5, f1=10,
+                   continuous_phase=False, dtype=None, retornar_sinal=False):
     """
     Modulação FSK (Frequency Shift Keying): bit 0 → f0, bit 1 → f1.
+    Com continuous_phase=True, cada símbolo começa na fase em que o anterior terminou.
     """
-    total_samples = len(bits) * samples_per_bit
-    t = np.linspace(0, bit_duration * len(bits), total_samples)
-    signal = np.zeros(total_samples)
-    for i, bit in enumerate(bits):
-        f = f1 if bit == 1 else f0
-        for j in range(samples_per_bit):
-            idx = i * samples_per_bit + j
-            signal[idx] = np.sin(2 * np.pi * f * t[idx])
-    return t, signal
+    bits = _como_array_bits(bits)
+    templates = _converter_templates(templates_fsk(samples_per_bit, f0, f1, bit_duration), dtype)
+    if not continuous_phase:
+        signal = sintetizar(bits, templates[:, 0])
+    else:
+        # Fase inicial de cada símbolo = 2π * ciclos acumulados pelos símbolos anteriores
+        ciclos = np.where(bits == 1, f1, f0) * bit_duration
+        fase = 2 * np.pi * np.mod(np.cumsum(ciclos) - ciclos, 1.0)
+        # sin(fase + θ) = sin(θ)cos(fase) + cos(θ)sin(fase)
+        cos_fase = np.cos(fase).astype(templates.dtype, copy=False)[:, None]
+        sin_fase = np.sin(fase).astype(templates.dtype, copy=False)[:, None]
+        signal = (templates[bits, 0] * cos_fase + templates[bits, 1] * sin_fase).reshape(-1)
+    return _resultado(signal, bit_duration, samples_per_bit, retornar_sinal)
 
 
-def qam8_modulation(bits, bit_duration=1, samples_per_bit=100, carrier_freq=5):
+def qam8_modulation(bits, bit_duration=1, samples_per_bit=100, carrier_freq=5, dtype=None,
+                    retornar_sinal=False):
     """
     Modulação 8-QAM: combina fase e amplitude (3 bits por símbolo).
     """
-    # Agrupar os bits em trios (1 símbolo = 3 bits)
-    symbols = [bits[i:i+3] for i in range(0, len(bits), 3)]
-    total_samples = samples_per_bit * len(symbols)
-    t = np.linspace(0, bit_duration * len(symbols), total_samples)
-    signal = []
-
-    # Mapeamento de bits para valores I/Q
-    mapping = {
-        (0,0,0): (1, 1),  (0,0,1): (1, -1),
-        (0,1,0): (-1, 1), (0,1,1): (-1, -1),
-        (1,0,0): (3, 1),  (1,0,1): (3, -1),
-        (1,1,0): (-3, 1), (1,1,1): (-3, -1),
-    }
-
-    for i, triplet in enumerate(symbols):
-        while len(triplet) < 3:
-            triplet.append(0)
-        I, Q = mapping[tuple(triplet)]
-        symbol_t = t[i*samples_per_bit:(i+1)*samples_per_bit]
-        carrier = 2 * np.pi * carrier_freq * symbol_t
-        segment = I * np.cos(carrier) + Q * np.sin(carrier)
-        signal.extend(segment)
-
-    return t, np.array(signal)
+    bits = _como_array_bits(bits)
+    # Agrupar os bits em trios (1 símbolo = 3 bits), completando o último com zeros
+    trios = np.zeros(-(-bits.size // 3) * 3, dtype=np.uint8)
+    trios[:bits.size] = bits
+    simbolos = trios.reshape(-1, 3) @ np.array([4, 2, 1], dtype=np.uint8)
+    signal = sintetizar(simbolos, templates_qam8(samples_per_bit, carrier_freq, bit_duration), dtype)
+    return _resultado(signal, bit_duration, samples_per_bit, retornar_sinal)
+
+# Funções de modulação pelo nome usado na interface
+MODULACOES = {
+    "NRZ-Polar": nrz_polar, "Manchester": manchester, "Bipolar": bipolar,
+    "ASK": ask_modulation, "FSK": fsk_modulation, "8-QAM": qam8_modulation
+}
+
+# Bits transmitidos por símbolo em cada modulação
+BITS_POR_SIMBOLO = {
+    "NRZ-Polar": 1, "Manchester": 1, "Bipolar": 1, "ASK": 1, "FSK": 1, "8-QAM": 3
+}
+
+# Menor dtype que representa as amostras de cada modulação sem perda relevante
+DTYPE_COMPACTO = {
+    "NRZ-Polar": np.int8, "Manchester": np.int8, "Bipolar": np.int8,
+    "ASK": np.float32, "FSK": np.float32, "8-QAM": np.float32
+}
+
+# === DEMODULAÇÃO ===
+#
+# Todos os demoduladores processam o quadro inteiro de uma vez: o sinal é reorganizado
+# em uma matriz (símbolos x amostras) e cada símbolo é integrado ou correlacionado com
+# os templates da portadora.
+
+def _matriz_simbolos(signal, amostras_por_simbolo: int) -> np.ndarray:
+    """
+    Reorganiza o sinal em uma matriz com um símbolo por linha (amostras incompletas no fim são ignoradas).
+    """
+    signal = np.asarray(signal, dtype=np.float64)
+    simbolos = signal.size // amostras_por_simbolo
+    return signal[:simbolos * amostras_por_simbolo].reshape(simbolos, amostras_por_simbolo)
+
+
+def nrz_polar_demodulation(signal, bit_duration=1, samples_per_bit=100) -> np.ndarray:
+    """
+    Demodulação NRZ-Polar (integra e descarta): média positiva -> 1, negativa -> 0.
+    """
+    return (_matriz_simbolos(signal, samples_per_bit).sum(axis=1) > 0).astype(np.uint8)
+
+
+def manchester_demodulation(signal, bit_duration=1, samples_per_bit=100) -> np.ndarray:
+    """
+    Demodulação Manchester: compara as duas metades do bit (+/- -> 0, -/+ -> 1).
+    """
+    metade = samples_per_bit // 2
+    blocos = _matriz_simbolos(signal, 2 * metade)
+    diferenca = blocos[:, :metade].sum(axis=1) - blocos[:, metade:].sum(axis=1)
+    return (diferenca < 0).astype(np.uint8)
+
+
+def bipolar_demodulation(signal, bit_duration=1, samples_per_bit=100) -> np.ndarray:
+    """
+    Demodulação Bipolar (AMI): nível médio com módulo acima de 0.5 -> 1, perto de zero -> 0.
+    """
+    media = _matriz_simbolos(signal, samples_per_bit).mean(axis=1)
+    return (np.abs(media) > 0.5).astype(np.uint8)
+
+
+def ask_demodulation(signal, bit_duration=1, samples_per_bit=100, freq=5) -> np.ndarray:
+    """
+    Demodulação ASK coerente: estima a amplitude de cada bit pela correlação com o seno
+    da portadora e decide pelo limiar entre 0.3 e 1.
+    """
+    seno = templates_portadora(samples_per_bit, freq, bit_duration)[0]
+    amplitude = _matriz_simbolos(signal, samples_per_bit) @ seno / (seno @ seno)
+    return (amplitude > (1 + 0.3) / 2).astype(np.uint8)
+
+
+def fsk_demodulation(signal, bit_duration=1, samples_per_bit=100, f0=5, f1=10) -> np.ndarray:
+    """
+    Demodulação FSK não coerente: banco de correlatores seno/cosseno em f0 e f1; o bit é
+    a frequência com maior energia. Funciona também com fase contínua.
+    """
+    banco = templates_fsk(samples_per_bit, f0, f1, bit_duration).reshape(4, samples_per_bit)
+    correlacoes = _matriz_simbolos(signal, samples_per_bit) @ banco.T
+    energia = correlacoes ** 2
+    return (energia[:, 2] + energia[:, 3] > energia[:, 0] + energia[:, 1]).astype(np.uint8)
+
+
+def qam8_demodulation(signal, bit_duration=1, samples_per_bit=100, carrier_freq=5,
+                      n_bits=None) -> np.ndarray:
+    """
+    Demodulação 8-QAM: estima (I, Q) de cada símbolo por mínimos quadrados sobre os
+    templates cosseno/seno e decide pelo ponto mais próximo da constelação.
+    n_bits descarta os bits de preenchimento do último símbolo.
+    """
+    seno, cosseno = templates_portadora(samples_per_bit, carrier_freq, bit_duration)
+    base = np.stack((cosseno, seno))
+    projecoes = _matriz_simbolos(signal, samples_per_bit) @ base.T
+    IQ = np.linalg.solve(base @ base.T, projecoes.T).T
+
+    distancias = ((IQ[:, None, :] - QAM8_CONSTELACAO[None, :, :]) ** 2).sum(axis=2)
+    simbolos = distancias.argmin(axis=1)
+    bits = ((simbolos[:, None] >> np.array([2, 1, 0])) & 1).astype(np.uint8).reshape(-1)
+    return bits if n_bits is None else bits[:n_bits]
+
+
+DEMODULACOES = {
+    "NRZ-Polar": nrz_polar_demodulation, "Manchester": manchester_demodulation,
+    "Bipolar": bipolar_demodulation, "ASK": ask_demodulation,
+    "FSK": fsk_demodulation, "8-QAM": qam8_demodulation
+}
@@ -0,0 +1,11 @@
+# __main__.py
+import os
+import sys
+
+# Os módulos do simulador se importam pelo nome simples (from Camada_enlace import ...),
+# então o diretório do projeto precisa estar no caminho de importação
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from transmissor import main
+
+sys.exit(main())
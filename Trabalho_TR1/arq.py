@@ -0,0 +1,458 @@
+# arq.py
+import argparse
+import select
+import socket
+import struct
+import time
+from collections import deque
+import numpy as np
+from Camada_enlace import (
+    ENQUADRAMENTOS,
+    DesenquadradorByteStuffing,
+    DesenquadradorBitStuffing,
+    aplicar_crc32,
+    calcular_crc32,
+    introduzir_erro_por_taxa
+)
+from canal import criar_gerador
+from protocolo import enviar_quadro, receber_resposta
+
+# === ARQ COM JANELA DESLIZANTE ===
+#
+# Cada quadro ARQ é [tipo (1 byte)][número de sequência (4 bytes)][id (4 bytes)][payload]
+# + CRC-32, enquadrado com byte stuffing ou bit stuffing, para que o receptor consiga
+# separar os quadros de um fluxo contínuo mesmo depois de erros (a contagem de caracteres
+# perde a sincronização no primeiro erro). Quadros com CRC inválido são descartados.
+#
+# Go-Back-N: o receptor só aceita o próximo quadro esperado e o ACK é cumulativo
+# (número do próximo quadro esperado); no timeout o transmissor reenvia toda a janela.
+# Selective Repeat: o receptor guarda os quadros fora de ordem dentro da janela e
+# confirma cada um individualmente; o transmissor reenvia só o quadro que expirou.
+#
+# O id numera cada transmissão, inclusive as retransmissões, e o receptor devolve em cada
+# ACK/NAK o id da última transmissão que recebeu (o de um quadro corrompido não pode ser
+# lido e é suposto o seguinte ao do quadro anterior). Como o fluxo chega em ordem,
+# o transmissor sabe assim quando o receptor já passou pela última cópia de um quadro sem
+# confirmá-la (ela se perdeu: retransmissão rápida, sem esperar o timeout) e ignora os
+# ACK/NAK provocados pelas cópias anteriores a uma retransmissão. O eco também dá o tempo
+# de ida e volta dos quadros retransmitidos, sem a ambiguidade que o algoritmo de Karn
+# evita descartando essas amostras (como os timestamps do TCP).
+#
+# As classes TransmissorARQ e ReceptorARQ só tratam os quadros (não fazem E/S);
+# transmitir_arq e o receptor_socket fazem a comunicação.
+
+DADOS = 0
+ACK = 1
+NAK = 2
+
+CABECALHO_ARQ = struct.Struct('!BII')
+
+# Id ecoado antes de o receptor ver qualquer transmissão
+SEM_ID = 0
+
+GO_BACK_N = "Go-Back-N"
+SELECTIVE_REPEAT = "Selective Repeat"
+MODOS = (GO_BACK_N, SELECTIVE_REPEAT)
+
+# Enquadramentos que permitem separar os quadros de um fluxo
+DESENQUADRADORES = {
+    "Byte Stuffing": DesenquadradorByteStuffing,
+    "Bit Stuffing": DesenquadradorBitStuffing
+}
+
+MASCARA_SEQ = 0xFFFFFFFF
+
+# Limites do timeout adaptativo (segundos)
+RTO_INICIAL = 0.1
+RTO_MINIMO = 0.005
+RTO_MAXIMO = 1.0
+
+
+def codificar_quadro_arq(tipo: int, seq: int, payload: bytes = b"",
+                         enq_tipo: str = "Byte Stuffing", ident: int = SEM_ID) -> bytes:
+    """Monta um quadro ARQ: cabeçalho + payload, CRC-32 e enquadramento."""
+    corpo = CABECALHO_ARQ.pack(tipo, seq & MASCARA_SEQ, ident & MASCARA_SEQ) + bytes(payload)
+    return ENQUADRAMENTOS[enq_tipo](aplicar_crc32(corpo))
+
+
+def decodificar_quadro_arq(conteudo: bytes):
+    """
+    Verifica o CRC de um quadro já desenquadrado.
+    Retorna (tipo, seq, id, payload) ou None se o quadro estiver corrompido.
+    """
+    if len(conteudo) < CABECALHO_ARQ.size + 4:
+        return None
+    corpo = conteudo[:-4]
+    if calcular_crc32(corpo) != int.from_bytes(conteudo[-4:], 'big'):
+        return None
+    tipo, seq, ident = CABECALHO_ARQ.unpack_from(corpo)
+    if tipo not in (DADOS, ACK, NAK):
+        return None
+    return tipo, seq, ident, bytes(corpo[CABECALHO_ARQ.size:])
+
+
+def _distancia(seq: int, base: int) -> int:
+    """Quantos números de sequência seq está à frente de base (módulo 2^32)."""
+    return (seq - base) & MASCARA_SEQ
+
+
+def _antes(ident: int, outro: int) -> bool:
+    """A transmissão ident foi feita antes de outro (ids módulo 2^32)."""
+    return 0 < _distancia(outro, ident) < 1 << 31
+
+
+def _validar(modo: str, enq_tipo: str, janela: int):
+    if modo not in MODOS:
+        raise ValueError(f"Modo de ARQ desconhecido: {modo}.")
+    if enq_tipo not in DESENQUADRADORES:
+        raise ValueError("O ARQ precisa de um enquadramento com FLAGS (byte ou bit stuffing).")
+    if janela < 1:
+        raise ValueError("A janela deve ter pelo menos 1 quadro.")
+
+
+class TransmissorARQ:
+    """
+    Lado transmissor do ARQ: numera os quadros, guarda os que ainda não foram
+    confirmados e decide o que retransmitir após um ACK, NAK ou timeout.
+    Os métodos retornam a lista de (seq, quadro) a colocar no canal.
+
+    Com timeout=None o timeout é adaptativo: estimado a partir do tempo de ida e volta
+    medido pelo id ecoado nos ACKs (SRTT + 4 * RTTVAR, como no TCP) e dobrado a cada
+    timeout, até a próxima amostra.
+    """
+
+    def __init__(self, modo: str = GO_BACK_N, janela: int = 8, timeout: float = None,
+                 enq_tipo: str = "Byte Stuffing"):
+        _validar(modo, enq_tipo, janela)
+        self.modo = modo
+        self.janela = janela
+        self.timeout_fixo = timeout
+        self.timeout = RTO_INICIAL if timeout is None else timeout
+        self.enq_tipo = enq_tipo
+        self.base = 0            # quadro mais antigo não confirmado
+        self.proximo = 0         # número do próximo quadro novo
+        self._pendentes = {}     # seq -> payload, ainda não confirmado
+        self._prazos = {}        # seq -> instante do timeout
+        self._ultimo_id = {}     # seq -> id da última (re)transmissão
+        self._envios = deque()   # (id, instante) das transmissões ainda não ecoadas
+        self._id = SEM_ID
+        self.srtt = None
+        self.rttvar = None
+        self.transmissoes = 0
+        self.retransmissoes = 0
+
+    def pode_enviar(self) -> bool:
+        return _distancia(self.proximo, self.base) < self.janela
+
+    def em_aberto(self) -> int:
+        """Quadros enviados e ainda não confirmados."""
+        return len(self._pendentes)
+
+    def enviar(self, payload: bytes, agora: float) -> list:
+        """Numera e registra um novo quadro (a janela precisa ter espaço)."""
+        if not self.pode_enviar():
+            raise RuntimeError("Janela cheia.")
+        seq = self.proximo
+        self.proximo = (seq + 1) & MASCARA_SEQ
+        self._pendentes[seq] = bytes(payload)
+        return self._transmitir([seq], agora)
+
+    def _transmitir(self, seqs, agora: float) -> list:
+        saida = []
+        for seq in seqs:
+            self._id = self._id % MASCARA_SEQ + 1   # 1, 2, ..., MASCARA_SEQ, 1, ... (nunca SEM_ID)
+            self._prazos[seq] = agora + self.timeout
+            self._ultimo_id[seq] = self._id
+            self._envios.append((self._id, agora))
+            saida.append((seq, codificar_quadro_arq(DADOS, seq, self._pendentes[seq],
+                                                    self.enq_tipo, self._id)))
+        self.transmissoes += len(saida)
+        return saida
+
+    def _retransmitir(self, seqs, agora: float) -> list:
+        saida = self._transmitir(seqs, agora)
+        self.retransmissoes += len(saida)
+        return saida
+
+    def _confirmar(self, seq: int):
+        self._pendentes.pop(seq, None)
+        self._prazos.pop(seq, None)
+        self._ultimo_id.pop(seq, None)
+
+    def _adiar_prazos(self, agora: float):
+        """
+        Um ACK confirmou quadros: os que esperam atrás deles na fila do canal ganham um
+        timeout inteiro a partir de agora (como o timer reiniciado do TCP).
+        """
+        prazo = agora + self.timeout
+        for seq, anterior in self._prazos.items():
+            if anterior < prazo:
+                self._prazos[seq] = prazo
+
+    def _amostrar_rtt(self, eco: int, agora: float):
+        """
+        Mede o tempo de ida e volta da transmissão ecoada em um ACK. As anteriores a ela
+        não serão mais ecoadas (o fluxo chega em ordem) e são descartadas.
+        """
+        while self._envios and _antes(self._envios[0][0], eco):
+            self._envios.popleft()
+        if not self._envios or self._envios[0][0] != eco:
+            return
+        amostra = agora - self._envios.popleft()[1]
+        if self.srtt is None:
+            self.srtt = amostra
+            self.rttvar = amostra / 2
+        else:
+            self.rttvar = 0.75 * self.rttvar + 0.25 * abs(self.srtt - amostra)
+            self.srtt = 0.875 * self.srtt + 0.125 * amostra
+        if self.timeout_fixo is None:
+            self.timeout = max(RTO_MINIMO, self.srtt + 4 * self.rttvar)
+
+    def _perdido(self, seq: int, tipo: int, eco: int) -> bool:
+        """
+        O receptor já passou pela última cópia de seq sem confirmá-la: o ACK/NAK foi
+        provocado pela transmissão eco, posterior a ela ou, no caso do NAK, a própria
+        cópia corrompida. ACK/NAK provocados por cópias anteriores a uma retransmissão
+        não contam.
+        """
+        ultimo = self._ultimo_id[seq]
+        return _antes(ultimo, eco) or (tipo == NAK and ultimo == eco)
+
+    def _avancar_base(self):
+        while self.base != self.proximo and self.base not in self._pendentes:
+            self.base = (self.base + 1) & MASCARA_SEQ
+
+    def receber_controle(self, tipo: int, seq: int, eco: int, agora: float) -> list:
+        """Trata um ACK ou NAK recebido (eco é o id que o receptor devolveu)."""
+        if tipo == ACK:
+            self._amostrar_rtt(eco, agora)
+        em_janela = _distancia(seq, self.base) < _distancia(self.proximo, self.base)
+        if self.modo == GO_BACK_N:
+            # ACK/NAK seq: todos os quadros antes de seq chegaram
+            if (em_janela or seq == self.proximo) and seq != self.base:
+                while self.base != seq:
+                    self._confirmar(self.base)
+                    self.base = (self.base + 1) & MASCARA_SEQ
+                self._adiar_prazos(agora)
+            # ACK repetido ou NAK para a base depois da sua última cópia: reenvia a janela
+            if seq == self.base and self._pendentes and self._perdido(self.base, tipo, eco):
+                return self._retransmitir(list(self._pendentes), agora)
+            return []
+
+        if tipo == ACK and em_janela and seq in self._pendentes:
+            self._confirmar(seq)
+            self._avancar_base()
+            self._adiar_prazos(agora)
+        # Reenvia os quadros cuja última cópia o receptor já passou sem confirmar
+        perdidos = [s for s in self._pendentes if self._perdido(s, tipo, eco)]
+        return self._retransmitir(perdidos, agora) if perdidos else []
+
+    def proximo_prazo(self):
+        """Instante do próximo timeout ou None se não há quadros em aberto."""
+        return min(self._prazos.values()) if self._prazos else None
+
+    def verificar_timeouts(self, agora: float) -> list:
+        """Retransmite os quadros cujo timer expirou."""
+        expirados = [seq for seq, prazo in self._prazos.items() if prazo <= agora]
+        if not expirados:
+            return []
+        if self.timeout_fixo is None:
+            self.timeout = min(2 * self.timeout, RTO_MAXIMO)
+        if self.modo == GO_BACK_N:
+            # Reenvia a janela inteira, a partir do quadro mais antigo
+            return self._retransmitir(list(self._pendentes), agora)
+        return self._retransmitir(expirados, agora)
+
+
+class ReceptorARQ:
+    """
+    Lado receptor do ARQ: separa os quadros do fluxo, descarta os corrompidos,
+    entrega os payloads em ordem e gera os ACK/NAK.
+    """
+
+    def __init__(self, modo: str = GO_BACK_N, janela: int = 8, enq_tipo: str = "Byte Stuffing"):
+        _validar(modo, enq_tipo, janela)
+        self.modo = modo
+        self.janela = janela
+        self.enq_tipo = enq_tipo
+        self.esperado = 0
+        self._desenquadrador = DESENQUADRADORES[enq_tipo]()
+        self._fora_de_ordem = {}   # seq -> payload (Selective Repeat)
+        self.ultimo_id = SEM_ID    # id da última transmissão recebida, ecoado nos ACK/NAK
+        self.recebidos = 0
+        self.corrompidos = 0
+        self.duplicados = 0
+
+    def _controle(self, tipo: int, seq: int) -> bytes:
+        return codificar_quadro_arq(tipo, seq, b"", self.enq_tipo, self.ultimo_id)
+
+    def alimentar(self, dados) -> tuple:
+        """
+        Processa mais um pedaço do fluxo.
+
+        Returns:
+            (payloads entregues em ordem, quadros de controle a enviar de volta)
+        """
+        entregues = []
+        respostas = []
+        for conteudo in self._desenquadrador.alimentar(dados):
+            quadro = decodificar_quadro_arq(conteudo)
+            if quadro is None or quadro[0] != DADOS:
+                # Um quadro foi perdido: pede logo o esperado, sem esperar o timeout.
+                # Supõe-se que ele seja a transmissão seguinte à última recebida
+                self.corrompidos += 1
+                self.ultimo_id = self.ultimo_id % MASCARA_SEQ + 1
+                respostas.append(self._controle(NAK, self.esperado))
+                continue
+            self.recebidos += 1
+            _, seq, self.ultimo_id, payload = quadro
+            if self.modo == GO_BACK_N:
+                self._receber_gbn(seq, payload, entregues, respostas)
+            else:
+                self._receber_sr(seq, payload, entregues, respostas)
+        return entregues, respostas
+
+    def _receber_gbn(self, seq, payload, entregues, respostas):
+        if seq == self.esperado:
+            entregues.append(payload)
+            self.esperado = (seq + 1) & MASCARA_SEQ
+        else:
+            self.duplicados += 1
+        respostas.append(self._controle(ACK, self.esperado))
+
+    def _receber_sr(self, seq, payload, entregues, respostas):
+        distancia = _distancia(seq, self.esperado)
+        if distancia < self.janela:
+            if seq in self._fora_de_ordem:
+                self.duplicados += 1
+            self._fora_de_ordem[seq] = payload
+            while self.esperado in self._fora_de_ordem:
+                entregues.append(self._fora_de_ordem.pop(self.esperado))
+                self.esperado = (self.esperado + 1) & MASCARA_SEQ
+        elif distancia > MASCARA_SEQ - self.janela:
+            # Quadro já entregue cujo ACK se perdeu
+            self.duplicados += 1
+        else:
+            return
+        respostas.append(self._controle(ACK, seq))
+
+
+# === TRANSMISSÃO PELO SOCKET ===
+
+TAMANHO_LEITURA = 64 * 1024
+
+# Intervalo máximo entre duas verificações do pedido de cancelamento (segundos)
+ESPERA_MAXIMA = 0.1
+
+
+def negociar_arq(sock, modo: str, janela: int, enq_tipo: str) -> str:
+    """
+    Pede ao receptor que trate a conexão como um fluxo ARQ (metadados JSON com "arq").
+    Retorna a confirmação do receptor.
+    """
+    metadata = {"arq": modo, "janela": janela, "enq_tipo": enq_tipo, "err_tipo": "CRC"}
+    enviar_quadro(sock, metadata, b"")
+    return receber_resposta(sock)
+
+
+def transmitir_arq(mensagens, host: str = '127.0.0.1', port: int = 12345,
+                   modo: str = GO_BACK_N, janela: int = 8, timeout: float = None,
+                   enq_tipo: str = "Byte Stuffing", taxa_erro: float = 0.0, semente=None,
+                   cancelar=None) -> dict:
+    """
+    Envia as mensagens ao receptor com ARQ, até todas serem confirmadas.
+    Cada transmissão (inclusive as retransmissões) passa por introduzir_erro_por_taxa.
+    cancelar é um threading.Event opcional que interrompe a transmissão (InterruptedError).
+
+    Returns:
+        dict com duração, retransmissões e goodput (bytes de payload entregues por segundo)
+    """
+    rng = criar_gerador(semente)
+    transmissor = TransmissorARQ(modo, janela, timeout, enq_tipo)
+    desenquadrador = DESENQUADRADORES[enq_tipo]()
+    fila = list(mensagens)
+    proxima = 0
+    bytes_payload = sum(len(mensagem) for mensagem in fila)
+    bytes_enviados = 0
+
+    with socket.create_connection((host, port)) as sock:
+        def colocar_no_canal(saida):
+            nonlocal bytes_enviados
+            dados = b"".join(introduzir_erro_por_taxa(quadro, taxa_erro, rng) if taxa_erro else quadro
+                             for _, quadro in saida)
+            sock.sendall(dados)
+            bytes_enviados += len(dados)
+
+        negociar_arq(sock, modo, janela, enq_tipo)
+        inicio = time.perf_counter()
+        while proxima < len(fila) or transmissor.em_aberto():
+            if cancelar is not None and cancelar.is_set():
+                raise InterruptedError("Transmissão cancelada.")
+            agora = time.perf_counter()
+            saida = transmissor.verificar_timeouts(agora)
+            while proxima < len(fila) and transmissor.pode_enviar():
+                saida += transmissor.enviar(fila[proxima], agora)
+                proxima += 1
+            if saida:
+                colocar_no_canal(saida)
+
+            prazo = transmissor.proximo_prazo()
+            espera = 0 if prazo is None else max(prazo - time.perf_counter(), 0)
+            legiveis, _, _ = select.select([sock], [], [], min(espera, ESPERA_MAXIMA))
+            if not legiveis:
+                continue
+            dados = sock.recv(TAMANHO_LEITURA)
+            if not dados:
+                raise ConnectionError("O receptor encerrou a conexão.")
+            agora = time.perf_counter()
+            for conteudo in desenquadrador.alimentar(dados):
+                quadro = decodificar_quadro_arq(conteudo)
+                if quadro is not None and quadro[0] in (ACK, NAK):
+                    saida = transmissor.receber_controle(quadro[0], quadro[1], quadro[2], agora)
+                    if saida:
+                        colocar_no_canal(saida)
+        duracao = time.perf_counter() - inicio
+
+    return {
+        "modo": modo,
+        "janela": janela,
+        "taxa_erro": taxa_erro,
+        "quadros": len(fila),
+        "transmissoes": transmissor.transmissoes,
+        "retransmissoes": transmissor.retransmissoes,
+        "bytes_enviados": bytes_enviados,
+        "duracao": duracao,
+        "goodput": bytes_payload / duracao if duracao > 0 else float('inf'),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Mede o goodput do ARQ contra o receptor_socket em execução.")
+    parser.add_argument("--host", default='127.0.0.1')
+    parser.add_argument("--port", type=int, default=12345)
+    parser.add_argument("--modos", nargs="+", default=list(MODOS), choices=MODOS)
+    parser.add_argument("--janelas", nargs="+", type=int, default=[1, 4, 8, 16])
+    parser.add_argument("--taxas", nargs="+", type=float, default=[0.0, 1e-4, 1e-3])
+    parser.add_argument("--enquadramento", default="Byte Stuffing", choices=list(DESENQUADRADORES))
+    parser.add_argument("--quadros", type=int, default=1000)
+    parser.add_argument("--payload", type=int, default=256, help="bytes por quadro")
+    parser.add_argument("--timeout", type=float, default=None,
+                        help="segundos (padrão: adaptativo, pelo tempo de ida e volta)")
+    parser.add_argument("--semente", type=int, default=0)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(args.semente)
+    mensagens = [rng.bytes(args.payload) for _ in range(args.quadros)]
+    print(f"{'Modo':<17} {'Janela':>6} {'Taxa':>8} {'Retransm.':>10} {'Goodput (kB/s)':>15}")
+    for modo in args.modos:
+        for janela in args.janelas:
+            for taxa in args.taxas:
+                r = transmitir_arq(mensagens, args.host, args.port, modo, janela, args.timeout,
+                                   args.enquadramento, taxa, rng)
+                print(f"{modo:<17} {janela:>6} {taxa:>8.0e} {r['retransmissoes']:>10} "
+                      f"{r['goodput'] / 1e3:>15.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,323 @@
+# benchmark.py
+import argparse
+import json
+import os
+import platform
+import sys
+import time
+import tracemalloc
+import zlib
+from typing import Callable, NamedTuple
+import numpy as np
+from Camada_enlace import (
+    enquadramento_contagem,
+    desenquadramento_contagem,
+    enquadramento_byte_stuffing,
+    desenquadramento_byte_stuffing,
+    DesenquadradorByteStuffing,
+    enquadramento_bit_stuffing,
+    desenquadramento_bit_stuffing,
+    aplicar_paridade_par,
+    aplicar_paridade_2d,
+    verificar_paridade_2d,
+    aplicar_crc32,
+    codificar_hamming,
+    decodificar_hamming,
+    introduzir_erro_por_taxa
+)
+from Camada_fisica import MODULACOES, DEMODULACOES
+from buffer_bits import BitBuffer
+from crc32 import calcular_crc32_manual, calcular_crc32_slicing8, calcular_crc32_numpy
+
+# Tamanhos de payload usados por padrão (100 B a 100 MB)
+TAMANHOS = [100, 10_000, 1_000_000, 100_000_000]
+
+# Acima deste tamanho as implementações byte a byte não são medidas (levariam minutos)
+LIMITE_LENTO = 1_000_000
+
+# Tamanho das leituras simuladas do socket no desenquadrador incremental
+TAMANHO_LEITURA = 64 * 1024
+
+
+def medir(func, *args, tempo_minimo=0.2):
+    """
+    Executa func(*args) repetidamente até somar tempo_minimo segundos (pelo menos uma vez).
+    Retorna o menor tempo de uma execução, em segundos.
+    """
+    melhor = float('inf')
+    total = 0.0
+    while True:
+        inicio = time.perf_counter()
+        func(*args)
+        duracao = time.perf_counter() - inicio
+        melhor = min(melhor, duracao)
+        total += duracao
+        if total >= tempo_minimo:
+            break
+    return melhor
+
+
+def vazao(tamanho: int, segundos: float) -> float:
+    """Vazão em MB/s."""
+    return tamanho / segundos / 1e6
+
+
+def _desenquadrar_fluxo(fluxo: bytes):
+    desenquadrador = DesenquadradorByteStuffing()
+    visao = memoryview(fluxo)
+    for i in range(0, len(fluxo), TAMANHO_LEITURA):
+        desenquadrador.alimentar(visao[i:i + TAMANHO_LEITURA])
+
+
+def bench_byte_stuffing(tamanhos=TAMANHOS):
+    """
+    Mede a vazão do enquadramento com byte stuffing, do desenquadramento e do
+    desenquadrador incremental (leituras de 64 KiB) para cada tamanho de payload.
+    """
+    print(f"{'Payload (B)':>12} {'Enquadr. MB/s':>14} {'Desenq. MB/s':>13} {'Fluxo MB/s':>11}")
+    for tamanho in tamanhos:
+        dados = os.urandom(tamanho)
+        quadro = enquadramento_byte_stuffing(dados)
+        t_enq = medir(enquadramento_byte_stuffing, dados)
+        t_desenq = medir(desenquadramento_byte_stuffing, quadro)
+        t_fluxo = medir(_desenquadrar_fluxo, quadro)
+        print(f"{tamanho:>12} {vazao(tamanho, t_enq):>14.1f} "
+              f"{vazao(tamanho, t_desenq):>13.1f} {vazao(tamanho, t_fluxo):>11.1f}")
+
+
+def bench_crc32(tamanhos=TAMANHOS):
+    """
+    Compara a vazão das variantes do CRC-32 e do caminho completo aplicar_crc32
+    (cálculo + anexação dos 4 bytes) com a referência zlib.crc32.
+    """
+    variantes = [
+        ("Manual", calcular_crc32_manual),
+        ("Slicing-8", calcular_crc32_slicing8),
+        ("NumPy", calcular_crc32_numpy),
+        ("aplicar_crc32", aplicar_crc32),
+        ("zlib", zlib.crc32),
+    ]
+    print(f"{'Payload (B)':>12}" + "".join(f"{nome + ' MB/s':>19}" for nome, _ in variantes))
+    for tamanho in tamanhos:
+        dados = os.urandom(tamanho)
+        linha = f"{tamanho:>12}"
+        for nome, func in variantes:
+            if tamanho > LIMITE_LENTO and nome in ("Manual", "Slicing-8"):
+                linha += f"{'-':>19}"
+                continue
+            linha += f"{vazao(tamanho, medir(func, dados)):>19.1f}"
+        print(linha)
+
+
+# === SUÍTE COMPLETA (JSON E COMPARAÇÃO COM UMA BASE) ===
+#
+# Cada caso é uma função das camadas de enlace ou física com parâmetros fixos, medida
+# para cada tamanho de payload: tempo (menor de várias execuções), vazão sobre os bytes
+# do payload e pico de memória alocado durante uma execução (tracemalloc, que também
+# acompanha os arrays do NumPy). O pico é medido em uma execução separada, pois o
+# tracemalloc deixa as alocações mais lentas.
+
+TAMANHOS_SUITE = [16, 256, 4096, 65_536, 1 << 20, 16 << 20]
+SAMPLES_PER_BIT_SUITE = [8, 32, 100]
+M_HAMMING_SUITE = [4, 11, 26]
+
+# Os moduladores não são medidos quando o sinal passaria deste número de amostras
+LIMITE_AMOSTRAS = 1 << 24
+
+# Aumento relativo (tempo ou memória) a partir do qual um caso é uma regressão
+TOLERANCIA = 0.25
+
+BASE_PADRAO = os.path.join(os.path.dirname(os.path.abspath(__file__)), "benchmark_base.json")
+
+
+class Caso(NamedTuple):
+    nome: str
+    func: Callable
+    preparar: Callable          # tamanho do payload -> argumentos de func
+    parametros: dict = {}
+    tamanho_maximo: int = None  # maior payload medido (bytes)
+
+    @property
+    def chave(self) -> str:
+        parametros = ",".join(f"{k}={v}" for k, v in self.parametros.items())
+        return f"{self.nome}[{parametros}]" if parametros else self.nome
+
+
+def _payload(tamanho: int) -> bytes:
+    return np.random.default_rng(tamanho).bytes(tamanho)
+
+
+def _bits(tamanho: int) -> BitBuffer:
+    return BitBuffer(_payload(tamanho))
+
+
+def casos_suite(samples_per_bit=SAMPLES_PER_BIT_SUITE, valores_m=M_HAMMING_SUITE,
+                limite_amostras=LIMITE_AMOSTRAS) -> list:
+    casos = [
+        Caso("enquadramento_contagem", enquadramento_contagem, lambda n: (_payload(n),),
+             tamanho_maximo=254),
+        Caso("desenquadramento_contagem", desenquadramento_contagem,
+             lambda n: (enquadramento_contagem(_payload(n)),), tamanho_maximo=254),
+        Caso("enquadramento_byte_stuffing", enquadramento_byte_stuffing, lambda n: (_payload(n),)),
+        Caso("desenquadramento_byte_stuffing", desenquadramento_byte_stuffing,
+             lambda n: (enquadramento_byte_stuffing(_payload(n)),)),
+        Caso("enquadramento_bit_stuffing", enquadramento_bit_stuffing, lambda n: (_payload(n),)),
+        Caso("desenquadramento_bit_stuffing", desenquadramento_bit_stuffing,
+             lambda n: (enquadramento_bit_stuffing(_payload(n)),)),
+        Caso("aplicar_paridade_par", aplicar_paridade_par, lambda n: (_payload(n),)),
+        Caso("aplicar_paridade_2d", aplicar_paridade_2d, lambda n: (_payload(n),)),
+        Caso("verificar_paridade_2d", verificar_paridade_2d,
+             lambda n: (aplicar_paridade_2d(_payload(n)),)),
+        Caso("aplicar_crc32", aplicar_crc32, lambda n: (_payload(n),)),
+    ]
+    for m in valores_m:
+        casos.append(Caso("codificar_hamming", codificar_hamming,
+                          lambda n, m=m: (_payload(n), m), {"m": m}))
+        casos.append(Caso("decodificar_hamming", decodificar_hamming,
+                          lambda n, m=m: (codificar_hamming(_payload(n), m), m), {"m": m}))
+    casos.append(Caso("introduzir_erro_por_taxa", introduzir_erro_por_taxa,
+                      lambda n: (_payload(n), 1e-3, 0), {"taxa": 1e-3}))
+
+    for spb in samples_per_bit:
+        maximo = limite_amostras // (8 * spb)
+        for nome, modular in MODULACOES.items():
+            casos.append(Caso(modular.__name__, lambda bits, spb=spb, f=modular: f(bits, samples_per_bit=spb),
+                              lambda n: (_bits(n),), {"samples_per_bit": spb}, maximo))
+        for nome, demodular in DEMODULACOES.items():
+            def preparar(n, spb=spb, modular=MODULACOES[nome]):
+                return (modular(_bits(n), samples_per_bit=spb)[1],)
+            casos.append(Caso(demodular.__name__, lambda s, spb=spb, f=demodular: f(s, samples_per_bit=spb),
+                              preparar, {"samples_per_bit": spb}, maximo))
+    return casos
+
+
+def pico_memoria(func, *args) -> int:
+    """Maior volume de memória (bytes) alocado ao mesmo tempo durante func(*args)."""
+    tracemalloc.start()
+    try:
+        antes = tracemalloc.get_traced_memory()[0]
+        func(*args)
+        return tracemalloc.get_traced_memory()[1] - antes
+    finally:
+        tracemalloc.stop()
+
+
+def executar_suite(casos, tamanhos=TAMANHOS_SUITE, tempo_minimo=0.2, log=print) -> dict:
+    """
+    Mede todos os casos em todos os tamanhos que eles aceitam.
+    Retorna o documento JSON: {"ambiente": {...}, "resultados": [...]}.
+    """
+    resultados = []
+    for caso in casos:
+        for tamanho in tamanhos:
+            if caso.tamanho_maximo is not None and tamanho > caso.tamanho_maximo:
+                continue
+            args = caso.preparar(tamanho)
+            segundos = medir(caso.func, *args, tempo_minimo=tempo_minimo)
+            pico = pico_memoria(caso.func, *args)
+            del args
+            resultados.append({"caso": caso.chave, "tamanho": tamanho, "segundos": segundos,
+                               "mb_s": vazao(tamanho, segundos), "pico_bytes": pico})
+            if log:
+                log(f"{caso.chave:<45} {tamanho:>10} B {vazao(tamanho, segundos):>10.1f} MB/s "
+                    f"{pico / 1e6:>10.2f} MB")
+    return {
+        "ambiente": {"python": platform.python_version(), "numpy": np.__version__,
+                     "plataforma": platform.platform(), "processador": platform.processor()},
+        "resultados": resultados,
+    }
+
+
+def comparar(atual: dict, base: dict, tolerancia: float = TOLERANCIA) -> list:
+    """
+    Compara dois documentos da suíte. Retorna as regressões: casos (caso, tamanho) presentes
+    nos dois cujo tempo ou pico de memória cresceu mais que a tolerância.
+    """
+    anteriores = {(r["caso"], r["tamanho"]): r for r in base["resultados"]}
+    regressoes = []
+    for r in atual["resultados"]:
+        anterior = anteriores.get((r["caso"], r["tamanho"]))
+        if anterior is None:
+            continue
+        for campo in ("segundos", "pico_bytes"):
+            if anterior[campo] > 0 and r[campo] > anterior[campo] * (1 + tolerancia):
+                regressoes.append({"caso": r["caso"], "tamanho": r["tamanho"], "medida": campo,
+                                   "base": anterior[campo], "atual": r[campo],
+                                   "razao": r[campo] / anterior[campo]})
+    return regressoes
+
+
+def main_suite(argumentos):
+    parser = argparse.ArgumentParser(prog="benchmark.py suite",
+                                     description="Mede todas as funções de enlace e física.")
+    parser.add_argument("--tamanhos", type=int, nargs="+", default=TAMANHOS_SUITE)
+    parser.add_argument("--samples-per-bit", type=int, nargs="+", default=SAMPLES_PER_BIT_SUITE)
+    parser.add_argument("--limite-amostras", type=int, default=LIMITE_AMOSTRAS,
+                        help="maior sinal (em amostras) gerado pelos moduladores")
+    parser.add_argument("--filtro", help="só os casos cujo nome contém este texto")
+    parser.add_argument("--tempo-minimo", type=float, default=0.2,
+                        help="segundos de repetição por medida")
+    parser.add_argument("--saida", help="grava os resultados neste JSON")
+    parser.add_argument("--base", default=BASE_PADRAO, help="JSON de referência para a comparação")
+    parser.add_argument("--atualizar-base", action="store_true",
+                        help="grava os resultados como nova base")
+    parser.add_argument("--sem-comparacao", action="store_true",
+                        help="só mede, sem procurar regressões em relação à base")
+    parser.add_argument("--tolerancia", type=float, default=TOLERANCIA)
+    args = parser.parse_args(argumentos)
+    comparar_base = not args.atualizar_base and not args.sem_comparacao
+    # A base tem tempos da máquina em que foi gravada, por isso não faz parte do repositório;
+    # sem ela a verificação de regressões não é pulada em silêncio
+    if comparar_base and not os.path.exists(args.base):
+        parser.error(f"base de comparação não encontrada: {args.base}. Grave uma nesta máquina "
+                     f"com --atualizar-base ou meça sem comparação com --sem-comparacao.")
+
+    casos = casos_suite(args.samples_per_bit, limite_amostras=args.limite_amostras)
+    if args.filtro:
+        casos = [caso for caso in casos if args.filtro in caso.chave]
+    documento = executar_suite(casos, args.tamanhos, args.tempo_minimo)
+
+    if args.saida:
+        with open(args.saida, "w") as arquivo:
+            json.dump(documento, arquivo, indent=1)
+    if args.atualizar_base:
+        with open(args.base, "w") as arquivo:
+            json.dump(documento, arquivo, indent=1)
+        print(f"Base gravada em {args.base}")
+        return 0
+    if not comparar_base:
+        return 0
+
+    with open(args.base) as arquivo:
+        base = json.load(arquivo)
+    anteriores = {(r["caso"], r["tamanho"]) for r in base["resultados"]}
+    if not any((r["caso"], r["tamanho"]) in anteriores for r in documento["resultados"]):
+        print(f"\nNenhum caso medido está na base {args.base}; nada foi comparado.")
+        return 1
+    regressoes = comparar(documento, base, args.tolerancia)
+    if not regressoes:
+        print(f"\nNenhuma regressão acima de {args.tolerancia:.0%} em relação a {args.base}.")
+        return 0
+    print(f"\n{len(regressoes)} regressões acima de {args.tolerancia:.0%}:")
+    for r in regressoes:
+        print(f"  {r['caso']:<45} {r['tamanho']:>10} B {r['medida']:<10} "
+              f"{r['base']:.4g} -> {r['atual']:.4g} ({r['razao']:.2f}x)")
+    return 1
+
+
+BENCHMARKS = {
+    'byte_stuffing': bench_byte_stuffing,
+    'crc32': bench_crc32,
+}
+
+if __name__ == '__main__':
+    # Uso: python benchmark.py [byte_stuffing|crc32 ...] [tamanhos em bytes ...]
+    #      python benchmark.py suite [--saida resultados.json] [--base base.json] ...
+    if sys.argv[1:2] == ['suite']:
+        sys.exit(main_suite(sys.argv[2:]))
+    argumentos = sys.argv[1:]
+    nomes = [arg for arg in argumentos if arg in BENCHMARKS] or list(BENCHMARKS)
+    tamanhos = [int(arg) for arg in argumentos if arg not in BENCHMARKS] or TAMANHOS
+    for nome in nomes:
+        print(f"\n=== {nome} ===")
+        BENCHMARKS[nome](tamanhos)
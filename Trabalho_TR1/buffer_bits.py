@@ -0,0 +1,100 @@
+import numpy as np
+
+# === BUFFER DE BITS COMPACTADO ===
+
+class BitBuffer:
+    """
+    Sequência de bits armazenada compactada (8 bits por byte, bit mais significativo
+    primeiro) em um array NumPy uint8.
+
+    Criado a partir de bytes/bytearray/memoryview, o buffer é uma visão sem cópia dos
+    dados originais. A forma desempacotada (um bit por elemento) só é gerada quando
+    pedida, com np.unpackbits, e fica guardada para os próximos acessos.
+    """
+
+    __slots__ = ("_compactado", "_nbits", "_bits")
+
+    def __init__(self, dados=b"", nbits=None):
+        if isinstance(dados, BitBuffer):
+            compactado = dados._compactado
+            nbits = dados._nbits if nbits is None else nbits
+        elif isinstance(dados, np.ndarray):
+            compactado = dados.astype(np.uint8, copy=False).reshape(-1)
+        else:
+            compactado = np.frombuffer(dados, dtype=np.uint8)
+
+        capacidade = compactado.size * 8
+        if nbits is None:
+            nbits = capacidade
+        if not (capacidade - 8 < nbits <= capacidade or nbits == capacidade == 0):
+            raise ValueError("Número de bits incompatível com o tamanho do buffer.")
+
+        self._compactado = compactado
+        self._nbits = nbits
+        self._bits = None
+
+    @classmethod
+    def from_bits(cls, bits) -> "BitBuffer":
+        """
+        Cria o buffer a partir de uma sequência de bits (lista de 0/1 ou array uint8).
+        O último byte é completado com zeros à direita.
+        """
+        bits = np.asarray(bits, dtype=np.uint8)
+        buffer = cls(np.packbits(bits), nbits=bits.size)
+        buffer._bits = bits
+        return buffer
+
+    @property
+    def bits(self) -> np.ndarray:
+        """Array uint8 com um bit (0 ou 1) por elemento."""
+        if self._bits is None:
+            self._bits = np.unpackbits(self._compactado, count=self._nbits)
+        return self._bits
+
+    @property
+    def packed(self) -> np.ndarray:
+        """Array uint8 com os bits compactados (sem cópia)."""
+        return self._compactado
+
+    def tobytes(self) -> bytes:
+        """Retorna os bits compactados como bytes."""
+        return self._compactado.tobytes()
+
+    def __len__(self) -> int:
+        return self._nbits
+
+    def __bytes__(self) -> bytes:
+        return self.tobytes()
+
+    def __array__(self, dtype=None, copy=None):
+        if dtype is None or np.dtype(dtype) == self.bits.dtype:
+            return self.bits.copy() if copy else self.bits
+        return self.bits.astype(dtype)
+
+    def __eq__(self, outro) -> bool:
+        if not isinstance(outro, BitBuffer):
+            return NotImplemented
+        return self._nbits == outro._nbits and np.array_equal(self.bits, outro.bits)
+
+    def __repr__(self) -> str:
+        return f"BitBuffer({self._nbits} bits)"
+
+
+def como_bytes(dados):
+    """
+    Retorna uma representação em bytes dos dados para as funções que trabalham byte a byte.
+    BitBuffer vira uma memoryview dos bytes compactados; os demais tipos são devolvidos
+    sem alteração.
+    """
+    if isinstance(dados, BitBuffer):
+        return memoryview(dados.packed)
+    return dados
+
+
+def bits_de(dados) -> np.ndarray:
+    """
+    Retorna os bits (array uint8, um bit por elemento) de bytes ou de um BitBuffer.
+    """
+    if not isinstance(dados, BitBuffer):
+        dados = BitBuffer(dados)
+    return dados.bits
@@ -0,0 +1,203 @@
+# canal.py
+import numpy as np
+from buffer_bits import como_bytes
+
+# === SIMULAÇÃO DO CANAL (INVERSÃO DE BITS) ===
+#
+# Os modelos sorteiam apenas as posições dos bits invertidos, de modo que o custo
+# cresce com o número de erros e não com o tamanho do quadro. As posições são
+# contadas a partir do bit mais significativo do primeiro byte.
+
+
+def criar_gerador(semente=None) -> np.random.Generator:
+    """
+    Retorna um numpy.random.Generator a partir de uma semente (ou o próprio gerador).
+    """
+    if isinstance(semente, np.random.Generator):
+        return semente
+    return np.random.default_rng(semente)
+
+
+def _validar_taxa(taxa: float):
+    if not (0.0 <= taxa <= 1.0):
+        raise ValueError("A taxa de erro deve estar entre 0.0 e 1.0")
+
+
+def posicoes_iid(n_bits: int, taxa: float, rng: np.random.Generator) -> np.ndarray:
+    """
+    Sorteia posições de erro independentes, cada bit invertido com probabilidade taxa.
+    A distância entre dois erros consecutivos segue uma distribuição geométrica,
+    então só os saltos entre erros são sorteados.
+    """
+    if taxa <= 0.0 or n_bits == 0:
+        return np.zeros(0, dtype=np.int64)
+    if taxa >= 1.0:
+        return np.arange(n_bits, dtype=np.int64)
+
+    esperado = n_bits * taxa
+    lote = int(esperado + 6 * np.sqrt(esperado) + 16)
+    partes = []
+    ultima = -1
+    while ultima < n_bits:
+        posicoes = ultima + np.cumsum(rng.geometric(taxa, size=lote))
+        partes.append(posicoes)
+        ultima = int(posicoes[-1])
+    posicoes = np.concatenate(partes)
+    return posicoes[:np.searchsorted(posicoes, n_bits)]
+
+
+class ModeloIID:
+    """
+    Erros independentes: cada bit é invertido com a mesma probabilidade (taxa).
+    """
+
+    def __init__(self, taxa: float):
+        _validar_taxa(taxa)
+        self.taxa = taxa
+
+    def posicoes(self, n_bits: int, rng: np.random.Generator) -> np.ndarray:
+        return posicoes_iid(n_bits, self.taxa, rng)
+
+
+class ModeloGilbertElliott:
+    """
+    Erros em rajada (modelo de Gilbert–Elliott): o canal alterna entre um estado Bom
+    e um estado Ruim, cada um com sua própria taxa de erro por bit.
+
+    Args:
+        p_bom_ruim: probabilidade, por bit, de passar do estado Bom para o Ruim.
+        p_ruim_bom: probabilidade, por bit, de voltar do estado Ruim para o Bom.
+        taxa_bom: taxa de erro no estado Bom.
+        taxa_ruim: taxa de erro no estado Ruim.
+    """
+
+    def __init__(self, p_bom_ruim: float, p_ruim_bom: float, taxa_bom: float = 0.0,
+                 taxa_ruim: float = 0.5):
+        for taxa in (p_bom_ruim, p_ruim_bom, taxa_bom, taxa_ruim):
+            _validar_taxa(taxa)
+        self.p_bom_ruim = p_bom_ruim
+        self.p_ruim_bom = p_ruim_bom
+        self.taxa_bom = taxa_bom
+        self.taxa_ruim = taxa_ruim
+
+    def _fronteiras(self, n_bits: int, rng: np.random.Generator):
+        """
+        Sorteia as permanências em cada estado até cobrir n_bits.
+        Retorna (estado inicial, posições onde cada permanência termina).
+        """
+        transicao = self.p_bom_ruim + self.p_ruim_bom
+        if transicao == 0:
+            return 0, np.array([n_bits])
+        # Estado inicial sorteado pela distribuição estacionária da cadeia
+        estado_inicial = int(rng.random() < self.p_bom_ruim / transicao)
+
+        saidas = (self.p_bom_ruim, self.p_ruim_bom)
+        if estado_inicial:
+            saidas = saidas[::-1]
+        # Sem saída de um dos estados, o canal fica nele para sempre
+        duracoes_maximas = [n_bits if p == 0 else None for p in saidas]
+
+        pares = max(int(n_bits * transicao / 2) + 16, 16)
+        partes = []
+        fim = 0
+        while fim < n_bits:
+            duracoes = np.empty((pares, 2), dtype=np.int64)
+            for estado in range(2):
+                if duracoes_maximas[estado] is None:
+                    duracoes[:, estado] = rng.geometric(saidas[estado], size=pares)
+                else:
+                    duracoes[:, estado] = duracoes_maximas[estado]
+            fronteiras = fim + np.cumsum(duracoes.reshape(-1))
+            partes.append(fronteiras)
+            fim = int(fronteiras[-1])
+        return estado_inicial, np.concatenate(partes)
+
+    def posicoes(self, n_bits: int, rng: np.random.Generator) -> np.ndarray:
+        estado_inicial, fronteiras = self._fronteiras(n_bits, rng)
+        posicoes = []
+        for estado, taxa in ((0, self.taxa_bom), (1, self.taxa_ruim)):
+            candidatas = posicoes_iid(n_bits, taxa, rng)
+            # Estado em cada posição: alterna a cada fronteira a partir do estado inicial
+            estados = (estado_inicial + np.searchsorted(fronteiras, candidatas, side='right')) % 2
+            posicoes.append(candidatas[estados == estado])
+        return np.sort(np.concatenate(posicoes))
+
+
+class ModeloPadraoFixo:
+    """
+    Padrão fixo de erros: inverte sempre as mesmas posições.
+    Com periodo, o padrão se repete a cada periodo bits.
+    """
+
+    def __init__(self, posicoes, periodo: int = None):
+        self.padrao = np.unique(np.asarray(posicoes, dtype=np.int64))
+        if periodo is not None and self.padrao.size and self.padrao[-1] >= periodo:
+            raise ValueError("As posições do padrão devem ser menores que o período.")
+        self.periodo = periodo
+
+    def posicoes(self, n_bits: int, rng: np.random.Generator = None) -> np.ndarray:
+        posicoes = self.padrao
+        if self.periodo:
+            inicios = np.arange(0, n_bits, self.periodo, dtype=np.int64)
+            posicoes = (inicios[:, None] + self.padrao).reshape(-1)
+        return posicoes[posicoes < n_bits]
+
+
+def inverter_bits(buffer, posicoes: np.ndarray):
+    """
+    Inverte, no próprio buffer (bytearray ou array uint8 gravável), os bits nas posições dadas.
+    """
+    alvo = buffer if isinstance(buffer, np.ndarray) else np.frombuffer(buffer, dtype=np.uint8)
+    mascaras = np.right_shift(0x80, posicoes & 7).astype(np.uint8)
+    np.bitwise_xor.at(alvo, posicoes >> 3, mascaras)
+
+
+def injetar_erros(dados, modelo, semente=None):
+    """
+    Aplica um modelo de erros a um quadro.
+    Um bytearray é modificado no próprio lugar; outros tipos são copiados antes.
+
+    Returns:
+        (quadro com erros como bytearray, posições dos bits invertidos)
+    """
+    rng = criar_gerador(semente)
+    quadro = dados if isinstance(dados, bytearray) else bytearray(como_bytes(dados))
+    posicoes = modelo.posicoes(len(quadro) * 8, rng)
+    inverter_bits(quadro, posicoes)
+    return quadro, posicoes
+
+
+class Canal:
+    """
+    Canal com modelo de erros e gerador próprios, para campanhas com muitos quadros.
+    Acumula o total de bits transmitidos e de bits invertidos.
+    """
+
+    def __init__(self, modelo, semente=None):
+        self.modelo = modelo
+        self.rng = criar_gerador(semente)
+        self.bits_transmitidos = 0
+        self.bits_invertidos = 0
+
+    def transmitir(self, quadro):
+        """Retorna (quadro com erros, posições invertidas)."""
+        quadro, posicoes = injetar_erros(quadro, self.modelo, self.rng)
+        self.bits_transmitidos += len(quadro) * 8
+        self.bits_invertidos += posicoes.size
+        return quadro, posicoes
+
+
+# === CANAL AWGN (CAMADA FÍSICA) ===
+
+def canal_awgn(sinal, eb_n0_db: float, amostras_por_bit: float, semente=None) -> np.ndarray:
+    """
+    Soma ruído branco gaussiano ao sinal modulado para uma relação Eb/N0 (em dB).
+    A energia por bit é medida no próprio sinal: Eb = potência média * amostras_por_bit.
+    Para modulações com vários bits por símbolo use samples_per_bit / bits por símbolo
+    (ex.: samples_per_bit / 3 no 8-QAM).
+    """
+    rng = criar_gerador(semente)
+    sinal = np.asarray(sinal, dtype=np.float64)
+    eb = np.mean(sinal ** 2) * amostras_por_bit
+    n0 = eb / 10 ** (eb_n0_db / 10)
+    return sinal + rng.normal(0.0, np.sqrt(n0 / 2), sinal.shape)
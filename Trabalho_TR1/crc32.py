@@ -0,0 +1,232 @@
+# crc32.py
+import struct
+from functools import lru_cache
+import numpy as np
+from buffer_bits import como_bytes
+
+# --- INÍCIO DA IMPLEMENTAÇÃO MANUAL DO CRC-32 ---
+
+def gerar_tabela_crc32() -> tuple:
+    """
+    Gera a tabela de consulta para o cálculo rápido do CRC-32.
+    O polinômio 0xEDB88320 é a representação refletida do polinômio padrão.
+    """
+    polinomio_refletido = 0xEDB88320
+    tabela_crc = []
+    for i in range(256):
+        crc = i
+        for _ in range(8):
+            if crc & 1:
+                crc = (crc >> 1) ^ polinomio_refletido
+            else:
+                crc = crc >> 1
+        tabela_crc.append(crc)
+    return tuple(tabela_crc)
+
+# A tabela é gerada uma única vez quando o módulo é carregado
+CRC32_TABLE = gerar_tabela_crc32()
+
+def calcular_crc32_manual(dados: bytes) -> int:
+    """
+    Calcula o checksum CRC-32 (padrão IEEE 802.3) para um conjunto de dados.
+    """
+    crc = 0xFFFFFFFF
+    for byte in como_bytes(dados):
+        indice = (crc ^ byte) & 0xFF
+        crc = (crc >> 8) ^ CRC32_TABLE[indice]
+    return crc ^ 0xFFFFFFFF
+
+# --- FIM DA IMPLEMENTAÇÃO MANUAL DO CRC-32 ---
+
+
+# === SLICING-BY-8 ===
+
+def gerar_tabelas_slicing8() -> tuple:
+    """
+    Gera as 8 tabelas do algoritmo slicing-by-8.
+    A tabela k dá o efeito de um byte seguido de k bytes zero sobre o registrador do CRC,
+    o que permite processar 8 bytes por iteração.
+    """
+    tabelas = [CRC32_TABLE]
+    for _ in range(7):
+        anterior = tabelas[-1]
+        tabelas.append(tuple((c >> 8) ^ CRC32_TABLE[c & 0xFF] for c in anterior))
+    return tuple(tabelas)
+
+CRC32_TABELAS_8 = gerar_tabelas_slicing8()
+
+def calcular_crc32_slicing8(dados: bytes, crc: int = 0) -> int:
+    """
+    CRC-32 (IEEE 802.3) pelo algoritmo slicing-by-8.
+    crc é o CRC dos dados anteriores, para continuar um cálculo (como em zlib.crc32).
+    """
+    dados = memoryview(como_bytes(dados)).cast('B')
+    t0, t1, t2, t3, t4, t5, t6, t7 = CRC32_TABELAS_8
+    crc ^= 0xFFFFFFFF
+    n8 = len(dados) // 8 * 8
+    for baixo, alto in struct.iter_unpack('<II', dados[:n8]):
+        baixo ^= crc
+        crc = (t7[baixo & 0xFF] ^ t6[(baixo >> 8) & 0xFF] ^
+               t5[(baixo >> 16) & 0xFF] ^ t4[baixo >> 24] ^
+               t3[alto & 0xFF] ^ t2[(alto >> 8) & 0xFF] ^
+               t1[(alto >> 16) & 0xFF] ^ t0[alto >> 24])
+    for byte in dados[n8:]:
+        crc = (crc >> 8) ^ t0[(crc ^ byte) & 0xFF]
+    return crc ^ 0xFFFFFFFF
+
+
+# === COMBINAÇÃO DE CRCs ===
+#
+# Acrescentar n bytes zero ao registrador do CRC é uma operação linear sobre GF(2).
+# Cada operador é guardado como a lista das imagens dos 32 bits do registrador.
+
+def _aplicar_operador(operador, valor: int) -> int:
+    resultado = 0
+    bit = 0
+    while valor:
+        if valor & 1:
+            resultado ^= operador[bit]
+        valor >>= 1
+        bit += 1
+    return resultado
+
+def _compor_operadores(a, b) -> list:
+    """Operador equivalente a aplicar b e depois a."""
+    return [_aplicar_operador(a, coluna) for coluna in b]
+
+# Operadores para 2^k bytes zero, estendidos sob demanda
+_POTENCIAS_ZEROS = [[(1 << i >> 8) ^ CRC32_TABLE[(1 << i) & 0xFF] for i in range(32)]]
+
+def _potencia_zeros(k: int) -> list:
+    while len(_POTENCIAS_ZEROS) <= k:
+        ultimo = _POTENCIAS_ZEROS[-1]
+        _POTENCIAS_ZEROS.append(_compor_operadores(ultimo, ultimo))
+    return _POTENCIAS_ZEROS[k]
+
+def _deslocar_zeros(crc: int, n: int) -> int:
+    """Efeito de n bytes zero sobre o registrador crc."""
+    k = 0
+    while n:
+        if n & 1:
+            crc = _aplicar_operador(_potencia_zeros(k), crc)
+        n >>= 1
+        k += 1
+    return crc
+
+def crc32_combine(crc_a: int, crc_b: int, len_b: int) -> int:
+    """
+    Combina CRC(A) e CRC(B) em CRC(A + B), sabendo apenas o tamanho de B em bytes.
+    Permite calcular o CRC de partes de um payload separadamente (ou em paralelo).
+    """
+    return _deslocar_zeros(crc_a, len_b) ^ crc_b
+
+@lru_cache(maxsize=64)
+def _tabelas_deslocamento(n: int) -> tuple:
+    """
+    Tabelas (4 x 256) do deslocamento por n bytes zero, uma para cada byte do registrador,
+    para aplicar o mesmo deslocamento muitas vezes com 4 consultas.
+    """
+    tabelas = []
+    for parte in range(4):
+        colunas = [_deslocar_zeros(1 << (8 * parte + i), n) for i in range(8)]
+        tabela = [0] * 256
+        for b in range(1, 256):
+            menor_bit = (b & -b).bit_length() - 1
+            tabela[b] = tabela[b & (b - 1)] ^ colunas[menor_bit]
+        tabelas.append(tuple(tabela))
+    return tuple(tabelas)
+
+
+# === VARIANTE NUMPY EM FAIXAS ===
+
+_CRC32_TABLE_NP = np.array(CRC32_TABLE, dtype=np.uint32)
+
+def calcular_crc32_linhas(matriz: np.ndarray) -> np.ndarray:
+    """
+    CRC-32 de cada linha de uma matriz uint8 (k x L), todas processadas juntas:
+    um byte de cada linha por passo. Retorna um array uint32 com k CRCs.
+    """
+    matriz = np.asarray(matriz, dtype=np.uint8)
+    # Linha j = j-ésimo byte de todas as linhas da matriz, contígua na memória
+    colunas = np.ascontiguousarray(matriz.T)
+    registradores = np.full(matriz.shape[0], 0xFFFFFFFF, dtype=np.uint32)
+    indices = np.empty(matriz.shape[0], dtype=np.uint32)
+    for linha in colunas:
+        np.bitwise_xor(registradores, linha, out=indices)
+        np.bitwise_and(indices, 0xFF, out=indices)
+        registradores >>= 8
+        registradores ^= _CRC32_TABLE_NP[indices]
+    return registradores ^ 0xFFFFFFFF
+
+def calcular_crc32_numpy(dados: bytes, crc: int = 0, faixas: int = None) -> int:
+    """
+    CRC-32 com NumPy: os dados são divididos em faixas consecutivas de mesmo tamanho,
+    todas processadas juntas (um byte de cada faixa por passo), e os CRCs das faixas são
+    combinados no final com crc32_combine.
+    """
+    dados = np.frombuffer(como_bytes(dados), dtype=np.uint8)
+    n = dados.size
+    if faixas is None:
+        faixas = min(max(int(np.sqrt(n)), 1), 1 << 16)
+    tamanho = n // faixas
+    if tamanho == 0:
+        return calcular_crc32_slicing8(dados, crc)
+
+    registradores = calcular_crc32_linhas(dados[:faixas * tamanho].reshape(faixas, tamanho))
+
+    t0, t1, t2, t3 = _tabelas_deslocamento(tamanho)
+    for crc_faixa in registradores.tolist():
+        crc = (t0[crc & 0xFF] ^ t1[(crc >> 8) & 0xFF] ^
+               t2[(crc >> 16) & 0xFF] ^ t3[crc >> 24]) ^ crc_faixa
+    return calcular_crc32_slicing8(dados[faixas * tamanho:], crc)
+
+
+# === API PRINCIPAL ===
+
+# A partir deste tamanho (bytes) a variante NumPy é mais rápida que o slicing-by-8
+LIMIAR_NUMPY = 4 * 1024
+
+def calcular_crc32(dados: bytes, crc: int = 0) -> int:
+    """
+    Calcula o CRC-32 (IEEE 802.3) escolhendo a variante mais rápida para o tamanho dos dados.
+    crc é o CRC dos dados anteriores, para continuar um cálculo (como em zlib.crc32).
+    """
+    dados = como_bytes(dados)
+    if len(dados) >= LIMIAR_NUMPY:
+        return calcular_crc32_numpy(dados, crc)
+    return calcular_crc32_slicing8(dados, crc)
+
+class Crc32:
+    """
+    Cálculo incremental do CRC-32: os dados são passados em pedaços com update()
+    e o resultado é lido com digest() (4 bytes, big-endian, como em aplicar_crc32).
+    """
+
+    def __init__(self, dados: bytes = b''):
+        self.valor = 0
+        self.tamanho = 0
+        if dados:
+            self.update(dados)
+
+    def update(self, dados: bytes) -> "Crc32":
+        dados = como_bytes(dados)
+        self.valor = calcular_crc32(dados, self.valor)
+        self.tamanho += len(dados)
+        return self
+
+    def combinar(self, outro: "Crc32") -> "Crc32":
+        """Acrescenta o CRC de outro trecho, calculado separadamente, ao final deste."""
+        self.valor = crc32_combine(self.valor, outro.valor, outro.tamanho)
+        self.tamanho += outro.tamanho
+        return self
+
+    def copy(self) -> "Crc32":
+        copia = Crc32()
+        copia.valor, copia.tamanho = self.valor, self.tamanho
+        return copia
+
+    def digest(self) -> bytes:
+        return self.valor.to_bytes(4, 'big')
+
+    def hexdigest(self) -> str:
+        return f"{self.valor:08x}"
@@ -0,0 +1,356 @@
+# emulador_enlace.py
+import argparse
+import asyncio
+import itertools
+import json
+import os
+import socket
+import string
+import subprocess
+import sys
+import threading
+import time
+import numpy as np
+from Camada_enlace import ENQUADRAMENTOS, montar_quadro
+from canal import ModeloIID, criar_gerador, injetar_erros
+from protocolo import (
+    TAMANHO_PREFIXO,
+    MAGIA,
+    CABECALHO,
+    ConexaoReceptor,
+    desempacotar_cabecalho
+)
+
+# === EMULADOR DE ENLACE COM PERDAS ===
+#
+# Proxy TCP local que fica entre o transmissor e o receptor_socket:
+#   transmissor -> 127.0.0.1:PORTA_EMULADOR -> emulador -> 127.0.0.1:12345 -> receptor
+# O emulador entende as mensagens do protocolo (cabeçalho binário ou metadados JSON),
+# então atrasa, reordena e corrompe cada quadro como uma unidade: os bits invertidos
+# atingem só o quadro, nunca o cabeçalho. Depois da negociação de uma sessão ARQ o
+# fluxo é tratado como bytes soltos (atraso e inversão de bits por pedaço lido, sem
+# reordenação, que misturaria os quadros).
+
+PORTA_EMULADOR = 12346
+
+TAMANHO_LEITURA = 64 * 1024
+
+
+class Enlace:
+    """
+    Modelo de um sentido do enlace: tempo de transmissão pela banda, latência com
+    jitter uniforme em [0, jitter), reordenação e inversão de bits (ModeloIID, como
+    introduzir_erro_por_taxa).
+
+    Args:
+        latencia: atraso de propagação em segundos.
+        jitter: atraso adicional máximo em segundos.
+        banda: bytes por segundo (None = sem limite).
+        taxa_reordenacao: probabilidade de um quadro ser atrasado para depois dos seguintes.
+        taxa_erro: probabilidade de inversão de cada bit.
+    """
+
+    def __init__(self, latencia: float = 0.0, jitter: float = 0.0, banda: float = None,
+                 taxa_reordenacao: float = 0.0, taxa_erro: float = 0.0, semente=None):
+        self.latencia = latencia
+        self.jitter = jitter
+        self.banda = banda
+        self.taxa_reordenacao = taxa_reordenacao
+        self.modelo = ModeloIID(taxa_erro)
+        self.rng = criar_gerador(semente)
+        self._livre = 0.0            # instante em que o enlace termina a transmissão atual
+        self._ultima_entrega = 0.0   # para manter a ordem quando não há reordenação
+
+    def instante_entrega(self, agora: float, tamanho: int, reordenar: bool = True) -> tuple:
+        """
+        Calcula quando um quadro de `tamanho` bytes que chegou em `agora` sai do enlace.
+        Retorna (instante de entrega, True se o quadro foi reordenado).
+        """
+        inicio = max(agora, self._livre)
+        self._livre = inicio + (tamanho / self.banda if self.banda else 0.0)
+        entrega = self._livre + self.latencia + self.jitter * self.rng.random()
+        reordenado = reordenar and self.taxa_reordenacao > 0 and self.rng.random() < self.taxa_reordenacao
+        if reordenado:
+            # Fica para trás dos próximos quadros
+            entrega += self.latencia + self.jitter + 2 * (entrega - agora)
+        else:
+            entrega = max(entrega, self._ultima_entrega)
+            self._ultima_entrega = entrega
+        return entrega, reordenado
+
+    def corromper(self, dados: bytes) -> tuple:
+        """Retorna (dados com bits invertidos, número de bits invertidos)."""
+        if self.modelo.taxa == 0 or not dados:
+            return dados, 0
+        quadro, posicoes = injetar_erros(dados, self.modelo, self.rng)
+        return bytes(quadro), posicoes.size
+
+
+class Emulador:
+    """
+    Proxy TCP com um Enlace em cada sentido. Registra, para cada quadro enviado ao
+    receptor, o tamanho, os bits invertidos e o atraso aplicado.
+    """
+
+    def __init__(self, ida: Enlace, volta: Enlace, destino=('127.0.0.1', 12345)):
+        self.ida = ida
+        self.volta = volta
+        self.destino = destino
+        self.registros = []
+
+    async def _ler_mensagem(self, reader):
+        """
+        Lê uma mensagem do protocolo. Retorna (cabeçalho em bytes, quadro, info)
+        ou None no fim da conexão; info é o Cabecalho ou o dict de metadados.
+        """
+        try:
+            prefixo = await reader.readexactly(TAMANHO_PREFIXO)
+        except asyncio.IncompleteReadError as e:
+            if not e.partial:
+                return None
+            raise
+        if prefixo[:len(MAGIA)] == MAGIA:
+            cabecalho = prefixo + await reader.readexactly(CABECALHO.size - TAMANHO_PREFIXO)
+            info = desempacotar_cabecalho(cabecalho)
+            return cabecalho, await reader.readexactly(info.tamanho), info
+
+        metadata_bytes = await reader.readexactly(int.from_bytes(prefixo, 'big'))
+        tamanho = await reader.readexactly(TAMANHO_PREFIXO)
+        quadro = await reader.readexactly(int.from_bytes(tamanho, 'big'))
+        return prefixo + metadata_bytes + tamanho, quadro, json.loads(metadata_bytes)
+
+    async def _ler_resposta(self, reader) -> bytes:
+        """Lê uma resposta do receptor (cabeçalho binário ou texto prefixado), sem alterá-la."""
+        prefixo = await reader.readexactly(TAMANHO_PREFIXO)
+        if prefixo[:len(MAGIA)] == MAGIA:
+            cabecalho = prefixo + await reader.readexactly(CABECALHO.size - TAMANHO_PREFIXO)
+            tamanho = desempacotar_cabecalho(cabecalho).tamanho
+            return cabecalho + await reader.readexactly(tamanho)
+        return prefixo + await reader.readexactly(int.from_bytes(prefixo, 'big'))
+
+    def _agendar(self, writer, enlace: Enlace, dados: bytes, agora: float) -> tuple:
+        """Agenda a escrita dos dados no instante em que saem do enlace."""
+        loop = asyncio.get_running_loop()
+        entrega, reordenado = enlace.instante_entrega(agora, len(dados))
+
+        def escrever():
+            if not writer.is_closing():
+                writer.write(dados)
+        loop.call_at(entrega, escrever)
+        return entrega, reordenado
+
+    async def _encaminhar_bruto(self, reader, writer, enlace: Enlace):
+        """Encaminha bytes soltos (sessão ARQ), sem reordenação."""
+        loop = asyncio.get_running_loop()
+        while dados := await reader.read(TAMANHO_LEITURA):
+            dados, _ = enlace.corromper(dados)
+            entrega, _ = enlace.instante_entrega(loop.time(), len(dados), reordenar=False)
+            loop.call_at(entrega, writer.write, dados)
+
+    async def _ida(self, reader, writer, modo_bruto: asyncio.Event):
+        loop = asyncio.get_running_loop()
+        while (mensagem := await self._ler_mensagem(reader)) is not None:
+            cabecalho, quadro, info = mensagem
+            agora = loop.time()
+            corrompido, invertidos = self.ida.corromper(quadro)
+            entrega, reordenado = self._agendar(writer, self.ida, cabecalho + corrompido, agora)
+            self.registros.append({
+                "seq": getattr(info, 'seq', None),
+                "bytes": len(quadro),
+                "bits_invertidos": invertidos,
+                "reordenado": reordenado,
+                "atraso": entrega - agora,
+            })
+            if isinstance(info, dict) and 'arq' in info:
+                modo_bruto.set()
+                await self._encaminhar_bruto(reader, writer, self.ida)
+                break
+
+    async def _volta(self, reader, writer, modo_bruto: asyncio.Event):
+        loop = asyncio.get_running_loop()
+        while not modo_bruto.is_set():
+            try:
+                resposta = await self._ler_resposta(reader)
+            except asyncio.IncompleteReadError:
+                return
+            self._agendar(writer, self.volta, resposta, loop.time())
+        await self._encaminhar_bruto(reader, writer, self.volta)
+
+    async def atender(self, reader_tx, writer_tx):
+        reader_rx, writer_rx = await asyncio.open_connection(*self.destino)
+        modo_bruto = asyncio.Event()
+        volta = asyncio.create_task(self._volta(reader_rx, writer_tx, modo_bruto))
+        try:
+            await self._ida(reader_tx, writer_rx, modo_bruto)
+            # Espera os quadros ainda no enlace antes de encerrar a conexão com o receptor
+            await asyncio.sleep(max(self.ida._ultima_entrega, self.ida._livre) - asyncio.get_running_loop().time())
+            writer_rx.write_eof()
+            await volta
+        except (asyncio.IncompleteReadError, ConnectionError):
+            volta.cancel()
+        finally:
+            await asyncio.sleep(max(self.volta._ultima_entrega - asyncio.get_running_loop().time(), 0))
+            writer_rx.close()
+            writer_tx.close()
+
+    async def servir(self, host: str = '127.0.0.1', port: int = PORTA_EMULADOR, pronto=None):
+        server = await asyncio.start_server(self.atender, host, port, reuse_address=True)
+        if pronto is not None:
+            pronto.set()
+        async with server:
+            await server.serve_forever()
+
+    def resumo(self) -> dict:
+        """Percentis do atraso aplicado aos quadros e totais de erros e reordenações."""
+        atrasos = np.array([r["atraso"] for r in self.registros])
+        if atrasos.size == 0:
+            return {"quadros": 0}
+        p50, p95, p99 = np.percentile(atrasos, [50, 95, 99])
+        return {
+            "quadros": atrasos.size,
+            "atraso_p50": p50,
+            "atraso_p95": p95,
+            "atraso_p99": p99,
+            "bits_invertidos": sum(r["bits_invertidos"] for r in self.registros),
+            "reordenados": sum(r["reordenado"] for r in self.registros),
+        }
+
+
+def iniciar_emulador(emulador: Emulador, host: str = '127.0.0.1', port: int = PORTA_EMULADOR):
+    """Executa o emulador em uma thread própria; retorna quando ele já aceita conexões."""
+    pronto = threading.Event()
+    thread = threading.Thread(target=asyncio.run, args=(emulador.servir(host, port, pronto),),
+                              daemon=True)
+    thread.start()
+    pronto.wait()
+    return thread
+
+
+# === MEDIÇÃO DE TODAS AS COMBINAÇÕES ===
+
+RECEPTOR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "receptor_socket.py")
+
+# Tempo máximo para o receptor começar a aceitar conexões (segundos)
+ESPERA_RECEPTOR = 10.0
+
+
+def esperar_receptor(processo: subprocess.Popen, port: int, limite: float = ESPERA_RECEPTOR):
+    """Tenta conectar à porta do receptor até ele aceitar conexões."""
+    fim = time.monotonic() + limite
+    while True:
+        try:
+            socket.create_connection(('127.0.0.1', port), timeout=1.0).close()
+            return
+        except OSError:
+            if processo.poll() is not None:
+                raise RuntimeError(f"O receptor terminou com código {processo.returncode}.")
+            if time.monotonic() > fim:
+                raise TimeoutError(f"O receptor não aceitou conexões na porta {port}.")
+            time.sleep(0.05)
+
+
+COMBINACOES_EDC = [("Paridade", 0), ("Paridade 2D", 0), ("CRC", 0), ("Hamming", 4), ("Hamming", 11)]
+
+
+def medir_combinacao(enq_tipo: str, err_tipo: str, m_bits: int, quadros: int = 200,
+                     tamanho_payload: int = 64, janela: int = 1, port: int = PORTA_EMULADOR,
+                     semente=None) -> dict:
+    """
+    Envia quadros pelo emulador e mede a latência de cada um (envio -> resposta), com até
+    `janela` quadros em trânsito. Um quadro é entregue se a resposta é o próprio payload.
+    """
+    rng = criar_gerador(semente)
+    letras = np.frombuffer(string.ascii_letters.encode(), dtype=np.uint8)
+    payloads = [rng.choice(letras, tamanho_payload).tobytes() for _ in range(quadros)]
+    enviados = {}
+    latencias = []
+    entregues = 0
+    with ConexaoReceptor('127.0.0.1', port) as conexao:
+        inicio = time.perf_counter()
+        proximo = 0
+        while len(latencias) < quadros:
+            while proximo < quadros and len(enviados) < janela:
+                quadro = montar_quadro(payloads[proximo], enq_tipo, err_tipo, m_bits)
+                seq = conexao.enviar(quadro, enq_tipo, err_tipo, m_bits)
+                enviados[seq] = (time.perf_counter(), payloads[proximo])
+                proximo += 1
+            seq, texto = conexao.receber()
+            envio, payload = enviados.pop(seq)
+            latencias.append(time.perf_counter() - envio)
+            entregues += texto.encode() == payload
+        duracao = time.perf_counter() - inicio
+
+    p50, p95, p99 = np.percentile(latencias, [50, 95, 99])
+    return {
+        "enquadramento": enq_tipo,
+        "edc": err_tipo,
+        "m_bits": m_bits,
+        "quadros": quadros,
+        "entregues": entregues,
+        "latencia_p50_ms": p50 * 1e3,
+        "latencia_p95_ms": p95 * 1e3,
+        "latencia_p99_ms": p99 * 1e3,
+        "vazao_kB_s": entregues * tamanho_payload / duracao / 1e3,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Emulador de enlace com perdas (proxy TCP local).")
+    parser.add_argument("--porta", type=int, default=PORTA_EMULADOR)
+    parser.add_argument("--destino", type=int, default=12345, help="porta do receptor_socket")
+    parser.add_argument("--latencia", type=float, default=10.0, help="ms")
+    parser.add_argument("--jitter", type=float, default=2.0, help="ms")
+    parser.add_argument("--banda", type=float, default=None, help="bytes/s (padrão: sem limite)")
+    parser.add_argument("--reordenacao", type=float, default=0.0, help="probabilidade por quadro")
+    parser.add_argument("--taxa-erro", type=float, default=0.0, help="probabilidade por bit")
+    parser.add_argument("--semente", type=int, default=None)
+    parser.add_argument("--medir", action="store_true",
+                        help="inicia um receptor e mede todas as combinações de enquadramento/EDC")
+    parser.add_argument("--quadros", type=int, default=200)
+    parser.add_argument("--payload", type=int, default=64, help="bytes por quadro")
+    parser.add_argument("--janela", type=int, default=1, help="quadros em trânsito")
+    parser.add_argument("--saida", default=None, help="arquivo .csv ou .npz com os resultados")
+    args = parser.parse_args()
+
+    sementes = np.random.SeedSequence(args.semente).spawn(3)
+    parametros = dict(latencia=args.latencia / 1e3, jitter=args.jitter / 1e3, banda=args.banda,
+                      taxa_reordenacao=args.reordenacao, taxa_erro=args.taxa_erro)
+    emulador = Emulador(Enlace(**parametros, semente=sementes[0]),
+                        Enlace(**parametros, semente=sementes[1]),
+                        ('127.0.0.1', args.destino))
+
+    if not args.medir:
+        print(f"Emulador em 127.0.0.1:{args.porta} -> 127.0.0.1:{args.destino}")
+        try:
+            asyncio.run(emulador.servir('127.0.0.1', args.porta))
+        except KeyboardInterrupt:
+            print(emulador.resumo())
+        return
+
+    receptor = subprocess.Popen([sys.executable, RECEPTOR, "--port", str(args.destino)],
+                                stdout=subprocess.DEVNULL)
+    try:
+        esperar_receptor(receptor, args.destino)
+        iniciar_emulador(emulador, '127.0.0.1', args.porta)
+        resultados = []
+        print(f"{'Enquadramento':<14} {'EDC':<12} {'Entregues':>9} {'p50 (ms)':>9} "
+              f"{'p95 (ms)':>9} {'p99 (ms)':>9} {'kB/s':>8}")
+        for enq_tipo, (err_tipo, m_bits) in itertools.product(ENQUADRAMENTOS, COMBINACOES_EDC):
+            r = medir_combinacao(enq_tipo, err_tipo, m_bits, args.quadros, args.payload,
+                                 args.janela, args.porta, sementes[2])
+            resultados.append(r)
+            edc = f"Hamming({m_bits})" if err_tipo == "Hamming" else err_tipo
+            print(f"{enq_tipo:<14} {edc:<12} {r['entregues']:>9} {r['latencia_p50_ms']:>9.2f} "
+                  f"{r['latencia_p95_ms']:>9.2f} {r['latencia_p99_ms']:>9.2f} {r['vazao_kB_s']:>8.1f}")
+        print(f"\nEnlace: {emulador.resumo()}")
+        if args.saida:
+            from varredura import salvar_resultados
+            salvar_resultados(resultados, args.saida)
+            print(f"Resultados salvos em {args.saida}")
+    finally:
+        receptor.terminate()
+        receptor.wait()
+
+
+if __name__ == "__main__":
+    main()
@@ -1,17 +1,27 @@
 import gi
 gi.require_version('Gtk', '3.0')
-from gi.repository import Gtk
-import socket
-from Camada_enlace import *
-from Camada_fisica import *
-import matplotlib.pyplot as plt
+from gi.repository import Gtk, GLib
+import threading
+import time
+from Camada_enlace import montar_quadro
+from Camada_fisica import DTYPE_COMPACTO, MODULACOES, nrz_polar
+from buffer_bits import BitBuffer
+from canal import ModeloIID, injetar_erros
+from matplotlib.figure import Figure
 from matplotlib.backends.backend_gtk3agg import FigureCanvasGTK3Agg as FigureCanvas
-import json
+from matplotlib.backends.backend_gtk3 import NavigationToolbar2GTK3 as NavigationToolbar
+from protocolo import ConexaoReceptor
+from arq import DESENQUADRADORES, GO_BACK_N, SELECTIVE_REPEAT, transmitir_arq
+from visualizador_onda import PiramideMinMax, VisualizadorOnda
+import metricas
 
 class InterfaceTransmissor(Gtk.Window):
     def __init__(self):
         super().__init__(title="Transmissor")
         self.set_default_size(800, 600)
+        self.conexao = None
+        self.trava_conexao = threading.Lock()   # self.conexao é usada pelas duas threads
+        self.connect("destroy", self.fechar_conexao)
 
         box = Gtk.Box(orientation=Gtk.Orientation.VERTICAL, spacing=10)
         self.add(box)
@@ -23,7 +33,8 @@ class InterfaceTransmissor(Gtk.Window):
         # --- CONTROLES DE CONFIGURAÇÃO ---
         self.combo_mod = self.criar_combo(["NRZ-Polar", "Manchester", "Bipolar", "ASK", "FSK", "8-QAM"], box, "Modulação")
         self.combo_enq = self.criar_combo(["Contagem", "Byte Stuffing", "Bit Stuffing"], box, "Enquadramento")
-        self.combo_err = self.criar_combo(["Paridade", "CRC", "Hamming"], box, "Detecção/Correção")
+        self.combo_err = self.criar_combo(["Paridade", "Paridade 2D", "CRC", "Hamming"], box, "Detecção/Correção")
+        self.combo_arq = self.criar_combo(["Desligado", GO_BACK_N, SELECTIVE_REPEAT], box, "ARQ (usa CRC)")
 
         # --- CÓDIGO  PARA A TAXA DE ERRO ---
     
@@ -34,18 +45,40 @@ class InterfaceTransmissor(Gtk.Window):
         box.pack_start(self.spin_taxa_erro, False, False, 5)
        
 
-        # --- BOTÃO DE AÇÃO ---
-        enviar_btn = Gtk.Button(label="Enviar Mensagem")
-        enviar_btn.connect("clicked", self.enviar_mensagem)
-        box.pack_start(enviar_btn, False, False, 0)
+        # --- BOTÕES DE AÇÃO E PROGRESSO ---
+        botoes = Gtk.Box(orientation=Gtk.Orientation.HORIZONTAL, spacing=10)
+        self.enviar_btn = Gtk.Button(label="Enviar Mensagem")
+        self.enviar_btn.connect("clicked", self.enviar_mensagem)
+        botoes.pack_start(self.enviar_btn, True, True, 0)
+        self.cancelar_btn = Gtk.Button(label="Cancelar")
+        self.cancelar_btn.connect("clicked", self.cancelar_envio)
+        self.cancelar_btn.set_sensitive(False)
+        botoes.pack_start(self.cancelar_btn, False, False, 0)
+        box.pack_start(botoes, False, False, 0)
+
+        self.progresso = Gtk.ProgressBar(show_text=True)
+        box.pack_start(self.progresso, False, False, 0)
 
         # --- ÁREA DE RESULTADO E GRÁFICO ---
         self.resultado = Gtk.Label(label="Mensagem recebida: (aguardando)")
         box.pack_start(self.resultado, False, False, 0)
+        self.latencias = Gtk.Label(label="")
+        box.pack_start(self.latencias, False, False, 0)
 
-        self.figure, self.ax = plt.subplots(figsize=(8, 2))
+        # Figure em vez de pyplot: o canvas GTK já gerencia a janela
+        self.figure = Figure(figsize=(8, 2))
+        self.ax = self.figure.add_subplot()
+        # Uma única linha, atualizada com set_data a cada envio e a cada zoom
+        self.linha, = self.ax.plot([], [])
+        self.ax.grid(True)
+        self.visualizador = VisualizadorOnda(self.ax, self.linha)
         self.canvas = FigureCanvas(self.figure)
         box.pack_start(self.canvas, True, True, 0)
+        box.pack_start(NavigationToolbar(self.canvas), False, False, 0)
+
+        self.cancelar = threading.Event()
+        self.redesenho = None
+        self.rtt = None
 
     def criar_combo(self, opcoes, box, titulo):
         box.pack_start(Gtk.Label(label=titulo), False, False, 0)
@@ -62,83 +95,171 @@ class InterfaceTransmissor(Gtk.Window):
             self.resultado.set_text("Mensagem vazia.")
             return
 
-        dados = msg.encode('utf-8')
-        tipo_mod = self.combo_mod.get_active_text()
-        tipo_enq = self.combo_enq.get_active_text()
-        tipo_err = self.combo_err.get_active_text()
+        # Os widgets só são lidos aqui, na thread da interface
+        configuracao = {
+            "dados": msg.encode('utf-8'),
+            "tipo_mod": self.combo_mod.get_active_text(),
+            "tipo_enq": self.combo_enq.get_active_text(),
+            "tipo_err": self.combo_err.get_active_text(),
+            "tipo_arq": self.combo_arq.get_active_text(),
+            "taxa_percentual": self.spin_taxa_erro.get_value(),
+        }
+        self.cancelar = threading.Event()
+        self.enviar_btn.set_sensitive(False)
+        self.cancelar_btn.set_sensitive(True)
+        self.progresso.set_fraction(0.0)
+        self.trabalho = threading.Thread(target=self.processar_envio, args=(configuracao, self.cancelar),
+                                         daemon=True)
+        self.trabalho.start()
+
+    def cancelar_envio(self, widget):
+        self.cancelar.set()
+        self.progresso.set_text("Cancelando...")
+        # Acorda o trabalho se ele estiver esperando a resposta no socket
+        self.fechar_conexao()
 
-        # --- Lógica de Enquadramento e Erro (igual a antes) ---
-        if tipo_enq == "Contagem":
-            quadro = enquadramento_contagem(dados)
-        elif tipo_enq == "Byte Stuffing":
-            quadro = enquadramento_byte_stuffing(dados)
-        else: # Bit Stuffing
-            quadro = enquadramento_bit_stuffing(dados)
+    # --- TRABALHO FORA DA THREAD DA INTERFACE ---
+    # Os resultados voltam para a interface com GLib.idle_add.
 
+    def informar(self, funcao, *args):
+        def executar():
+            funcao(*args)
+            return False
+        GLib.idle_add(executar)
+
+    def processar_envio(self, configuracao, cancelar):
+        try:
+            self._processar_envio(cancelar, **configuracao)
+        except InterruptedError:
+            self.informar(self.resultado.set_text, "Envio cancelado.")
+        except ConnectionRefusedError:
+            self.informar(self.resultado.set_text, "Erro: Conexão recusada. O receptor está rodando?")
+        except Exception as e:
+            if cancelar.is_set():
+                self.informar(self.resultado.set_text, "Envio cancelado.")
+            else:
+                self.informar(self.resultado.set_text, "Erro de comunicação: " + str(e))
+                self.fechar_conexao()
+        finally:
+            self.informar(self.concluir_envio)
+
+    def _processar_envio(self, cancelar, dados, tipo_mod, tipo_enq, tipo_err, tipo_arq, taxa_percentual):
+        def etapa(fracao, texto):
+            if cancelar.is_set():
+                raise InterruptedError
+            self.informar(self.mostrar_progresso, fracao, texto)
+
+        # --- Lógica de Enquadramento e Erro ---
+        etapa(0.1, "Enquadramento e detecção de erros")
         m_bits_hamming = 4  # m=4 para Hamming(7,4)
-        if tipo_err == "Paridade":
-            quadro_tx = aplicar_paridade_par(quadro)
-        elif tipo_err == "CRC":
-            quadro_tx = aplicar_crc32(quadro)
-        else: # Hamming
-            quadro_tx = codificar_hamming(quadro, m=m_bits_hamming)
-        taxa_percentual = self.spin_taxa_erro.get_value()
+        metricas.contar("tr1_quadros_total", lado="tx")
+        metricas.contar("tr1_bytes_total", len(dados), etapa="mensagem", lado="tx")
+        with metricas.etapa("enquadramento", "tx"):
+            quadro_tx = montar_quadro(dados, tipo_enq, tipo_err, m_bits_hamming)
+        metricas.contar("tr1_bytes_total", len(quadro_tx), etapa="enquadramento", lado="tx")
 
         if taxa_percentual > 0:
+            etapa(0.25, "Simulando erros no canal")
             taxa_decimal = taxa_percentual / 100.0
             print("\nSIMULANDO ERRO NO CANAL POR TAXA\n")
             # AQUI É O PONTO CRÍTICO: quadro_tx é REATRIBUÍDO com a versão com erro
-            quadro_tx = introduzir_erro_por_taxa(quadro_tx, taxa_de_erro=taxa_decimal)
+            with metricas.etapa("erros", "tx"):
+                quadro_tx, posicoes = injetar_erros(quadro_tx, ModeloIID(taxa_decimal))
+                quadro_tx = bytes(quadro_tx)
+            metricas.contar("tr1_bits_invertidos_total", posicoes.size, lado="tx")
+            print(f"Taxa de erro de {taxa_percentual:.2f}% aplicada. Total de {posicoes.size} bits invertidos.")
             print("\nFIM DA SIMULAÇÃO DE ERRO\n")
 
-     # Lógica de Modulação e Gráfico 
-        bits = [int(b) for byte in quadro_tx for b in f"{byte:08b}"]
-        mod_func = {
-            "NRZ-Polar": nrz_polar, "Manchester": manchester, "Bipolar": bipolar,
-            "ASK": ask_modulation, "FSK": fsk_modulation, "8-QAM": qam8_modulation
-        }.get(tipo_mod, nrz_polar)
-        t, s = mod_func(bits)
-        self.ax.clear()
-        estilo = 'steps-post' if tipo_mod in ["NRZ-Polar", "Manchester", "Bipolar"] else 'default'
-        self.ax.plot(t[:3000], s[:3000], drawstyle=estilo)
+        # Lógica de Modulação e Gráfico
+        etapa(0.4, "Modulando")
+        bits = BitBuffer(quadro_tx)
+        mod_func = MODULACOES.get(tipo_mod, nrz_polar)
+        with metricas.etapa("modulacao", "tx"):
+            sinal = mod_func(bits, dtype=DTYPE_COMPACTO.get(tipo_mod), retornar_sinal=True)
+        # A pirâmide é montada aqui; a interface só consulta o trecho visível
+        with metricas.etapa("piramide", "tx"):
+            piramide = PiramideMinMax.do_sinal(sinal)
+        self.informar(self.mostrar_sinal, piramide, tipo_mod)
+
+        etapa(0.7, "Enviando ao receptor")
+        if tipo_arq != "Desligado":
+            with metricas.etapa("arq", "tx"):
+                self.enviar_com_arq(dados, tipo_arq, tipo_enq, taxa_percentual / 100.0, cancelar)
+            return
+
+        # Envio via Socket (envia o quadro_tx final)
+        # A conexão é aberta no primeiro envio e reaproveitada nos seguintes
+        # A referência local continua válida se o cancelamento descartar self.conexao
+        with self.trava_conexao:
+            if self.conexao is None:
+                self.conexao = ConexaoReceptor("127.0.0.1", 12345)
+            conexao = self.conexao
+        m_bits = m_bits_hamming if tipo_err == "Hamming" else 0
+        print(f"\n[TX] Enviando {len(quadro_tx)} bytes para o receptor...")
+        print(f" -> DADOS (hex): {quadro_tx.hex(' ')}")
+
+        inicio = time.perf_counter()
+        resposta = conexao.transmitir(quadro_tx, tipo_enq, tipo_err, m_bits)
+        self.rtt = time.perf_counter() - inicio
+        metricas.observar("tr1_etapa_segundos", self.rtt, etapa="socket", lado="tx")
+        self.informar(self.resultado.set_text, "Mensagem recebida no receptor: " + resposta)
+
+    def enviar_com_arq(self, dados, tipo_arq, tipo_enq, taxa_erro, cancelar=None):
+        """
+        Envia a mensagem por uma conexão ARQ; o canal é simulado a cada transmissão,
+        então os quadros corrompidos são retransmitidos até chegarem corretos.
+        """
+        if tipo_enq not in DESENQUADRADORES:
+            self.informar(self.resultado.set_text, "Erro: o ARQ precisa de Byte Stuffing ou Bit Stuffing.")
+            return
+        r = transmitir_arq([dados], "127.0.0.1", 12345, tipo_arq, enq_tipo=tipo_enq,
+                           taxa_erro=taxa_erro, cancelar=cancelar)
+        self.rtt = r['duracao']
+        self.informar(self.resultado.set_text,
+                      f"Mensagem entregue com {tipo_arq}: {r['retransmissoes']} "
+                      f"retransmissões em {r['duracao'] * 1e3:.1f} ms.")
+
+    # --- ATUALIZAÇÕES DA INTERFACE (thread da interface) ---
+
+    def mostrar_progresso(self, fracao, texto):
+        self.progresso.set_fraction(fracao)
+        self.progresso.set_text(texto)
+
+    def mostrar_sinal(self, piramide, tipo_mod):
+        """
+        Mostra o sinal inteiro; zoom e deslocamento pela barra de ferramentas
+        redesenham só o trecho visível, no nível de detalhe da largura do gráfico.
+        """
+        inicio = time.perf_counter()
+        self.visualizador.exibir(piramide, degraus=tipo_mod in ["NRZ-Polar", "Manchester", "Bipolar"])
         self.ax.set_title(f"Sinal modulado: {tipo_mod}")
-        self.ax.grid(True)
         self.canvas.draw()
+        self.redesenho = time.perf_counter() - inicio
+        metricas.observar("tr1_etapa_segundos", self.redesenho, etapa="grafico", lado="tx")
 
-        # Envio via Socket (envia o quadro_tx final)
-        try:
-            with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as sock:
-                sock.connect(("127.0.0.1", 12345))
-
-                # 1. Preparar e enviar metadados
-                metadata = {
-                    "enq_tipo": tipo_enq,
-                    "err_tipo": tipo_err,
-                    "m_bits": m_bits_hamming if tipo_err == "Hamming" else 0
-                }
-                metadata_bytes = json.dumps(metadata).encode('utf-8')
-                
-                # Envia o tamanho dos metadados (cabeçalho de 4 bytes)
-                sock.sendall(len(metadata_bytes).to_bytes(4, 'big'))
-                # Envia os metadados
-                sock.sendall(metadata_bytes)
-                
-                # 2. Enviar o quadro de dados principal
-                sock.sendall(quadro_tx)
-                
-                # 3. Receber a resposta do servidor
-                resposta = sock.recv(1024)
-                self.resultado.set_text("Mensagem recebida no receptor: " + resposta.decode('utf-8'))
-                print(f"\n[TX] Enviando {len(quadro_tx)} bytes para o receptor...")
-                print(f" -> DADOS (hex): {quadro_tx.hex(' ')}")
-                sock.sendall(quadro_tx)
+    def concluir_envio(self):
+        self.enviar_btn.set_sensitive(True)
+        self.cancelar_btn.set_sensitive(False)
+        self.progresso.set_fraction(1.0)
+        self.progresso.set_text("Concluído" if not self.cancelar.is_set() else "Cancelado")
+        tempos = []
+        if self.redesenho is not None:
+            tempos.append(f"redesenho {self.redesenho * 1e3:.1f} ms")
+        if self.rtt is not None:
+            tempos.append(f"ida e volta {self.rtt * 1e3:.1f} ms")
+        self.latencias.set_text(", ".join(tempos))
+        self.redesenho = self.rtt = None
 
-        except ConnectionRefusedError:
-            self.resultado.set_text("Erro: Conexão recusada. O receptor está rodando?")
-        except Exception as e:
-            self.resultado.set_text("Erro de comunicação: " + str(e))
+    def fechar_conexao(self, *args):
+        """Descarta a conexão; um envio em andamento nela termina com erro."""
+        with self.trava_conexao:
+            conexao, self.conexao = self.conexao, None
+        if conexao is not None:
+            conexao.interromper()
 
 if __name__ == "__main__":
+    # TR1_METRICAS_PORTA=9101 publica as métricas do transmissor em /metrics
+    metricas.configurar_pelo_ambiente()
     win = InterfaceTransmissor()
     win.connect("destroy", Gtk.main_quit)
     win.show_all()
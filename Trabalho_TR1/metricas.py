@@ -0,0 +1,211 @@
+# metricas.py
+import bisect
+import json
+import os
+import sys
+import threading
+import time
+from contextlib import nullcontext
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# === INSTRUMENTAÇÃO DAS ETAPAS ===
+#
+# Temporizadores (histogramas de duração) e contadores para as etapas do transmissor e
+# do receptor. Desligada por padrão: enquanto desligada, etapa() devolve um contexto
+# vazio e contar() retorna logo no início, então o custo é o de uma chamada de função.
+#
+# Os valores ficam no processo em que as etapas rodam; com o receptor em vários
+# processos (--processos), só as etapas do processo principal são registradas.
+
+# Limites superiores (segundos) das faixas dos histogramas de duração
+FAIXAS = (1e-5, 2.5e-5, 5e-5, 1e-4, 2.5e-4, 5e-4, 1e-3, 2.5e-3, 5e-3, 1e-2, 2.5e-2, 5e-2,
+          0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+DESCRICOES = {
+    "tr1_etapa_segundos": "Duração de cada etapa do transmissor ou do receptor.",
+    "tr1_quadros_total": "Quadros processados.",
+    "tr1_bytes_total": "Bytes processados em cada etapa.",
+    "tr1_bits_invertidos_total": "Bits invertidos pelo canal simulado.",
+    "tr1_erros_detectados_total": "Quadros com erro detectado pela paridade ou pelo CRC.",
+    "tr1_blocos_corrigidos_total": "Blocos Hamming com um bit corrigido.",
+}
+
+_ativo = False
+_trava = threading.Lock()
+_contadores = {}    # (nome, rótulos) -> valor
+_histogramas = {}   # (nome, rótulos) -> [contagens por faixa, soma, total]
+_NULO = nullcontext()
+
+
+def ativar():
+    global _ativo
+    _ativo = True
+
+
+def desativar():
+    global _ativo
+    _ativo = False
+
+
+def ativo() -> bool:
+    return _ativo
+
+
+def zerar():
+    with _trava:
+        _contadores.clear()
+        _histogramas.clear()
+
+
+def _chave(nome: str, rotulos: dict) -> tuple:
+    return nome, tuple(sorted(rotulos.items()))
+
+
+def contar(nome: str, valor=1, **rotulos):
+    """Soma valor ao contador nome{rótulos}."""
+    if not _ativo:
+        return
+    chave = _chave(nome, rotulos)
+    with _trava:
+        _contadores[chave] = _contadores.get(chave, 0) + valor
+
+
+def observar(nome: str, segundos: float, **rotulos):
+    """Registra uma duração no histograma nome{rótulos}."""
+    if not _ativo:
+        return
+    chave = _chave(nome, rotulos)
+    faixa = bisect.bisect_left(FAIXAS, segundos)
+    with _trava:
+        histograma = _histogramas.get(chave)
+        if histograma is None:
+            histograma = _histogramas[chave] = [[0] * (len(FAIXAS) + 1), 0.0, 0]
+        histograma[0][faixa] += 1
+        histograma[1] += segundos
+        histograma[2] += 1
+
+
+class _Temporizador:
+    __slots__ = ("rotulos", "inicio")
+
+    def __init__(self, rotulos: dict):
+        self.rotulos = rotulos
+
+    def __enter__(self):
+        self.inicio = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        observar("tr1_etapa_segundos", time.perf_counter() - self.inicio, **self.rotulos)
+
+
+def etapa(nome: str, lado: str):
+    """
+    Contexto que mede a duração de uma etapa:
+        with metricas.etapa("modulacao", "tx"): ...
+    """
+    if not _ativo:
+        return _NULO
+    return _Temporizador({"etapa": nome, "lado": lado})
+
+
+# === EXPORTAÇÃO ===
+
+def _formatar_rotulos(rotulos, extra=()) -> str:
+    pares = [f'{k}="{v}"' for k, v in tuple(rotulos) + tuple(extra)]
+    return "{" + ",".join(pares) + "}" if pares else ""
+
+
+def exportar_prometheus() -> str:
+    """Todos os valores no formato de texto do Prometheus."""
+    with _trava:
+        contadores = sorted(_contadores.items())
+        histogramas = sorted((k, (list(v[0]), v[1], v[2])) for k, v in _histogramas.items())
+
+    linhas = []
+    vistos = set()
+
+    def cabecalho(nome, tipo):
+        if nome not in vistos:
+            vistos.add(nome)
+            linhas.append(f"# HELP {nome} {DESCRICOES.get(nome, nome)}")
+            linhas.append(f"# TYPE {nome} {tipo}")
+
+    for (nome, rotulos), valor in contadores:
+        cabecalho(nome, "counter")
+        linhas.append(f"{nome}{_formatar_rotulos(rotulos)} {valor}")
+    for (nome, rotulos), (contagens, soma, total) in histogramas:
+        cabecalho(nome, "histogram")
+        acumulado = 0
+        for limite, contagem in zip(FAIXAS + ("+Inf",), contagens):
+            acumulado += contagem
+            linhas.append(f"{nome}_bucket{_formatar_rotulos(rotulos, [('le', limite)])} {acumulado}")
+        linhas.append(f"{nome}_sum{_formatar_rotulos(rotulos)} {soma}")
+        linhas.append(f"{nome}_count{_formatar_rotulos(rotulos)} {total}")
+    return "\n".join(linhas) + "\n"
+
+
+def resumo() -> dict:
+    """Contadores e, para cada etapa, número de execuções, tempo total e tempo médio."""
+    with _trava:
+        contadores = {f"{nome}{_formatar_rotulos(rotulos)}": valor
+                      for (nome, rotulos), valor in _contadores.items()}
+        etapas = {f"{nome}{_formatar_rotulos(rotulos)}": {"total": total, "segundos": soma,
+                                                           "media": soma / total}
+                  for (nome, rotulos), (_, soma, total) in _histogramas.items()}
+    return {"contadores": contadores, "etapas": etapas}
+
+
+class _Manipulador(BaseHTTPRequestHandler):
+    def do_GET(self):
+        if self.path.split("?")[0] != "/metrics":
+            self.send_error(404)
+            return
+        corpo = exportar_prometheus().encode('utf-8')
+        self.send_response(200)
+        self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+        self.send_header("Content-Length", str(len(corpo)))
+        self.end_headers()
+        self.wfile.write(corpo)
+
+    def log_message(self, *args):
+        pass
+
+
+def servir_http(porta: int, host: str = '127.0.0.1') -> ThreadingHTTPServer:
+    """Liga a instrumentação e publica /metrics em uma thread separada."""
+    ativar()
+    servidor = ThreadingHTTPServer((host, porta), _Manipulador)
+    threading.Thread(target=servidor.serve_forever, daemon=True).start()
+    return servidor
+
+
+def despejo_periodico(intervalo: float, destino=None) -> threading.Event:
+    """
+    Liga a instrumentação e escreve o resumo em JSON (uma linha) a cada `intervalo`
+    segundos. Retorna o evento que encerra o despejo.
+    """
+    ativar()
+    parar = threading.Event()
+
+    def despejar():
+        while not parar.wait(intervalo):
+            print(json.dumps(resumo()), file=destino or sys.stderr, flush=True)
+
+    threading.Thread(target=despejar, daemon=True).start()
+    return parar
+
+
+def configurar_pelo_ambiente():
+    """
+    Liga a instrumentação conforme as variáveis de ambiente:
+    TR1_METRICAS=1, TR1_METRICAS_PORTA (endpoint HTTP) e TR1_METRICAS_INTERVALO (despejo).
+    """
+    porta = os.environ.get("TR1_METRICAS_PORTA")
+    intervalo = os.environ.get("TR1_METRICAS_INTERVALO")
+    if os.environ.get("TR1_METRICAS") == "1":
+        ativar()
+    if porta:
+        servir_http(int(porta))
+    if intervalo:
+        despejo_periodico(float(intervalo))
@@ -0,0 +1,313 @@
+# paralelo.py
+import argparse
+import os
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager
+from multiprocessing import resource_tracker
+from multiprocessing.shared_memory import SharedMemory
+import numpy as np
+from Camada_enlace import codificar_hamming, decodificar_hamming, obter_codec_hamming, paridade_par
+from Camada_fisica import DTYPE_COMPACTO, MODULACOES
+from crc32 import calcular_crc32, crc32_combine
+from sinal import Signal
+
+# === EXECUÇÃO EM PARTES PARALELAS ===
+#
+# Payloads grandes são divididos em partes que terminam em fronteiras de palavra-código
+# (Hamming) ou de símbolo (modulação), e cada parte é processada por um processo do
+# pool. A entrada e a saída ficam em memória compartilhada (multiprocessing.shared_memory):
+# cada tarefa recebe só o nome dos blocos e os limites da sua parte, então os dados não
+# são serializados entre os processos. Os CRCs das partes são unidos com crc32_combine.
+#
+# Cada função aceita um executor já criado com criar_executor (para não pagar a criação
+# do pool a cada chamada) ou cria um com `processos` processos. tamanho_minimo_parte
+# (bytes) limita o quanto os dados são divididos.
+
+# Partes por processo (partes menores equilibram melhor a carga)
+PARTES_POR_PROCESSO = 4
+
+# Abaixo deste tamanho (bytes) uma parte não compensa o custo de uma tarefa
+TAMANHO_MINIMO_PARTE = 256 * 1024
+
+
+def dividir_em_partes(total: int, unidade: int, processos: int,
+                      tamanho_minimo: int = TAMANHO_MINIMO_PARTE) -> list:
+    """
+    Divide `total` bytes em intervalos [inicio, fim) cujos tamanhos são múltiplos de
+    `unidade`, exceto o último, que fica com o resto.
+    """
+    unidades = total // unidade
+    por_parte = max(-(-unidades // (processos * PARTES_POR_PROCESSO)),
+                    -(-tamanho_minimo // unidade), 1)
+    limites = [min(i * por_parte, unidades) * unidade for i in range(-(-unidades // por_parte))]
+    limites.append(total)
+    return [(inicio, fim) for inicio, fim in zip(limites, limites[1:]) if fim > inicio] or [(0, total)]
+
+
+@contextmanager
+def _memoria(tamanho: int):
+    """Bloco de memória compartilhada, liberado ao sair."""
+    memoria = SharedMemory(create=True, size=max(tamanho, 1))
+    try:
+        yield memoria
+    finally:
+        memoria.close()
+        memoria.unlink()
+
+
+def criar_executor(processos: int = None) -> ProcessPoolExecutor:
+    """
+    Pool de processos para as funções deste módulo. O resource_tracker é iniciado antes
+    do pool para que os processos o herdem: um processo com tracker próprio apagaria os
+    blocos compartilhados que abriu (e avisaria de um vazamento) ao terminar.
+    """
+    resource_tracker.ensure_running()
+    return ProcessPoolExecutor(max_workers=processos)
+
+
+@contextmanager
+def _pool(processos: int = None, executor=None):
+    if executor is not None:
+        yield executor
+        return
+    with criar_executor(processos) as executor:
+        yield executor
+
+
+def _executar_parte(tarefa, nome_entrada: str, nome_saida: str, *args):
+    """
+    Roda no processo do pool: abre os blocos compartilhados pelo nome e executa a tarefa
+    sobre eles. As visões criadas pela tarefa são liberadas no retorno, antes de fechar.
+    """
+    entrada = SharedMemory(name=nome_entrada)
+    saida = SharedMemory(name=nome_saida) if nome_saida is not None else None
+    try:
+        return tarefa(entrada.buf, saida.buf if saida is not None else None, *args)
+    finally:
+        entrada.close()
+        if saida is not None:
+            saida.close()
+
+
+def _distribuir(executor, tarefa, entrada, saida, partes) -> list:
+    """Submete uma tarefa por parte e retorna os resultados na ordem das partes."""
+    nome_saida = saida.name if saida is not None else None
+    futuros = [executor.submit(_executar_parte, tarefa, entrada.name, nome_saida, *parte)
+               for parte in partes]
+    return [futuro.result() for futuro in futuros]
+
+
+def _copiar_para_memoria(memoria, dados) -> int:
+    dados = memoryview(dados).cast('B')
+    memoria.buf[:len(dados)] = dados
+    return len(dados)
+
+
+# === TAREFAS (executadas nos processos do pool) ===
+
+def _tarefa_crc32(entrada, _, inicio: int, fim: int) -> tuple:
+    return calcular_crc32(entrada[inicio:fim]), fim - inicio
+
+
+def _tarefa_codificar_hamming(entrada, saida, inicio: int, fim: int, destino: int, m: int) -> int:
+    codigo = codificar_hamming(entrada[inicio:fim], m)
+    saida[destino:destino + len(codigo)] = codigo
+    return len(codigo)
+
+
+def _tarefa_decodificar_hamming(entrada, saida, inicio: int, fim: int, destino: int,
+                                m: int) -> int:
+    dados, corrigidos = obter_codec_hamming(m).decodificar(entrada[inicio:fim],
+                                                           retornar_corrigidos=True)
+    saida[destino:destino + len(dados)] = dados
+    return corrigidos
+
+
+def _tarefa_modular(entrada, saida, inicio: int, fim: int, destino: int, tipo_mod: str,
+                    samples_per_bit: int, dtype, invertido: bool) -> int:
+    sinal = MODULACOES[tipo_mod](np.unpackbits(np.frombuffer(entrada[inicio:fim], np.uint8)),
+                                 samples_per_bit=samples_per_bit, dtype=dtype,
+                                 retornar_sinal=True).amostras
+    amostras = np.frombuffer(saida, sinal.dtype, sinal.size, destino * sinal.itemsize)
+    if invertido:
+        # Bipolar: a alternância do AMI continua do último '1' das partes anteriores
+        np.negative(sinal, out=amostras)
+    else:
+        amostras[:] = sinal
+    return sinal.size
+
+
+# === API ===
+
+def crc32_paralelo(dados, processos: int = None, executor=None,
+                   tamanho_minimo_parte: int = TAMANHO_MINIMO_PARTE) -> int:
+    """CRC-32 dos dados, com as partes calculadas em paralelo e unidas com crc32_combine."""
+    partes = dividir_em_partes(len(dados), 1, processos or os.cpu_count(), tamanho_minimo_parte)
+    with _memoria(len(dados)) as entrada, _pool(processos, executor) as executor:
+        _copiar_para_memoria(entrada, dados)
+        resultados = _distribuir(executor, _tarefa_crc32, entrada, None, partes)
+    crc = 0
+    for crc_parte, tamanho in resultados:
+        crc = crc32_combine(crc, crc_parte, tamanho)
+    return crc
+
+
+def codificar_hamming_paralelo(dados, m: int, processos: int = None, executor=None,
+                               tamanho_minimo_parte: int = TAMANHO_MINIMO_PARTE) -> bytes:
+    """
+    Mesmo resultado de codificar_hamming(dados, m). Cada parte tem um múltiplo de m bytes
+    (8 palavras-código), então a saída de cada parte começa em uma fronteira de byte.
+    """
+    codec = obter_codec_hamming(m)
+    total = len(dados)
+    blocos = -(-total * 8 // m)
+    tamanho_saida = -(-blocos * codec.n // 8)
+    partes = [(inicio, fim, inicio // m * codec.n, m)
+              for inicio, fim in dividir_em_partes(total, m, processos or os.cpu_count(),
+                                                   tamanho_minimo_parte)]
+    with _memoria(total) as entrada, _memoria(tamanho_saida) as saida, \
+            _pool(processos, executor) as executor:
+        _copiar_para_memoria(entrada, dados)
+        _distribuir(executor, _tarefa_codificar_hamming, entrada, saida, partes)
+        return bytes(saida.buf[:tamanho_saida])
+
+
+def decodificar_hamming_paralelo(codigo, m: int, processos: int = None, executor=None,
+                                 retornar_corrigidos: bool = False,
+                                 tamanho_minimo_parte: int = TAMANHO_MINIMO_PARTE):
+    """
+    Mesmo resultado de decodificar_hamming(codigo, m), com partes de múltiplos de n bytes
+    (8 palavras-código). Com retornar_corrigidos=True, retorna também quantos blocos
+    foram corrigidos.
+    """
+    codec = obter_codec_hamming(m)
+    total = len(codigo)
+    tamanho_saida = total * 8 // codec.n * m // 8
+    partes = [(inicio, fim, inicio // codec.n * m, m)
+              for inicio, fim in dividir_em_partes(total, codec.n, processos or os.cpu_count(),
+                                                   tamanho_minimo_parte)]
+    with _memoria(total) as entrada, _memoria(tamanho_saida) as saida, \
+            _pool(processos, executor) as executor:
+        _copiar_para_memoria(entrada, codigo)
+        corrigidos = sum(_distribuir(executor, _tarefa_decodificar_hamming, entrada, saida, partes))
+        dados = bytes(saida.buf[:tamanho_saida])
+    if retornar_corrigidos:
+        return dados, corrigidos
+    return dados
+
+
+def modular_paralelo(dados, tipo_mod: str, samples_per_bit: int = 100, dtype=None,
+                     processos: int = None, executor=None,
+                     tamanho_minimo_parte: int = TAMANHO_MINIMO_PARTE) -> Signal:
+    """
+    Modula os bits dos dados como MODULACOES[tipo_mod](bits, samples_per_bit, dtype=dtype),
+    com partes de múltiplos de 3 bytes (24 bits: símbolos inteiros do 8-QAM).
+    Retorna um Signal.
+    """
+    modular = MODULACOES[tipo_mod]
+    total = len(dados)
+    # Amostras de 3 bytes e do resto que não completa 3 bytes (o 8-QAM completa o último trio)
+    unidade = modular(np.zeros(24, np.uint8), samples_per_bit=samples_per_bit, dtype=dtype,
+                      retornar_sinal=True).amostras
+    resto = modular(np.zeros(total % 3 * 8, np.uint8), samples_per_bit=samples_per_bit,
+                    dtype=dtype, retornar_sinal=True).amostras.size
+    tamanho_saida = total // 3 * unidade.size + resto
+
+    visao = memoryview(dados).cast('B')
+    invertido = False
+    partes = []
+    for inicio, fim in dividir_em_partes(total, 3, processos or os.cpu_count(), tamanho_minimo_parte):
+        partes.append((inicio, fim, inicio // 3 * unidade.size, tipo_mod, samples_per_bit,
+                       dtype, invertido))
+        if tipo_mod == "Bipolar":
+            invertido ^= bool(paridade_par(visao[inicio:fim]))
+
+    with _memoria(total) as entrada, _memoria(tamanho_saida * unidade.itemsize) as saida, \
+            _pool(processos, executor) as executor:
+        _copiar_para_memoria(entrada, visao)
+        _distribuir(executor, _tarefa_modular, entrada, saida, partes)
+        amostras = np.frombuffer(saida.buf, unidade.dtype, tamanho_saida).copy()
+    return Signal(amostras, 1 / samples_per_bit)
+
+
+# === RELATÓRIO DE ACELERAÇÃO ===
+
+def _aquecer(executor, processos: int):
+    """Inicia todos os processos do pool antes das medições."""
+    for futuro in [executor.submit(os.getpid) for _ in range(processos)]:
+        futuro.result()
+
+
+def medir_aceleracao(megabytes: float = 8, m: int = 4, tipo_mod: str = "NRZ-Polar",
+                     samples_per_bit: int = 8, megabytes_modulacao: float = 1,
+                     lista_processos=None, tempo_minimo: float = 0.5, log=print) -> list:
+    """
+    Mede cada operação em série e com cada número de processos de lista_processos,
+    conferindo que os resultados são iguais. Retorna uma linha por (operação, processos)
+    com tempo, aceleração sobre a versão em série e eficiência (aceleração / processos).
+    """
+    from benchmark import medir
+
+    nucleos = os.cpu_count()
+    if lista_processos is None:
+        lista_processos = sorted({1, 2, 4, nucleos} | {2 ** k for k in range(nucleos.bit_length())})
+    rng = np.random.default_rng(0)
+    payload = rng.bytes(int(megabytes * 2 ** 20))
+    codigo = codificar_hamming(payload, m)
+    payload_mod = payload[:int(megabytes_modulacao * 2 ** 20)]
+    dtype = DTYPE_COMPACTO[tipo_mod]
+
+    def modular_serie(dados):
+        return MODULACOES[tipo_mod](np.unpackbits(np.frombuffer(dados, np.uint8)),
+                                    samples_per_bit=samples_per_bit, dtype=dtype,
+                                    retornar_sinal=True).amostras
+
+    operacoes = [
+        ("crc32", len(payload), lambda: calcular_crc32(payload),
+         lambda ex, p: crc32_paralelo(payload, p, ex)),
+        (f"hamming_cod_m{m}", len(payload), lambda: codificar_hamming(payload, m),
+         lambda ex, p: codificar_hamming_paralelo(payload, m, p, ex)),
+        (f"hamming_dec_m{m}", len(codigo), lambda: decodificar_hamming(codigo, m),
+         lambda ex, p: decodificar_hamming_paralelo(codigo, m, p, ex)),
+        (f"modulacao_{tipo_mod}", len(payload_mod), lambda: modular_serie(payload_mod),
+         lambda ex, p: modular_paralelo(payload_mod, tipo_mod, samples_per_bit, dtype, p, ex).amostras),
+    ]
+
+    log(f"{nucleos} núcleos disponíveis; processos medidos: {lista_processos}")
+    linhas = []
+    for nome, tamanho, serie, paralela in operacoes:
+        esperado = serie()
+        t_serie = medir(serie, tempo_minimo=tempo_minimo)
+        log(f"{nome:<22} série       {t_serie * 1e3:9.1f} ms  {tamanho / t_serie / 1e6:8.1f} MB/s")
+        for processos in lista_processos:
+            with criar_executor(processos) as executor:
+                _aquecer(executor, processos)
+                if not np.array_equal(np.asarray(paralela(executor, processos)), np.asarray(esperado)):
+                    raise AssertionError(f"{nome}: resultado paralelo diferente do em série")
+                t = medir(paralela, executor, processos, tempo_minimo=tempo_minimo)
+            aceleracao = t_serie / t
+            linhas.append({"operacao": nome, "processos": processos, "nucleos": nucleos,
+                           "segundos": t, "aceleracao": aceleracao,
+                           "eficiencia": aceleracao / processos})
+            aviso = "  (mais processos que núcleos)" if processos > nucleos else ""
+            log(f"{nome:<22} {processos:>2} processos {t * 1e3:9.1f} ms  "
+                f"aceleração {aceleracao:5.2f}x  eficiência {aceleracao / processos:4.0%}{aviso}")
+    return linhas
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Aceleração da execução paralela em partes.")
+    parser.add_argument("--megabytes", type=float, default=8, help="payload do CRC e do Hamming")
+    parser.add_argument("--megabytes-modulacao", type=float, default=1, help="payload da modulação")
+    parser.add_argument("--m", type=int, default=4, help="bits de dados do Hamming")
+    parser.add_argument("--modulacao", default="NRZ-Polar", choices=list(MODULACOES))
+    parser.add_argument("--samples-per-bit", type=int, default=8)
+    parser.add_argument("--processos", type=int, nargs="+", help="números de processos a medir")
+    parser.add_argument("--tempo-minimo", type=float, default=0.5)
+    args = parser.parse_args()
+    medir_aceleracao(args.megabytes, args.m, args.modulacao, args.samples_per_bit,
+                     args.megabytes_modulacao, args.processos, args.tempo_minimo)
+
+
+if __name__ == "__main__":
+    main()
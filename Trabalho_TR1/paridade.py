@@ -0,0 +1,205 @@
+# paridade.py
+import numpy as np
+from buffer_bits import como_bytes
+
+# === MOTOR DE PARIDADE ===
+#
+# A paridade de um conjunto de bytes é a paridade do XOR de todos eles. Cada trecho é
+# reduzido a um único byte com np.bitwise_xor (sobre palavras de 64 bits, uma passada
+# pelos dados, sem desempacotar os bits) e a tabela PARIDADE_BYTE dá a paridade dele.
+
+# Número de uns de cada valor de byte
+POPCOUNT = np.unpackbits(np.arange(256, dtype=np.uint8)[:, None], axis=1).sum(axis=1).astype(np.uint8)
+
+# Paridade (0 ou 1) de cada valor de byte
+PARIDADE_BYTE = POPCOUNT & 1
+
+
+def como_array(dados) -> np.ndarray:
+    """Bytes, bytearray, memoryview, BitBuffer ou array como array uint8, sem cópia."""
+    if isinstance(dados, np.ndarray):
+        return dados.astype(np.uint8, copy=False).reshape(-1)
+    visao = memoryview(como_bytes(dados))
+    if visao.format != 'B' or visao.ndim != 1:
+        visao = visao.cast('B')
+    return np.frombuffer(visao, dtype=np.uint8)
+
+
+def xor_bytes(dados) -> int:
+    """XOR de todos os bytes dos dados (0 para dados vazios)."""
+    dados = como_array(dados)
+    inteiros = dados.size // 8 * 8
+    xor = 0
+    if inteiros:
+        # XOR das palavras de 64 bits, depois das 8 fatias de um byte da palavra resultante
+        xor = int(np.bitwise_xor.reduce(dados[:inteiros].view(np.uint64)))
+        xor ^= xor >> 32
+        xor ^= xor >> 16
+        xor ^= xor >> 8
+    if inteiros < dados.size:
+        xor ^= int(np.bitwise_xor.reduce(dados[inteiros:]))
+    return xor & 0xFF
+
+
+def paridade_par(dados) -> int:
+    """Bit de paridade par dos dados."""
+    return int(PARIDADE_BYTE[xor_bytes(dados)])
+
+
+def indices_faixas(inicios: np.ndarray, tamanhos: np.ndarray) -> np.ndarray:
+    """Concatenação de arange(inicio, inicio + tamanho) para cada faixa."""
+    deslocamentos = np.cumsum(tamanhos) - tamanhos
+    return np.arange(tamanhos.sum()) + np.repeat(inicios - deslocamentos, tamanhos)
+
+
+def xor_faixas(dados, inicios: np.ndarray, tamanhos: np.ndarray) -> np.ndarray:
+    """
+    XOR dos bytes de cada faixa dados[inicio:inicio + tamanho], todas com um único
+    np.bitwise_xor.reduceat sobre os limites (início, fim) intercalados.
+    """
+    dados = como_array(dados)
+    inicios = np.asarray(inicios, dtype=np.int64)
+    tamanhos = np.asarray(tamanhos, dtype=np.int64)
+    xor = np.zeros(inicios.size, dtype=np.uint8)
+    cheias = tamanhos > 0
+    if not cheias.any():
+        return xor
+    inicios, fins = inicios[cheias], inicios[cheias] + tamanhos[cheias]
+    # reduceat só aceita índices dentro dos dados: uma faixa que termina no fim dos dados
+    # é reduzida até o penúltimo byte e o último é acrescentado depois
+    ultimo = dados.size - 1
+    limites = np.stack((inicios, np.minimum(fins, ultimo)), axis=1).reshape(-1)
+    parciais = np.bitwise_xor.reduceat(dados, limites)[::2]
+    no_fim = (fins > ultimo) & (inicios < ultimo)
+    parciais[no_fim] ^= dados[ultimo]
+    xor[cheias] = parciais
+    return xor
+
+
+def paridades_faixas(dados, inicios: np.ndarray, tamanhos: np.ndarray) -> np.ndarray:
+    """Bit de paridade par de cada faixa (array uint8)."""
+    return PARIDADE_BYTE[xor_faixas(dados, inicios, tamanhos)]
+
+
+# === PARIDADE BIDIMENSIONAL ===
+#
+# O payload é visto como uma matriz com um byte por linha e 8 colunas de bits:
+#   [payload (L bytes)][paridade de cada linha: L bits, compactados][paridade das colunas: 1 byte]
+# A paridade das colunas é o XOR de todos os bytes do payload. Um bit errado no payload
+# aparece em exatamente uma linha e uma coluna, e é corrigido invertendo esse bit; um
+# erro só nas linhas ou só nas colunas está nos bits de paridade e o payload está
+# intacto. Com mais de um bit errado o erro costuma ser apenas detectado.
+#
+# O custo é de 1 bit por byte mais 1 byte por quadro (~12,5%), próximo do Hamming(72, 64),
+# mas calculado com uma tabela e um XOR em vez de produtos de matrizes.
+
+def paridade_linhas(dados) -> np.ndarray:
+    """
+    Paridade de cada byte, compactada 8 por byte (o mesmo que
+    np.packbits(PARIDADE_BYTE[dados])). Cada palavra de 64 bits é dobrada sobre si
+    mesma até a paridade de cada byte ficar no seu bit menos significativo, e uma
+    multiplicação junta esses 8 bits no byte mais alto.
+    """
+    dados = como_array(dados)
+    inteiros = dados.size // 8
+    palavras = dados[:inteiros * 8].view('<u8')
+    dobra = palavras >> np.uint64(4)
+    dobra ^= palavras
+    dobra ^= dobra >> np.uint64(2)
+    dobra ^= dobra >> np.uint64(1)
+    dobra &= np.uint64(0x0101010101010101)
+    dobra *= np.uint64(0x8040201008040201)
+    dobra >>= np.uint64(56)
+    if inteiros * 8 == dados.size:
+        return dobra.astype(np.uint8)
+    return np.concatenate((dobra.astype(np.uint8), np.packbits(PARIDADE_BYTE[dados[inteiros * 8:]])))
+
+
+def tamanho_payload_2d(tamanho_quadro):
+    """
+    Tamanho do payload de um quadro de paridade 2D com tamanho_quadro bytes
+    (-1 se nenhum payload produz esse tamanho). Aceita um inteiro ou um array.
+    """
+    # L + ceil(L / 8) = tamanho - 1 tem solução exceto quando (tamanho - 1) % 9 == 1
+    resto = np.asarray(tamanho_quadro, dtype=np.int64) - 1
+    payload = np.where((resto >= 0) & (resto % 9 != 1), resto - (resto + 8) // 9, -1)
+    return int(payload) if payload.ndim == 0 else payload
+
+
+def aplicar_paridade_2d(dados) -> bytes:
+    """Anexa a paridade de cada byte (linhas) e o XOR dos bytes (colunas) ao quadro."""
+    dados = como_array(dados)
+    return dados.tobytes() + paridade_linhas(dados).tobytes() + bytes([xor_bytes(dados)])
+
+
+def verificar_paridade_2d(quadro) -> tuple:
+    """
+    Verifica um quadro de paridade 2D e corrige um bit errado.
+
+    Returns:
+        (payload em bytes, já corrigido; True se um bit errado foi corrigido;
+         True se um erro foi detectado e não pôde ser corrigido)
+    """
+    quadro = como_array(quadro)
+    tamanho = tamanho_payload_2d(quadro.size)
+    if tamanho < 0:
+        raise ValueError("Quadro de paridade 2D inválido.")
+    payload = quadro[:tamanho]
+    # Bits das linhas que não conferem (os bits de preenchimento do último byte são ignorados)
+    linhas = paridade_linhas(payload) ^ quadro[tamanho:-1]
+    if tamanho % 8:
+        linhas[-1] &= 0xFF << (8 - tamanho % 8) & 0xFF
+    erradas = int(POPCOUNT[linhas].sum())
+    colunas = xor_bytes(payload) ^ int(quadro[-1])
+
+    if erradas == 0 and colunas == 0:
+        return payload.tobytes(), False, False
+    if erradas == 1 and POPCOUNT[colunas] == 1:
+        byte = int(np.flatnonzero(linhas)[0])
+        corrigido = payload.copy()
+        corrigido[8 * byte + 8 - int(linhas[byte]).bit_length()] ^= colunas
+        return corrigido.tobytes(), True, False
+    if erradas + POPCOUNT[colunas] == 1:
+        # Só um bit de paridade errado
+        return payload.tobytes(), True, False
+    return payload.tobytes(), False, True
+
+
+def verificar_paridade_2d_faixas(dados, inicios: np.ndarray, tamanhos: np.ndarray) -> tuple:
+    """
+    verificar_paridade_2d para muitos quadros de uma vez (quadro i =
+    dados[inicios[i]:inicios[i] + tamanhos[i]]).
+
+    Returns:
+        (payloads corrigidos e concatenados, início e tamanho de cada payload nele,
+         máscaras dos quadros corrigidos, com erro detectado e com tamanho inválido)
+    """
+    dados = como_array(dados)
+    inicios = np.asarray(inicios, dtype=np.int64)
+    tamanhos_payload = tamanho_payload_2d(np.asarray(tamanhos, dtype=np.int64))
+    invalidos = tamanhos_payload < 0
+    tamanhos_payload = np.maximum(tamanhos_payload, 0)
+    bytes_linhas = (tamanhos_payload + 7) // 8
+    inicios_payload = np.cumsum(tamanhos_payload) - tamanhos_payload
+
+    payloads = dados[indices_faixas(inicios, tamanhos_payload)]
+    bits_linhas = np.unpackbits(dados[indices_faixas(inicios + tamanhos_payload, bytes_linhas)])
+    bits_linhas = bits_linhas[indices_faixas((np.cumsum(bytes_linhas) - bytes_linhas) * 8, tamanhos_payload)]
+
+    # Linhas erradas de cada quadro (quantas e a posição da primeira)
+    diferentes = np.concatenate(([0], np.cumsum(PARIDADE_BYTE[payloads] != bits_linhas)))
+    linhas = diferentes[inicios_payload + tamanhos_payload] - diferentes[inicios_payload]
+    primeira = np.searchsorted(diferentes, diferentes[inicios_payload] + 1) - 1
+
+    colunas = xor_faixas(payloads, inicios_payload, tamanhos_payload)
+    indices_coluna = np.where(invalidos, 0, inicios + tamanhos_payload + bytes_linhas)
+    if dados.size:
+        colunas ^= np.where(invalidos, 0, dados[indices_coluna]).astype(np.uint8)
+    bits_colunas = POPCOUNT[colunas]
+
+    validos = ~invalidos
+    inverter = validos & (linhas == 1) & (bits_colunas == 1)
+    payloads[primeira[inverter]] ^= colunas[inverter]
+    corrigidos = validos & (linhas + bits_colunas == 1) | inverter
+    erros = validos & ~corrigidos & ((linhas > 0) | (colunas != 0))
+    return payloads, inicios_payload, tamanhos_payload, corrigidos, erros, invalidos
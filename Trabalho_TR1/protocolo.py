@@ -0,0 +1,172 @@
+# protocolo.py
+import json
+import socket
+import struct
+from collections import deque
+from typing import NamedTuple
+
+# === PROTOCOLO ENTRE TRANSMISSOR E RECEPTOR ===
+#
+# Cada mensagem enviada ao receptor é:
+#   [4 bytes: tamanho dos metadados][metadados JSON][4 bytes: tamanho do quadro][quadro]
+# e cada resposta é:
+#   [4 bytes: tamanho do texto][texto UTF-8]
+# Os tamanhos são inteiros big-endian. Uma mesma conexão pode levar vários quadros,
+# inclusive enviados antes de as respostas anteriores chegarem (pipelining); as
+# respostas voltam na ordem dos quadros.
+
+TAMANHO_PREFIXO = 4
+
+
+def prefixar(dados: bytes) -> bytes:
+    """Prefixa os dados com o tamanho em 4 bytes big-endian."""
+    return len(dados).to_bytes(TAMANHO_PREFIXO, 'big') + dados
+
+
+def receber_exato(sock, n: int) -> bytes:
+    """
+    Lê exatamente n bytes do socket, juntando quantas leituras forem necessárias.
+    """
+    buffer = bytearray(n)
+    visao = memoryview(buffer)
+    recebidos = 0
+    while recebidos < n:
+        lidos = sock.recv_into(visao[recebidos:])
+        if lidos == 0:
+            raise ConnectionError("Conexão encerrada antes do fim da mensagem.")
+        recebidos += lidos
+    return bytes(buffer)
+
+
+def receber_prefixado(sock) -> bytes:
+    """Lê uma mensagem prefixada pelo tamanho."""
+    tamanho = int.from_bytes(receber_exato(sock, TAMANHO_PREFIXO), 'big')
+    return receber_exato(sock, tamanho)
+
+
+def enviar_quadro(sock, metadata: dict, quadro: bytes):
+    """Envia os metadados e o quadro, cada um prefixado pelo tamanho."""
+    metadata_bytes = json.dumps(metadata).encode('utf-8')
+    sock.sendall(prefixar(metadata_bytes) + prefixar(bytes(quadro)))
+
+
+def receber_resposta(sock) -> str:
+    """Lê a resposta do receptor para um quadro."""
+    return receber_prefixado(sock).decode('utf-8')
+
+
+# === CABEÇALHO BINÁRIO ===
+#
+# Em vez dos metadados JSON, cada quadro pode ser precedido por um cabeçalho fixo de 16 bytes:
+#   [magia 'TR'][versão][flags][enquadramento][EDC][m do Hamming][reservado]
+#   [número de sequência (4 bytes)][tamanho do quadro (4 bytes)]
+# A resposta usa o mesmo cabeçalho (com FLAG_RESPOSTA e o número de sequência do quadro),
+# seguido do texto. A magia nunca é confundida com o prefixo de uma mensagem JSON (seria
+# um JSON de mais de 1 GB), então o receptor aceita os dois formatos na mesma conexão.
+# O JSON fica como alternativa para configurações sem id no cabeçalho.
+
+MAGIA = b'TR'
+VERSAO = 1
+CABECALHO = struct.Struct('!2sBBBBBxII')
+
+FLAG_RESPOSTA = 0x01
+
+ENQUADRAMENTO_IDS = {"Contagem": 1, "Byte Stuffing": 2, "Bit Stuffing": 3}
+EDC_IDS = {"Paridade": 1, "CRC": 2, "Hamming": 3, "Paridade 2D": 4}
+NOMES_ENQUADRAMENTO = {i: nome for nome, i in ENQUADRAMENTO_IDS.items()}
+NOMES_EDC = {i: nome for nome, i in EDC_IDS.items()}
+
+
+class Cabecalho(NamedTuple):
+    versao: int
+    flags: int
+    enquadramento: int
+    edc: int
+    m_bits: int
+    seq: int
+    tamanho: int
+
+
+def empacotar_cabecalho(enquadramento: int, edc: int, m_bits: int, seq: int, tamanho: int,
+                        flags: int = 0) -> bytes:
+    return CABECALHO.pack(MAGIA, VERSAO, flags, enquadramento, edc, m_bits, seq, tamanho)
+
+
+def desempacotar_cabecalho(dados: bytes) -> Cabecalho:
+    """Lê um cabeçalho binário; ValueError se a magia ou a versão não forem reconhecidas."""
+    magia, *campos = CABECALHO.unpack(dados)
+    if magia != MAGIA:
+        raise ValueError("Cabeçalho binário inválido.")
+    cabecalho = Cabecalho(*campos)
+    if cabecalho.versao != VERSAO:
+        raise ValueError(f"Versão de cabeçalho não suportada: {cabecalho.versao}.")
+    return cabecalho
+
+
+def ids_configuracao(enq_tipo: str, err_tipo: str, m_bits: int):
+    """(id do enquadramento, id do EDC) ou None se a configuração não cabe no cabeçalho."""
+    enq_id = ENQUADRAMENTO_IDS.get(enq_tipo)
+    edc_id = EDC_IDS.get(err_tipo)
+    if enq_id is None or edc_id is None or not 0 <= m_bits <= 0xFF:
+        return None
+    return enq_id, edc_id
+
+
+class ConexaoReceptor:
+    """
+    Conexão persistente com o receptor. Os quadros usam o cabeçalho binário sempre que
+    a configuração tem id, e os metadados JSON caso contrário.
+    Vários quadros podem ser enviados antes de ler as respostas, que chegam na mesma ordem.
+    """
+
+    def __init__(self, host: str = '127.0.0.1', port: int = 12345, timeout: float = None):
+        self.sock = socket.create_connection((host, port), timeout)
+        self.seq = 0
+        # Formato de cada resposta ainda não lida (True = binário)
+        self._pendentes = deque()
+
+    def enviar(self, quadro: bytes, enq_tipo: str, err_tipo: str, m_bits: int = 0) -> int:
+        """Envia um quadro e retorna o seu número de sequência."""
+        quadro = bytes(quadro)
+        seq = self.seq
+        self.seq = (seq + 1) & 0xFFFFFFFF
+        ids = ids_configuracao(enq_tipo, err_tipo, m_bits)
+        if ids:
+            self.sock.sendall(empacotar_cabecalho(*ids, m_bits, seq, len(quadro)) + quadro)
+        else:
+            metadata = {"enq_tipo": enq_tipo, "err_tipo": err_tipo, "m_bits": m_bits, "seq": seq}
+            enviar_quadro(self.sock, metadata, quadro)
+        self._pendentes.append(ids is not None)
+        return seq
+
+    def receber(self) -> tuple:
+        """Lê a próxima resposta: (número de sequência ou None no formato JSON, texto)."""
+        if not self._pendentes.popleft():
+            return None, receber_resposta(self.sock)
+        cabecalho = desempacotar_cabecalho(receber_exato(self.sock, CABECALHO.size))
+        return cabecalho.seq, receber_exato(self.sock, cabecalho.tamanho).decode('utf-8')
+
+    def transmitir(self, quadro: bytes, enq_tipo: str, err_tipo: str, m_bits: int = 0) -> str:
+        """Envia um quadro e espera a resposta."""
+        self.enviar(quadro, enq_tipo, err_tipo, m_bits)
+        return self.receber()[1]
+
+    def close(self):
+        self.sock.close()
+
+    def interromper(self):
+        """
+        Encerra a conexão a partir de outra thread. O shutdown acorda um recv ou sendall
+        bloqueado nela (só o close não acorda), que termina com erro.
+        """
+        try:
+            self.sock.shutdown(socket.SHUT_RDWR)
+        except OSError:
+            pass
+        self.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
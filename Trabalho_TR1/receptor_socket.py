@@ -1,120 +1,782 @@
 # receptor_socket.py
-import socket
+import argparse
+import asyncio
 import json
+import os
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from functools import lru_cache
+import numpy as np
 from Camada_enlace import (
-    desenquadramento_contagem,
-    desenquadramento_byte_stuffing,
-    desenquadramento_bit_stuffing,
-    decodificar_hamming,
-    calcular_crc32_manual
+    DESENQUADRAMENTOS,
+    DESENQUADRAMENTOS_INTO,
+    obter_codec_hamming,
+    calcular_crc32,
+    paridade_par,
+    verificar_crc32,
+    verificar_paridade_2d,
+    verificar_paridade_par
+)
+from crc32 import calcular_crc32_linhas
+from paridade import indices_faixas, paridades_faixas, verificar_paridade_2d_faixas
+from arq import ReceptorARQ
+from transmissao_fluxo import RemontadorFluxo
+import metricas
+from protocolo import (
+    TAMANHO_PREFIXO,
+    prefixar,
+    MAGIA,
+    CABECALHO,
+    FLAG_RESPOSTA,
+    NOMES_ENQUADRAMENTO,
+    NOMES_EDC,
+    Cabecalho,
+    empacotar_cabecalho,
+    desempacotar_cabecalho
 )
 
 HOST = '127.0.0.1'
 PORT = 12345
 
-def processar_recepcao(quadro_tx: bytes, metadata: dict) -> str:
+# Quadros de uma mesma conexão que podem estar em decodificação ao mesmo tempo
+QUADROS_EM_PROCESSAMENTO = 32
+
+# Tamanho das leituras do fluxo ARQ
+TAMANHO_LEITURA_ARQ = 64 * 1024
+
+# Buffer de recepção de cada conexão no modo sem cópia (cresce para quadros maiores)
+CAPACIDADE_ANEL = 256 * 1024
+TAMANHO_LEITURA = 64 * 1024
+
+# No modo sem cópia, quadros até este tamanho verificados no lugar (CRC ou paridade, com
+# contagem ou byte stuffing) são decodificados no laço de eventos; os demais, no executor
+LIMITE_NO_LACO = 64 * 1024
+
+# Texto do status de cada verificação: (detecção, erro detectado) -> status
+STATUS_VERIFICACAO = {
+    ("CRC", False): "OK: Verificação de CRC bem-sucedida.",
+    ("CRC", True): "ALERTA: Erro detectado pelo CRC!",
+    ("Paridade", False): "OK: Verificação de paridade bem-sucedida.",
+    ("Paridade", True): "ALERTA: Erro detectado pela Paridade!",
+    ("Paridade 2D", False): "OK: Verificação de paridade 2D bem-sucedida.",
+    ("Paridade 2D", True): "ALERTA: Erro detectado pela Paridade 2D!",
+}
+
+# Verificações que o modo sem cópia faz no próprio buffer de recepção
+VERIFICACOES_INTO = {"CRC": verificar_crc32, "Paridade": verificar_paridade_par}
+
+class QuadroInvalido(ValueError):
+    """Quadro que não pode nem ser verificado (configuração desconhecida ou tamanho inválido)."""
+
+
+def _etapa_verificacao(err_tipo: str, m_bits: int):
     """
-    Aplica a lógica de recepção com base nos metadados recebidos.
-    Retorna a mensagem decodificada ou uma mensagem de erro.
+    Monta a etapa de verificação/correção: quadro -> (payload, status, erro detectado).
     """
-    print("\n--- PROCESSANDO DADOS NO RECEPTOR ---")
-    try:
-        err_tipo = metadata.get('err_tipo')
-        enq_tipo = metadata.get('enq_tipo')
-
-        # Seleciona a função de desenquadramento correta
-        desenq_func = {
-            "Contagem": desenquadramento_contagem,
-            "Byte Stuffing": desenquadramento_byte_stuffing,
-            "Bit Stuffing": desenquadramento_bit_stuffing
-        }.get(enq_tipo)
-
-        if not desenq_func:
-            return "Erro: Tipo de enquadramento desconhecido."
-
-        quadro_processado = b''
-        status = "OK"
-
-        # Usa a informação de erro dos metadados para decodificar
-        if err_tipo == "Hamming":
-            m_bits = metadata.get('m_bits', 4)
-            quadro_processado = decodificar_hamming(quadro_tx, m=m_bits)
-            status = "Dados recebidos e corrigidos por Hamming."
-        
-        elif err_tipo == "CRC":
+    if err_tipo == "Hamming":
+        codec = obter_codec_hamming(m_bits)
+
+        def verificar(quadro_tx):
+            payload, corrigidos = codec.decodificar(quadro_tx, retornar_corrigidos=True)
+            metricas.contar("tr1_blocos_corrigidos_total", corrigidos, lado="rx")
+            return payload, "Dados recebidos e corrigidos por Hamming.", False
+
+    elif err_tipo == "CRC":
+        def verificar(quadro_tx):
             if len(quadro_tx) < 4:
-                return "Erro: Quadro de CRC inválido."
+                raise QuadroInvalido("Quadro de CRC inválido.")
             payload = quadro_tx[:-4]
             crc_recebido = int.from_bytes(quadro_tx[-4:], 'big')
-            if crc_recebido != calcular_crc32_manual(payload):
-                status = "ALERTA: Erro detectado pelo CRC!"
-            else:
-                status = "OK: Verificação de CRC bem-sucedida."
-            quadro_processado = payload
+            erro_detectado = crc_recebido != calcular_crc32(payload)
+            return payload, STATUS_VERIFICACAO["CRC", erro_detectado], erro_detectado
 
-        elif err_tipo == "Paridade":
+    elif err_tipo == "Paridade":
+        def verificar(quadro_tx):
             if len(quadro_tx) < 1:
-                return "Erro: Quadro de paridade inválido."
+                raise QuadroInvalido("Quadro de paridade inválido.")
             payload = quadro_tx[:-1]
-            paridade = quadro_tx[-1]
-            bits = ''.join(f'{b:08b}' for b in payload)
-            if (bits.count('1') % 2 == 0 and paridade != 0) or \
-               (bits.count('1') % 2 == 1 and paridade != 1):
-                status = "ALERTA: Erro detectado pela Paridade!"
-            else:
-                status = "OK: Verificação de paridade bem-sucedida."
-            quadro_processado = payload
-        
-        print(f"Status da verificação: {status}")
+            erro_detectado = quadro_tx[-1] != paridade_par(payload)
+            return payload, STATUS_VERIFICACAO["Paridade", erro_detectado], erro_detectado
+
+    elif err_tipo == "Paridade 2D":
+        def verificar(quadro_tx):
+            try:
+                payload, corrigido, erro_detectado = verificar_paridade_2d(quadro_tx)
+            except ValueError as e:
+                raise QuadroInvalido(str(e))
+            if corrigido:
+                metricas.contar("tr1_blocos_corrigidos_total", lado="rx")
+                return payload, "Dados recebidos e corrigidos pela Paridade 2D.", False
+            return payload, STATUS_VERIFICACAO["Paridade 2D", erro_detectado], erro_detectado
+
+    else:
+        raise QuadroInvalido("Tipo de detecção/correção desconhecido.")
+    return verificar
+
 
+@lru_cache(maxsize=256)
+def compilar_pipeline(enq_tipo: str, err_tipo: str, m_bits: int = 4):
+    """
+    Monta (uma única vez por configuração) a função que verifica/corrige o quadro e
+    remove o enquadramento: quadro -> (mensagem, status, erro detectado).
+    """
+    # Seleciona a função de desenquadramento correta
+    desenq_func = DESENQUADRAMENTOS.get(enq_tipo)
+    if not desenq_func:
+        raise QuadroInvalido("Tipo de enquadramento desconhecido.")
+    verificar = _etapa_verificacao(err_tipo, m_bits)
+
+    def pipeline(quadro_tx):
+        with metricas.etapa("verificacao", "rx"):
+            quadro_processado, status, erro_detectado = verificar(quadro_tx)
         # Aplica o desenquadramento no quadro já processado
-        mensagem_final = desenq_func(quadro_processado).decode("utf-8", errors="replace")
-        return mensagem_final
+        with metricas.etapa("desenquadramento", "rx"):
+            return desenq_func(quadro_processado), status, erro_detectado
+    return pipeline
+
+
+@lru_cache(maxsize=256)
+def pipeline_binario(enq_id: int, edc_id: int, m_bits: int):
+    """Pipeline para os ids de um cabeçalho binário."""
+    return compilar_pipeline(NOMES_ENQUADRAMENTO.get(enq_id), NOMES_EDC.get(edc_id), m_bits)
+
+
+def obter_pipeline(metadata):
+    """Pipeline para metadados JSON (dict) ou para um Cabecalho binário."""
+    if isinstance(metadata, Cabecalho):
+        return pipeline_binario(metadata.enquadramento, metadata.edc, metadata.m_bits)
+    return compilar_pipeline(*_configuracao(metadata))
+
+
+def _configuracao(metadata) -> tuple:
+    """(enquadramento, detecção/correção, m do Hamming) por nome."""
+    if isinstance(metadata, Cabecalho):
+        return (NOMES_ENQUADRAMENTO.get(metadata.enquadramento), NOMES_EDC.get(metadata.edc),
+                metadata.m_bits)
+    return metadata.get('enq_tipo'), metadata.get('err_tipo'), metadata.get('m_bits', 4)
+
+
+def receber_quadro(quadro_tx: bytes, metadata) -> tuple:
+    """
+    Verifica/corrige o quadro conforme os metadados e remove o enquadramento.
+    Não imprime nada, para ser usada também em simulações com muitos quadros.
+    metadata pode ser o dict JSON ou um Cabecalho binário.
+
+    Returns:
+        (mensagem em bytes, status da verificação, True se um erro foi detectado)
+    """
+    return obter_pipeline(metadata)(quadro_tx)
+
+
+def receber_quadro_into(quadro_tx, metadata, saida) -> tuple:
+    """
+    receber_quadro sem cópias intermediárias: o quadro (em geral uma memoryview do buffer
+    de recepção) é verificado no lugar e só a mensagem é escrita em `saida`.
+    Hamming, paridade 2D e bit stuffing produzem novos arrays de qualquer forma; nesses casos a
+    mensagem de receber_quadro é copiada para a saída.
+
+    Returns:
+        (tamanho da mensagem em saida, status da verificação, True se um erro foi detectado)
+    """
+    enq_tipo, err_tipo, _ = _configuracao(metadata)
+    desenquadrar = DESENQUADRAMENTOS_INTO.get(enq_tipo)
+    verificar = VERIFICACOES_INTO.get(err_tipo)
+    if desenquadrar is None or verificar is None:
+        mensagem, status, erro_detectado = receber_quadro(quadro_tx, metadata)
+        saida[:len(mensagem)] = mensagem
+        return len(mensagem), status, erro_detectado
 
+    tamanho, erro_detectado = verificar(quadro_tx)
+    n = desenquadrar(quadro_tx[:tamanho], saida)
+    return n, STATUS_VERIFICACAO[err_tipo, erro_detectado], erro_detectado
+
+
+def processar_recepcao(quadro_tx: bytes, metadata) -> str:
+    """
+    Aplica a lógica de recepção com base nos metadados recebidos.
+    Retorna a mensagem decodificada ou uma mensagem de erro.
+    """
+    print("\n--- PROCESSANDO DADOS NO RECEPTOR ---")
+    metricas.contar("tr1_quadros_total", lado="rx")
+    metricas.contar("tr1_bytes_total", len(quadro_tx), etapa="recepcao", lado="rx")
+    try:
+        with metricas.etapa("recepcao", "rx"):
+            mensagem, status, erro_detectado = receber_quadro(quadro_tx, metadata)
+    except QuadroInvalido as e:
+        return f"Erro: {e}"
     except Exception as e:
         print(f"ERRO CRÍTICO DURANTE A RECEPÇÃO: {e}")
         return f"Falha na decodificação no receptor: {e}"
 
+    if erro_detectado:
+        metricas.contar("tr1_erros_detectados_total", lado="rx")
+    print(f"Status da verificação: {status}")
+    return mensagem.decode("utf-8", errors="replace")
+
+
+def decodificar_segmento(quadro_tx: bytes, metadata) -> tuple:
+    """
+    Versão silenciosa de processar_recepcao para as sessões de fluxo.
+    Retorna (mensagem ou None se o quadro for inválido, True se um erro foi detectado).
+    """
+    try:
+        mensagem, _, erro_detectado = receber_quadro(quadro_tx, metadata)
+    except Exception:
+        return None, True
+    return mensagem, erro_detectado
+
+
+# === RECEPÇÃO EM LOTE ===
+#
+# Muitos quadros com a mesma configuração são verificados juntos: paridade, paridade 2D
+# e CRC de todos os quadros em operações vetorizadas e o Hamming como uma única
+# multiplicação de matrizes sobre as palavras-código concatenadas. Só o desenquadramento
+# é por quadro.
+
+STATUS_OK = 0
+STATUS_CORRIGIDO = 1
+STATUS_ERRO_DETECTADO = 2
+STATUS_QUADRO_INVALIDO = 3
+
+DESCRICAO_STATUS = {
+    STATUS_OK: "OK",
+    STATUS_CORRIGIDO: "Corrigido",
+    STATUS_ERRO_DETECTADO: "Erro detectado",
+    STATUS_QUADRO_INVALIDO: "Quadro inválido",
+}
+
+# Mensagem i do lote = mensagens[inicio:fim]
+RESULTADO_LOTE = np.dtype([('status', np.uint8), ('inicio', np.int64), ('fim', np.int64)])
+
+# Com menos quadros de um mesmo tamanho, o CRC é calculado quadro a quadro
+_MINIMO_LINHAS_CRC = 16
+
+
+def _verificar_lote_paridade(dados, inicios, tamanhos, status):
+    validos = tamanhos >= 1
+    tamanhos_payload = np.maximum(tamanhos - 1, 0)
+    fins = inicios + tamanhos_payload
+    # Paridade de cada payload pelo XOR dos seus bytes
+    calculadas = paridades_faixas(dados, inicios, tamanhos_payload)
+    recebidas = np.zeros(tamanhos.size, dtype=np.uint8)
+    recebidas[validos] = dados[fins[validos]]
+
+    status[~validos] = STATUS_QUADRO_INVALIDO
+    status[validos & (recebidas != calculadas)] = STATUS_ERRO_DETECTADO
+    return inicios, tamanhos_payload
+
+
+def _verificar_lote_crc(dados, inicios, tamanhos, status):
+    validos = tamanhos >= 4
+    tamanhos_payload = np.maximum(tamanhos - 4, 0)
+    fins = inicios + tamanhos_payload
+    crcs_recebidos = np.zeros(tamanhos.size, dtype=np.uint32)
+    if validos.any():
+        # CRC recebido: 4 bytes big-endian no fim de cada quadro
+        bytes_crc = dados[fins[validos, None] + np.arange(4)].astype(np.uint32)
+        crcs_recebidos[validos] = (bytes_crc << np.array([24, 16, 8, 0], dtype=np.uint32)).sum(axis=1)
+
+    crcs = np.zeros(tamanhos.size, dtype=np.uint32)
+    for tamanho in np.unique(tamanhos_payload[validos]):
+        linhas = np.flatnonzero(validos & (tamanhos_payload == tamanho))
+        if linhas.size >= _MINIMO_LINHAS_CRC:
+            matriz = dados[inicios[linhas, None] + np.arange(tamanho)]
+            crcs[linhas] = calcular_crc32_linhas(matriz)
+        else:
+            for i in linhas:
+                crcs[i] = calcular_crc32(dados[inicios[i]:fins[i]])
+
+    status[~validos] = STATUS_QUADRO_INVALIDO
+    status[validos & (crcs != crcs_recebidos)] = STATUS_ERRO_DETECTADO
+    return inicios, tamanhos_payload
+
+
+def _verificar_lote_hamming(dados, inicios, tamanhos, status, m_bits):
+    codec = obter_codec_hamming(m_bits)
+    # Blocos completos de cada quadro; o padding no fim de cada quadro é ignorado
+    blocos = tamanhos * 8 // codec.n
+    bits = np.unpackbits(dados)[indices_faixas(inicios * 8, blocos * codec.n)]
+    bits_dados, corrigidos = codec.decodificar_blocos(bits.reshape(-1, codec.n))
+
+    acumulado = np.concatenate(([0], np.cumsum(corrigidos)))
+    fim_blocos = np.cumsum(blocos)
+    status[acumulado[fim_blocos] > acumulado[fim_blocos - blocos]] = STATUS_CORRIGIDO
+
+    # Bits que não completam um byte são descartados em cada quadro
+    tamanhos_payload = blocos * m_bits // 8
+    inicios_bits = (fim_blocos - blocos) * m_bits
+    payloads = np.packbits(bits_dados.reshape(-1)[indices_faixas(inicios_bits, tamanhos_payload * 8)])
+    return payloads, np.cumsum(tamanhos_payload) - tamanhos_payload, tamanhos_payload
+
+
+def _verificar_lote_paridade_2d(dados, inicios, tamanhos, status):
+    payloads, inicios_payload, tamanhos_payload, corrigidos, erros, invalidos = \
+        verificar_paridade_2d_faixas(dados, inicios, tamanhos)
+    status[corrigidos] = STATUS_CORRIGIDO
+    status[erros] = STATUS_ERRO_DETECTADO
+    status[invalidos] = STATUS_QUADRO_INVALIDO
+    return payloads, inicios_payload, tamanhos_payload
+
+
+def processar_recepcao_lote(quadros, metadata, log=None) -> tuple:
+    """
+    Recebe muitos quadros com a mesma configuração de uma só vez.
+    metadata pode ser o dict JSON ou um Cabecalho binário. Se log for dado (ex.: print),
+    é chamado com um resumo por quadro depois do processamento.
+
+    Returns:
+        (array estruturado RESULTADO_LOTE com status e posição de cada mensagem,
+         bytes com as mensagens concatenadas)
+    """
+    enq_tipo, err_tipo, m_bits = _configuracao(metadata)
+    desenq_func = DESENQUADRAMENTOS.get(enq_tipo)
+    if not desenq_func:
+        raise QuadroInvalido("Tipo de enquadramento desconhecido.")
+
+    tamanhos = np.fromiter((len(q) for q in quadros), dtype=np.int64, count=len(quadros))
+    inicios = np.cumsum(tamanhos) - tamanhos
+    dados = np.frombuffer(b"".join(quadros), dtype=np.uint8)
+    status = np.full(tamanhos.size, STATUS_OK, dtype=np.uint8)
+
+    if err_tipo == "Paridade":
+        payloads = dados
+        inicios_payload, tamanhos_payload = _verificar_lote_paridade(dados, inicios, tamanhos, status)
+    elif err_tipo == "CRC":
+        payloads = dados
+        inicios_payload, tamanhos_payload = _verificar_lote_crc(dados, inicios, tamanhos, status)
+    elif err_tipo == "Paridade 2D":
+        payloads, inicios_payload, tamanhos_payload = _verificar_lote_paridade_2d(
+            dados, inicios, tamanhos, status)
+    elif err_tipo == "Hamming":
+        payloads, inicios_payload, tamanhos_payload = _verificar_lote_hamming(
+            dados, inicios, tamanhos, status, m_bits)
+    else:
+        raise QuadroInvalido("Tipo de detecção/correção desconhecido.")
+
+    # Desenquadramento de cada payload; quadros inválidos ficam com mensagem vazia
+    mensagens = []
+    payloads = payloads.tobytes()
+    invalidos = (status == STATUS_QUADRO_INVALIDO).tolist()
+    for i, (inicio, tamanho) in enumerate(zip(inicios_payload.tolist(), tamanhos_payload.tolist())):
+        if invalidos[i]:
+            mensagens.append(b"")
+            continue
+        try:
+            mensagens.append(desenq_func(payloads[inicio:inicio + tamanho]))
+        except ValueError:
+            status[i] = STATUS_QUADRO_INVALIDO
+            mensagens.append(b"")
+
+    resultados = np.zeros(tamanhos.size, dtype=RESULTADO_LOTE)
+    resultados['status'] = status
+    resultados['fim'] = np.cumsum([len(mensagem) for mensagem in mensagens])
+    resultados['inicio'][1:] = resultados['fim'][:-1]
+    mensagens = b"".join(mensagens)
+
+    if log is not None:
+        for i, (codigo, inicio, fim) in enumerate(resultados.tolist()):
+            log(f"[{i}] {DESCRICAO_STATUS[codigo]}: "
+                f"{mensagens[inicio:fim].decode('utf-8', errors='replace')!r}")
+    return resultados, mensagens
+
+
+async def ler_mensagem(reader: asyncio.StreamReader):
+    """
+    Lê uma mensagem completa (cabeçalho ou metadados + quadro) da conexão.
+    Retorna (Cabecalho ou dict de metadados, quadro) ou None se a conexão terminou
+    entre duas mensagens.
+    """
+    try:
+        prefixo = await reader.readexactly(TAMANHO_PREFIXO)
+    except asyncio.IncompleteReadError as e:
+        if not e.partial:
+            return None
+        raise
+
+    if prefixo[:len(MAGIA)] == MAGIA:
+        # Cabeçalho binário: o restante dos 16 bytes e depois o quadro
+        cabecalho = desempacotar_cabecalho(
+            prefixo + await reader.readexactly(CABECALHO.size - TAMANHO_PREFIXO))
+        return cabecalho, await reader.readexactly(cabecalho.tamanho)
+
+    # 1. Metadados: tamanho (4 bytes) seguido do JSON
+    metadata_length = int.from_bytes(prefixo, 'big')
+    metadata = json.loads(await reader.readexactly(metadata_length))
+
+    # 2. Quadro de dados: tamanho (4 bytes) seguido do quadro
+    quadro_length = int.from_bytes(await reader.readexactly(TAMANHO_PREFIXO), 'big')
+    quadro_tx = await reader.readexactly(quadro_length)
+    return metadata, quadro_tx
+
+
+async def enviar_respostas(fila: asyncio.Queue, writer: asyncio.StreamWriter):
+    """
+    Envia as respostas na ordem em que os quadros chegaram, à medida que ficam prontas.
+    """
+    while (item := await fila.get()) is not None:
+        futuro, metadata = item
+        resposta = await futuro
+        print(f"Mensagem decodificada: '{resposta}'")
+        resposta = resposta.encode('utf-8')
+        if isinstance(metadata, Cabecalho):
+            # Responde no mesmo formato, com o número de sequência do quadro
+            writer.write(empacotar_cabecalho(metadata.enquadramento, metadata.edc, metadata.m_bits,
+                                             metadata.seq, len(resposta), FLAG_RESPOSTA) + resposta)
+        else:
+            writer.write(prefixar(resposta))
+        await writer.drain()
+
+
+async def atender_conexao(reader, writer, executor=None, diretorio=None):
+    """
+    Atende um transmissor: lê quadros enquanto a conexão estiver aberta e decodifica cada
+    um no executor, sem bloquear o laço de eventos. Novos quadros são lidos enquanto os
+    anteriores ainda estão sendo processados (pipelining).
+    """
+    addr = writer.get_extra_info('peername')
+    print(f"\nConectado por {addr}")
+    loop = asyncio.get_running_loop()
+    fila = asyncio.Queue(maxsize=QUADROS_EM_PROCESSAMENTO)
+    tarefa_respostas = asyncio.create_task(enviar_respostas(fila, writer))
+    sessao = None
+    try:
+        while (mensagem := await ler_mensagem(reader)) is not None:
+            metadata, quadro_tx = mensagem
+            if isinstance(metadata, dict) and ('arq' in metadata or 'fluxo' in metadata):
+                # O restante da conexão é uma sessão ARQ ou de fluxo
+                sessao = metadata
+                break
+            print(f"\n[RX] {addr}: metadados {metadata}, quadro de {len(quadro_tx)} bytes.")
+            futuro = loop.run_in_executor(executor, processar_recepcao, quadro_tx, metadata)
+            await fila.put((futuro, metadata))
+    except (asyncio.IncompleteReadError, ValueError, ConnectionError) as e:
+        print(f"Conexão com {addr} interrompida: {e}")
+    finally:
+        await fila.put(None)
+        try:
+            await tarefa_respostas
+        except ConnectionError:
+            pass
+
+    try:
+        if sessao is not None and 'arq' in sessao:
+            await sessao_arq(reader, writer, sessao)
+        elif sessao is not None:
+            await sessao_fluxo(reader, writer, sessao, executor, diretorio)
+    except (asyncio.IncompleteReadError, ValueError, ConnectionError) as e:
+        print(f"Conexão com {addr} interrompida: {e}")
+    finally:
+        writer.close()
+        print(f"Conexão com {addr} encerrada.")
+
+
+async def sessao_arq(reader, writer, metadata: dict):
+    """
+    Recebe um fluxo ARQ: confirma a negociação e depois responde a cada quadro com
+    ACK/NAK, entregando as mensagens em ordem.
+    """
+    try:
+        receptor = ReceptorARQ(metadata['arq'], metadata.get('janela', 8),
+                               metadata.get('enq_tipo', "Byte Stuffing"))
+    except ValueError as e:
+        writer.write(prefixar(f"Erro: {e}".encode('utf-8')))
+        return
+    writer.write(prefixar(f"ARQ {receptor.modo}, janela {receptor.janela}".encode('utf-8')))
+    await writer.drain()
+
+    print(f"\n--- SESSÃO ARQ ({receptor.modo}, janela {receptor.janela}) ---")
+    entregues = 0
+    while dados := await reader.read(TAMANHO_LEITURA_ARQ):
+        mensagens, respostas = receptor.alimentar(dados)
+        for mensagem in mensagens:
+            print(f"Mensagem decodificada: '{mensagem.decode('utf-8', errors='replace')}'")
+        entregues += len(mensagens)
+        if respostas:
+            writer.write(b"".join(respostas))
+            await writer.drain()
+    print(f"ARQ: {entregues} mensagens entregues, {receptor.corrompidos} quadros corrompidos, "
+          f"{receptor.duplicados} duplicados.")
+
+
+async def sessao_fluxo(reader, writer, metadata: dict, executor=None, diretorio=None):
+    """
+    Recebe um arquivo em quadros. Cada quadro é decodificado no executor e o seu conteúdo
+    é gravado em ordem (em `diretorio`, se informado) assim que fica pronto, sem guardar
+    o arquivo em memória. Um quadro vazio encerra o fluxo; a resposta é o resumo em JSON.
+    """
+    try:
+        compilar_pipeline(*_configuracao(metadata))
+    except QuadroInvalido as e:
+        writer.write(prefixar(f"Erro: {e}".encode('utf-8')))
+        return
+    nome = metadata.get('fluxo')
+    destino = None
+    if diretorio and nome:
+        # Só o nome do arquivo é usado, para não gravar fora do diretório
+        try:
+            destino = open(os.path.join(diretorio, os.path.basename(nome)), 'wb')
+        except OSError as e:
+            writer.write(prefixar(f"Erro: não foi possível gravar o fluxo: {e}".encode('utf-8')))
+            await writer.drain()
+            return
+    remontador = RemontadorFluxo(destino)
+    writer.write(prefixar(b"Fluxo aceito"))
+    await writer.drain()
+
+    print(f"\n--- SESSÃO DE FLUXO ({nome or 'sem nome'}) ---")
+    loop = asyncio.get_running_loop()
+    fila = asyncio.Queue(maxsize=QUADROS_EM_PROCESSAMENTO)
+
+    async def remontar():
+        while (futuro := await fila.get()) is not None:
+            remontador.adicionar(*await futuro)
+
+    tarefa = asyncio.create_task(remontar())
+    try:
+        while (mensagem := await ler_mensagem(reader)) is not None:
+            cabecalho, quadro_tx = mensagem
+            if not quadro_tx:
+                break
+            await fila.put(loop.run_in_executor(executor, decodificar_segmento, quadro_tx, cabecalho))
+    finally:
+        await fila.put(None)
+        await tarefa
+        if destino is not None:
+            destino.close()
+
+    resumo = remontador.resumo()
+    print(f"Fluxo: {resumo['quadros']} quadros, {resumo['bytes']} bytes, "
+          f"{resumo['erros_detectados']} com erro detectado, {resumo['invalidos']} inválidos.")
+    writer.write(prefixar(json.dumps(resumo).encode('utf-8')))
+    await writer.drain()
+
+
+# === RECEPÇÃO SEM CÓPIA ===
+#
+# Com --zero-copia, cada conexão lê o socket direto para um buffer próprio (recv_into,
+# pelo asyncio.BufferedProtocol). O cabeçalho e o quadro são lidos desse buffer por
+# memoryviews, verificados no lugar e desenquadrados para um segundo buffer reaproveitado;
+# o único objeto novo por quadro é o texto da resposta. Só o cabeçalho binário é aceito
+# (nada de JSON, ARQ ou fluxo).
+#
+# Quadros pequenos com verificação no lugar são decodificados na própria thread do laço
+# de eventos, onde custam menos que o envio a outra thread. Os demais (Hamming, paridade
+# 2D, bit stuffing ou maiores que LIMITE_NO_LACO) vão para o executor, como em
+# atender_conexao, para não travar as outras conexões. Enquanto um quadro está no
+# executor a leitura da conexão fica pausada: o trecho do buffer só pode ser reaproveitado
+# depois de processado, e as respostas seguem a ordem dos quadros.
+
+def decodifica_no_laco(quadro, cabecalho) -> bool:
+    """True se o quadro é decodificado no laço de eventos no modo sem cópia."""
+    enq_tipo, err_tipo, _ = _configuracao(cabecalho)
+    return (len(quadro) <= LIMITE_NO_LACO and enq_tipo in DESENQUADRAMENTOS_INTO
+            and err_tipo in VERIFICACOES_INTO)
+
+
+def responder_quadro(quadro, cabecalho, saida=None) -> str:
+    """
+    Decodifica um quadro do modo sem cópia e retorna o texto da resposta. Com `saida`, a
+    mensagem é desenquadrada nela (receber_quadro_into); sem, como em receber_quadro.
+    """
+    metricas.contar("tr1_quadros_total", lado="rx")
+    metricas.contar("tr1_bytes_total", len(quadro), etapa="recepcao", lado="rx")
+    try:
+        with metricas.etapa("recepcao", "rx"):
+            if saida is None:
+                mensagem, status, erro_detectado = receber_quadro(quadro, cabecalho)
+            else:
+                n, status, erro_detectado = receber_quadro_into(quadro, cabecalho, saida)
+                mensagem = memoryview(saida)[:n]
+    except QuadroInvalido as e:
+        return f"Erro: {e}"
+    except Exception as e:
+        return f"Falha na decodificação no receptor: {e}"
+    if erro_detectado:
+        metricas.contar("tr1_erros_detectados_total", lado="rx")
+    resposta = str(mensagem, 'utf-8', errors='replace')
+    print(f"Mensagem decodificada: '{resposta}' ({status})")
+    return resposta
+
+
+class AnelRecepcao:
+    """
+    Buffer de recepção reaproveitado entre leituras. Os bytes ficam onde foram recebidos
+    até serem consumidos; quando falta espaço no fim, só os bytes ainda não consumidos
+    (no máximo um quadro incompleto) são movidos para o início, em vez de dar a volta.
+    """
+
+    def __init__(self, capacidade: int = CAPACIDADE_ANEL):
+        self.buffer = bytearray(capacidade)
+        self.visao = memoryview(self.buffer)
+        self.inicio = 0   # primeiro byte não consumido
+        self.fim = 0      # fim dos bytes recebidos
+
+    def __len__(self) -> int:
+        return self.fim - self.inicio
+
+    def reservar(self, tamanho: int):
+        """Garante espaço para `tamanho` bytes a partir do primeiro byte não consumido."""
+        if len(self.buffer) - self.inicio >= tamanho:
+            return
+        pendentes = len(self)
+        if tamanho > len(self.buffer):
+            # Um novo buffer, pois um bytearray com memoryviews abertas não pode crescer
+            buffer = bytearray(max(tamanho, 2 * len(self.buffer)))
+            buffer[:pendentes] = self.visao[self.inicio:self.fim]
+            self.buffer, self.visao = buffer, memoryview(buffer)
+        else:
+            self.visao[:pendentes] = self.visao[self.inicio:self.fim]
+        self.inicio, self.fim = 0, pendentes
+
+    def espaco(self, minimo: int) -> memoryview:
+        """Área livre para a próxima leitura, com pelo menos `minimo` bytes."""
+        if len(self.buffer) - self.fim < minimo:
+            self.reservar(len(self) + minimo)
+        return self.visao[self.fim:]
+
+    def confirmar(self, n: int):
+        self.fim += n
+
+    def ler(self, n: int) -> memoryview:
+        """Os próximos n bytes não consumidos, sem cópia."""
+        return self.visao[self.inicio:self.inicio + n]
+
+    def consumir(self, n: int):
+        self.inicio += n
+        if self.inicio == self.fim:
+            self.inicio = self.fim = 0
+
+
+class ProtocoloZeroCopia(asyncio.BufferedProtocol):
+    def __init__(self, executor=None):
+        self.executor = executor
+        # Um executor de processos recebe uma cópia do quadro (memoryviews não são serializáveis)
+        self.copiar = isinstance(executor, ProcessPoolExecutor)
+        self.no_executor = False
+
+    def connection_made(self, transport):
+        self.transport = transport
+        self.addr = transport.get_extra_info('peername')
+        self.anel = AnelRecepcao()
+        self.saida = bytearray(CAPACIDADE_ANEL)
+        print(f"\nConectado por {self.addr} (sem cópia)")
+
+    def get_buffer(self, sizehint):
+        return self.anel.espaco(TAMANHO_LEITURA)
+
+    def buffer_updated(self, nbytes):
+        self.anel.confirmar(nbytes)
+        if not self.no_executor:
+            self._continuar()
+
+    def _continuar(self):
+        try:
+            self._processar()
+        except ValueError as e:
+            print(f"Conexão com {self.addr} interrompida: {e}")
+            self.transport.close()
+
+    def _processar(self):
+        anel = self.anel
+        while len(anel) >= CABECALHO.size:
+            cabecalho = desempacotar_cabecalho(anel.ler(CABECALHO.size))
+            total = CABECALHO.size + cabecalho.tamanho
+            if len(anel) < total:
+                anel.reservar(total)
+                return
+            quadro = anel.ler(total)[CABECALHO.size:]
+            if not decodifica_no_laco(quadro, cabecalho):
+                self._enviar_ao_executor(quadro, cabecalho, total)
+                return
+            if len(self.saida) < len(quadro):
+                self.saida = bytearray(len(quadro))
+            self._responder(cabecalho, responder_quadro(quadro, cabecalho, self.saida), total)
+
+    def _enviar_ao_executor(self, quadro, cabecalho, total):
+        # Nada é lido (nem movido no buffer) até o quadro ser decodificado
+        self.no_executor = True
+        self.transport.pause_reading()
+        if self.copiar:
+            quadro = bytes(quadro)
+        futuro = asyncio.get_running_loop().run_in_executor(
+            self.executor, responder_quadro, quadro, cabecalho)
+        futuro.add_done_callback(lambda f: self._decodificado(f, cabecalho, total))
+
+    def _decodificado(self, futuro, cabecalho, total):
+        self.no_executor = False
+        if self.transport.is_closing():
+            return
+        try:
+            resposta = futuro.result()
+        except Exception as e:
+            resposta = f"Falha na decodificação no receptor: {e}"
+        self._responder(cabecalho, resposta, total)
+        self.transport.resume_reading()
+        self._continuar()
+
+    def _responder(self, cabecalho, resposta: str, total: int):
+        self.anel.consumir(total)
+        resposta = resposta.encode('utf-8')
+        self.transport.write(empacotar_cabecalho(cabecalho.enquadramento, cabecalho.edc,
+                                                 cabecalho.m_bits, cabecalho.seq, len(resposta),
+                                                 FLAG_RESPOSTA) + resposta)
+
+    def connection_lost(self, exc):
+        print(f"Conexão com {self.addr} encerrada.")
+
+
+async def servir(host: str = HOST, port: int = PORT, executor=None, diretorio=None,
+                 zero_copia: bool = False):
+    if zero_copia:
+        server = await asyncio.get_running_loop().create_server(
+            lambda: ProtocoloZeroCopia(executor), host, port, reuse_address=True)
+    else:
+        server = await asyncio.start_server(
+            lambda r, w: atender_conexao(r, w, executor, diretorio), host, port, reuse_address=True)
+    print(f"Receptor aguardando conexões em {host}:{port}...")
+    async with server:
+        await server.serve_forever()
+
 
 def main():
-    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as s:
-        s.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
-        s.bind((HOST, PORT))
-        s.listen()
-        print(f"Receptor aguardando conexão em {HOST}:{PORT}...")
-
-        while True: # Loop para aceitar múltiplas conexões
-            conn, addr = s.accept()
-            with conn:
-                print(f"\nConectado por {addr}")
-                
-                # 1. Receber Metadados
-                # Primeiro, recebe 4 bytes que informam o tamanho dos metadados
-                metadata_length_bytes = conn.recv(4)
-                if not metadata_length_bytes:
-                    continue
-                metadata_length = int.from_bytes(metadata_length_bytes, 'big')
-                
-                # Agora, recebe a quantidade exata de bytes dos metadados
-                metadata_json = conn.recv(metadata_length).decode('utf-8')
-                metadata = json.loads(metadata_json)
-                print(f"Metadados recebidos: {metadata}")
-
-                # 2. Receber o Quadro de Dados
-                quadro_tx = conn.recv(4096) # Recebe o quadro principal
-                print(f"Quadro de dados recebido ({len(quadro_tx)} bytes)")
-
-                print(f"\n[RX] Recebido {len(quadro_tx)} bytes do transmissor.")
-                print(f" -> DADOS (hex): {quadro_tx.hex(' ')}")
-                resposta = processar_recepcao(quadro_tx, metadata)
-                
-                # 3. Processar e obter a resposta
-                resposta = processar_recepcao(quadro_tx, metadata)
-                print(f"Mensagem decodificada: '{resposta}'")
-
-                # 4. Enviar a resposta de volta ao transmissor
-                conn.sendall(resposta.encode('utf-8'))
-                print("Resposta enviada ao transmissor.")
+    parser = argparse.ArgumentParser(description="Receptor do simulador.")
+    parser.add_argument("--host", default=HOST)
+    parser.add_argument("--port", type=int, default=PORT)
+    parser.add_argument("--processos", type=int, default=0,
+                        help="decodifica em N processos (0 = threads)")
+    parser.add_argument("--diretorio-fluxos",
+                        help="grava aqui os arquivos recebidos em sessões de fluxo")
+    parser.add_argument("--zero-copia", action="store_true",
+                        help="lê o socket direto para um buffer reaproveitado (só cabeçalho "
+                             "binário); quadros com Hamming, paridade 2D ou bit stuffing e os "
+                             f"maiores que {LIMITE_NO_LACO // 1024} KiB são decodificados no executor")
+    parser.add_argument("--metricas-porta", type=int,
+                        help="publica as métricas das etapas em http://127.0.0.1:PORTA/metrics")
+    parser.add_argument("--metricas-intervalo", type=float,
+                        help="escreve o resumo das métricas a cada N segundos")
+    args = parser.parse_args()
+    if args.diretorio_fluxos:
+        try:
+            os.makedirs(args.diretorio_fluxos, exist_ok=True)
+        except OSError as e:
+            parser.error(f"--diretorio-fluxos: {e}")
+        if not os.access(args.diretorio_fluxos, os.W_OK | os.X_OK):
+            parser.error(f"--diretorio-fluxos: sem permissão de escrita em {args.diretorio_fluxos}")
+
+    if args.metricas_porta:
+        metricas.servir_http(args.metricas_porta)
+    if args.metricas_intervalo:
+        metricas.despejo_periodico(args.metricas_intervalo)
+
+    if args.processos > 0:
+        executor = ProcessPoolExecutor(max_workers=args.processos)
+    else:
+        executor = ThreadPoolExecutor()
+    try:
+        asyncio.run(servir(args.host, args.port, executor, args.diretorio_fluxos, args.zero_copia))
+    except KeyboardInterrupt:
+        pass
+    finally:
+        executor.shutdown(cancel_futures=True)
 
 if __name__ == '__main__':
-    main()
\ No newline at end of file
+    main()
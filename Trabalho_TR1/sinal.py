@@ -0,0 +1,143 @@
+# sinal.py
+import ast
+import struct
+import numpy as np
+
+# === SINAL COM EIXO DE TEMPO IMPLÍCITO ===
+
+class Signal:
+    """
+    Amostras de um sinal igualmente espaçadas no tempo. O eixo de tempo não é guardado:
+    a amostra k ocorre em inicio + k * periodo_amostra e t é calculado só quando pedido.
+
+    As amostras podem ter qualquer dtype (float32, ou int8 para os níveis das
+    codificações de banda base) e podem ser um np.memmap de um arquivo .npy, para
+    sinais que não cabem na memória.
+    """
+
+    __slots__ = ("amostras", "periodo_amostra", "inicio")
+
+    def __init__(self, amostras, periodo_amostra: float = 1.0, inicio: float = 0.0):
+        self.amostras = amostras if isinstance(amostras, np.ndarray) else np.asarray(amostras)
+        self.periodo_amostra = periodo_amostra
+        self.inicio = inicio
+
+    @property
+    def taxa_amostragem(self) -> float:
+        """Amostras por unidade de tempo."""
+        return 1 / self.periodo_amostra
+
+    @property
+    def t(self) -> np.ndarray:
+        """Eixo de tempo completo (calculado a cada acesso)."""
+        return self.tempo(np.arange(self.amostras.size))
+
+    def tempo(self, indices):
+        """Instante das amostras de índice `indices` (inteiro ou array)."""
+        return self.inicio + indices * self.periodo_amostra
+
+    @property
+    def duracao(self) -> float:
+        return self.amostras.size * self.periodo_amostra
+
+    @property
+    def dtype(self) -> np.dtype:
+        return self.amostras.dtype
+
+    @property
+    def nbytes(self) -> int:
+        return self.amostras.nbytes
+
+    def trecho(self, inicio: int, fim: int) -> "Signal":
+        """Amostras [inicio, fim) como um novo Signal, sem cópia."""
+        inicio, fim, _ = slice(inicio, fim).indices(self.amostras.size)
+        return Signal(self.amostras[inicio:fim], self.periodo_amostra, self.tempo(inicio))
+
+    def astype(self, dtype) -> "Signal":
+        return Signal(self.amostras.astype(dtype), self.periodo_amostra, self.inicio)
+
+    def salvar(self, caminho: str):
+        """Grava as amostras em um arquivo .npy (o eixo de tempo não é gravado)."""
+        np.save(caminho, self.amostras)
+
+    @classmethod
+    def carregar(cls, caminho: str, periodo_amostra: float = 1.0, inicio: float = 0.0,
+                 mmap: bool = True) -> "Signal":
+        """Abre um .npy; com mmap=True as amostras são lidas do disco sob demanda."""
+        return cls(np.load(caminho, mmap_mode='r' if mmap else None), periodo_amostra, inicio)
+
+    def __len__(self) -> int:
+        return self.amostras.size
+
+    def __array__(self, dtype=None, copy=None):
+        if dtype is None or np.dtype(dtype) == self.amostras.dtype:
+            return self.amostras.copy() if copy else self.amostras
+        return self.amostras.astype(dtype)
+
+    def __repr__(self) -> str:
+        return (f"Signal({self.amostras.size} amostras {self.amostras.dtype}, "
+                f"período {self.periodo_amostra:g}, início {self.inicio:g})")
+
+
+# === GRAVAÇÃO INCREMENTAL EM .npy ===
+#
+# O formato .npy guarda o número de amostras no cabeçalho, que só é conhecido no fim de
+# uma transmissão em fluxo. O cabeçalho é reservado com tamanho fixo e reescrito ao
+# fechar; entre as duas coisas os blocos são acrescentados ao arquivo.
+
+_PREFIXO_NPY = b'\x93NUMPY\x01\x00'
+TAMANHO_CABECALHO_NPY = 128
+
+
+def _cabecalho_npy(dtype, total: int) -> bytes:
+    descricao = {'descr': np.lib.format.dtype_to_descr(np.dtype(dtype)),
+                 'fortran_order': False, 'shape': (total,)}
+    texto = repr(descricao).encode('latin1')
+    espaco = TAMANHO_CABECALHO_NPY - len(_PREFIXO_NPY) - 2
+    # Completa com espaços e termina com '\n', como o próprio NumPy
+    texto = texto.ljust(espaco - 1) + b'\n'
+    assert len(texto) == espaco and ast.literal_eval(texto.decode('latin1')) == descricao
+    return _PREFIXO_NPY + struct.pack('<H', espaco) + texto
+
+
+class GravadorSinal:
+    """
+    Grava um sinal em um arquivo .npy bloco a bloco, sem o sinal inteiro na memória:
+        with GravadorSinal("sinal.npy", np.float32, periodo) as gravador:
+            for bloco in blocos:
+                gravador.escrever(bloco)
+        sinal = gravador.sinal   # Signal sobre um np.memmap do arquivo
+    """
+
+    def __init__(self, caminho: str, dtype=np.float32, periodo_amostra: float = 1.0,
+                 inicio: float = 0.0):
+        self.caminho = caminho
+        self.dtype = np.dtype(dtype)
+        self.periodo_amostra = periodo_amostra
+        self.inicio = inicio
+        self.total = 0
+        self.sinal = None
+        self._arquivo = open(caminho, 'wb')
+        self._arquivo.write(_cabecalho_npy(self.dtype, 0))
+
+    def escrever(self, bloco):
+        bloco = np.asarray(bloco)
+        if bloco.dtype != self.dtype:
+            bloco = bloco.astype(self.dtype)
+        self._arquivo.write(np.ascontiguousarray(bloco).data)
+        self.total += bloco.size
+
+    def fechar(self) -> Signal:
+        if self._arquivo is not None:
+            self._arquivo.seek(0)
+            self._arquivo.write(_cabecalho_npy(self.dtype, self.total))
+            self._arquivo.close()
+            self._arquivo = None
+            self.sinal = Signal.carregar(self.caminho, self.periodo_amostra, self.inicio)
+        return self.sinal
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.fechar()
@@ -0,0 +1,7 @@
+# conftest.py
+import os
+import sys
+
+# Os módulos do simulador se importam pelo nome simples (from Camada_fisica import ...),
+# então o diretório do projeto precisa estar no caminho de importação
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
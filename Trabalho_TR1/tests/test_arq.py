@@ -0,0 +1,149 @@
+# test_arq.py
+import heapq
+import itertools
+import numpy as np
+import pytest
+from Camada_enlace import introduzir_erro_por_taxa
+from arq import (
+    ACK,
+    DADOS,
+    DESENQUADRADORES,
+    GO_BACK_N,
+    MODOS,
+    NAK,
+    RTO_INICIAL,
+    SELECTIVE_REPEAT,
+    ReceptorARQ,
+    TransmissorARQ,
+    codificar_quadro_arq,
+    decodificar_quadro_arq
+)
+
+# === CANAL SIMULADO ===
+#
+# Enlace com banda e latência fixas nos dois sentidos, em tempo virtual: o goodput
+# depende só das sementes, não da carga da máquina. Os quadros de dados passam por
+# introduzir_erro_por_taxa, como em transmitir_arq; os ACK/NAK voltam sem erros.
+
+BANDA = 1e6      # bytes/s
+LATENCIA = 2e-3  # segundos
+
+
+def simular(mensagens, modo, janela, taxa_erro, semente, enq_tipo="Byte Stuffing"):
+    """Transmite as mensagens pelo canal simulado; retorna (goodput, transmissor)."""
+    rng = np.random.default_rng(semente)
+    transmissor = TransmissorARQ(modo, janela, None, enq_tipo)
+    receptor = ReceptorARQ(modo, janela, enq_tipo)
+    desenquadrador = DESENQUADRADORES[enq_tipo]()
+    eventos = []              # (instante de chegada, ordem, destino, dados)
+    ordem = itertools.count()
+    livre = {"receptor": 0.0, "transmissor": 0.0}
+    agora = 0.0
+
+    def canal(destino, dados):
+        livre[destino] = max(livre[destino], agora) + len(dados) / BANDA
+        heapq.heappush(eventos, (livre[destino] + LATENCIA, next(ordem), destino, dados))
+
+    def enviar(saida):
+        for _, quadro in saida:
+            canal("receptor", introduzir_erro_por_taxa(quadro, taxa_erro, rng))
+
+    entregues = []
+    proxima = 0
+    while proxima < len(mensagens) or transmissor.em_aberto():
+        saida = transmissor.verificar_timeouts(agora)
+        while proxima < len(mensagens) and transmissor.pode_enviar():
+            saida += transmissor.enviar(mensagens[proxima], agora)
+            proxima += 1
+        enviar(saida)
+
+        prazo = transmissor.proximo_prazo()
+        if prazo is not None and (not eventos or prazo < eventos[0][0]):
+            agora = prazo
+            continue
+        agora, _, destino, dados = heapq.heappop(eventos)
+        if destino == "receptor":
+            payloads, respostas = receptor.alimentar(dados)
+            entregues += payloads
+            for resposta in respostas:
+                canal("transmissor", resposta)
+        else:
+            for conteudo in desenquadrador.alimentar(dados):
+                tipo, seq, eco, _ = decodificar_quadro_arq(conteudo)
+                enviar(transmissor.receber_controle(tipo, seq, eco, agora))
+
+    assert entregues == list(mensagens)
+    return sum(map(len, mensagens)) / agora, transmissor
+
+
+_MENSAGENS = [np.random.default_rng(0).bytes(64) for _ in range(300)]
+
+
+# === GOODPUT ===
+
+@pytest.mark.parametrize("modo", MODOS)
+def test_janela_maior_nao_reduz_goodput_com_erros(modo):
+    goodput_1, _ = simular(_MENSAGENS, modo, 1, 1e-3, semente=1)
+    goodput_8, _ = simular(_MENSAGENS, modo, 8, 1e-3, semente=1)
+    assert goodput_8 >= goodput_1
+
+
+@pytest.mark.parametrize("modo", MODOS)
+@pytest.mark.parametrize("taxa_erro", [0.0, 1e-4, 1e-3])
+def test_timeout_adaptativo_acompanha_o_canal(modo, taxa_erro):
+    _, transmissor = simular(_MENSAGENS, modo, 8, taxa_erro, semente=2)
+    assert transmissor.srtt is not None
+    assert transmissor.srtt >= 2 * LATENCIA
+    assert transmissor.timeout < RTO_INICIAL
+
+
+@pytest.mark.parametrize("enq_tipo", list(DESENQUADRADORES))
+def test_entrega_com_bit_stuffing_e_byte_stuffing(enq_tipo):
+    simular(_MENSAGENS[:50], SELECTIVE_REPEAT, 4, 1e-3, semente=3, enq_tipo=enq_tipo)
+
+
+# === RETRANSMISSÃO RÁPIDA ===
+
+def _seqs(saida):
+    return [seq for seq, _ in saida]
+
+
+def test_quadro_leva_o_id_da_transmissao():
+    quadro = codificar_quadro_arq(DADOS, 7, b"abc", ident=42)
+    desenquadrado = DESENQUADRADORES["Byte Stuffing"]().alimentar(quadro)
+    assert decodificar_quadro_arq(desenquadrado[0]) == (DADOS, 7, 42, b"abc")
+
+
+def test_go_back_n_atende_o_primeiro_nak_depois_de_cada_volta():
+    transmissor = TransmissorARQ(GO_BACK_N, 4)
+    for i in range(4):
+        transmissor.enviar(bytes([i]), 0.0)                      # ids 1 a 4
+    assert _seqs(transmissor.receber_controle(NAK, 0, 1, 0.1)) == [0, 1, 2, 3]   # ids 5 a 8
+    # ACK/NAK provocados pelas cópias anteriores à volta
+    assert transmissor.receber_controle(ACK, 0, 2, 0.1) == []
+    assert transmissor.receber_controle(NAK, 0, 3, 0.1) == []
+    assert transmissor.receber_controle(ACK, 0, 4, 0.1) == []
+    # A nova cópia da base também se corrompeu
+    assert _seqs(transmissor.receber_controle(NAK, 0, 5, 0.1)) == [0, 1, 2, 3]   # ids 9 a 12
+    assert transmissor.retransmissoes == 8
+
+
+def test_go_back_n_ack_repetido_depois_da_copia_da_base_reenvia_a_janela():
+    transmissor = TransmissorARQ(GO_BACK_N, 4)
+    for i in range(4):
+        transmissor.enviar(bytes([i]), 0.0)
+    assert transmissor.receber_controle(ACK, 1, 1, 0.1) == []
+    # O quadro 1 (id 2) se perdeu sem NAK; o ACK repetido do id 3 mostra a lacuna
+    assert _seqs(transmissor.receber_controle(ACK, 1, 3, 0.1)) == [1, 2, 3]
+    assert transmissor.receber_controle(ACK, 1, 4, 0.1) == []
+
+
+def test_selective_repeat_reenvia_so_as_lacunas():
+    transmissor = TransmissorARQ(SELECTIVE_REPEAT, 4)
+    for i in range(4):
+        transmissor.enviar(bytes([i]), 0.0)
+    assert _seqs(transmissor.receber_controle(ACK, 1, 2, 0.1)) == [0]        # id 5
+    assert transmissor.receber_controle(ACK, 2, 3, 0.1) == []
+    assert _seqs(transmissor.receber_controle(NAK, 0, 4, 0.1)) == [3]        # id 6
+    assert transmissor.receber_controle(ACK, 0, 5, 0.1) == []
+    assert transmissor.base == 3
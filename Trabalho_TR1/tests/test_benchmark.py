@@ -0,0 +1,56 @@
+# test_benchmark.py
+import json
+import pytest
+import benchmark
+from benchmark import main_suite
+
+RAPIDO = ["--filtro", "aplicar_crc32", "--tamanhos", "16", "256", "--tempo-minimo", "0.001"]
+
+
+def test_sem_base_falha_antes_de_medir(tmp_path, monkeypatch, capsys):
+    def nao_medir(*args):
+        raise AssertionError("a suíte não deveria rodar sem base")
+
+    monkeypatch.setattr(benchmark, "executar_suite", nao_medir)
+    with pytest.raises(SystemExit) as saida:
+        main_suite(RAPIDO + ["--base", str(tmp_path / "nao_existe.json")])
+    assert saida.value.code != 0
+    erro = capsys.readouterr().err
+    assert "nao_existe.json" in erro and "--atualizar-base" in erro and "--sem-comparacao" in erro
+
+
+def test_sem_comparacao_nao_precisa_de_base(tmp_path):
+    saida = tmp_path / "resultados.json"
+    assert main_suite(RAPIDO + ["--base", str(tmp_path / "nao_existe.json"), "--sem-comparacao",
+                                "--saida", str(saida)]) == 0
+    assert len(json.loads(saida.read_text())["resultados"]) == 2
+
+
+def test_regressao_em_relacao_a_base(tmp_path, capsys):
+    base = tmp_path / "base.json"
+    assert main_suite(RAPIDO + ["--base", str(base), "--atualizar-base"]) == 0
+    documento = json.loads(base.read_text())
+
+    # A mesma medida com uma base dez vezes mais rápida é uma regressão
+    for r in documento["resultados"]:
+        r["segundos"] /= 10
+    base.write_text(json.dumps(documento))
+    assert main_suite(RAPIDO + ["--base", str(base)]) == 1
+    assert "regressões acima de 25%" in capsys.readouterr().out
+
+    # Uma base sem nenhum dos casos medidos não conta como "nenhuma regressão"
+    for r in documento["resultados"]:
+        r["caso"] = "outro"
+    base.write_text(json.dumps(documento))
+    assert main_suite(RAPIDO + ["--base", str(base)]) == 1
+    assert "nada foi comparado" in capsys.readouterr().out
+
+
+def test_comparar():
+    base = {"resultados": [{"caso": "a", "tamanho": 16, "segundos": 1.0, "pico_bytes": 100},
+                           {"caso": "b", "tamanho": 16, "segundos": 1.0, "pico_bytes": 100}]}
+    atual = {"resultados": [{"caso": "a", "tamanho": 16, "segundos": 1.2, "pico_bytes": 200},
+                            {"caso": "b", "tamanho": 16, "segundos": 1.3, "pico_bytes": 100},
+                            {"caso": "c", "tamanho": 16, "segundos": 9.0, "pico_bytes": 900}]}
+    regressoes = benchmark.comparar(atual, base, 0.25)
+    assert [(r["caso"], r["medida"]) for r in regressoes] == [("a", "pico_bytes"), ("b", "segundos")]
@@ -0,0 +1,203 @@
+# test_camada_fisica.py
+import numpy as np
+import pytest
+from Camada_fisica import (
+    QAM8_CONSTELACAO,
+    ask_modulation,
+    bipolar,
+    fsk_modulation,
+    manchester,
+    nrz_polar,
+    qam8_modulation
+)
+
+# === IMPLEMENTAÇÕES DE REFERÊNCIA ===
+#
+# Os codificadores de linha originais, bit a bit, mantidos aqui para conferir que as
+# versões vetorizadas geram exatamente as mesmas amostras.
+
+def nrz_polar_referencia(bits, bit_duration=1, samples_per_bit=100):
+    t, signal = [], []
+    for bit in bits:
+        value = 1 if bit == 1 else -1
+        for _ in range(samples_per_bit):
+            t.append(len(signal) * bit_duration / samples_per_bit)
+            signal.append(value)
+    return np.array(t), np.array(signal)
+
+
+def manchester_referencia(bits, bit_duration=1, samples_per_bit=100):
+    t, signal = [], []
+    for bit in bits:
+        first = 1 if bit == 0 else -1
+        second = -first
+        for _ in range(samples_per_bit // 2):
+            t.append(len(signal) * bit_duration / samples_per_bit)
+            signal.append(first)
+        for _ in range(samples_per_bit // 2):
+            t.append(len(signal) * bit_duration / samples_per_bit)
+            signal.append(second)
+    return np.array(t), np.array(signal)
+
+
+def bipolar_referencia(bits, bit_duration=1, samples_per_bit=100):
+    t, signal = [], []
+    last = -1
+    for bit in bits:
+        if bit == 0:
+            value = 0
+        else:
+            last *= -1
+            value = last
+        for _ in range(samples_per_bit):
+            t.append(len(signal) * bit_duration / samples_per_bit)
+            signal.append(value)
+    return np.array(t), np.array(signal)
+
+
+CODIFICADORES = [
+    (nrz_polar, nrz_polar_referencia),
+    (manchester, manchester_referencia),
+    (bipolar, bipolar_referencia),
+]
+
+_BITS = np.random.default_rng(0).integers(0, 2, 257, dtype=np.uint8)
+
+ENTRADAS = {
+    "vazia": [],
+    "lista": [1, 0, 1, 1, 0, 0, 1, 0, 1, 1, 1],
+    "so_zeros": [0] * 9,
+    "so_uns": [1] * 9,
+    "uint8": _BITS,
+}
+
+
+@pytest.mark.parametrize("codificador, referencia", CODIFICADORES,
+                         ids=[c.__name__ for c, _ in CODIFICADORES])
+@pytest.mark.parametrize("entrada", list(ENTRADAS), ids=list(ENTRADAS))
+@pytest.mark.parametrize("samples_per_bit", [1, 2, 7, 8, 33, 100])
+def test_igual_a_referencia(codificador, referencia, entrada, samples_per_bit):
+    bits = ENTRADAS[entrada]
+    t, s = codificador(bits, samples_per_bit=samples_per_bit)
+    t_ref, s_ref = referencia(bits, samples_per_bit=samples_per_bit)
+    assert np.array_equal(t, t_ref)
+    assert np.array_equal(s, s_ref)
+
+
+@pytest.mark.parametrize("codificador, referencia", CODIFICADORES,
+                         ids=[c.__name__ for c, _ in CODIFICADORES])
+@pytest.mark.parametrize("bit_duration", [1, 0.5, 3])
+def test_igual_a_referencia_com_bit_duration(codificador, referencia, bit_duration):
+    t, s = codificador(_BITS, bit_duration=bit_duration, samples_per_bit=9)
+    t_ref, s_ref = referencia(_BITS, bit_duration=bit_duration, samples_per_bit=9)
+    assert np.array_equal(t, t_ref)
+    assert np.array_equal(s, s_ref)
+
+
+@pytest.mark.parametrize("codificador, referencia", CODIFICADORES,
+                         ids=[c.__name__ for c, _ in CODIFICADORES])
+def test_lista_e_uint8_iguais(codificador, referencia):
+    t_lista, s_lista = codificador(_BITS.tolist(), samples_per_bit=5)
+    t_array, s_array = codificador(_BITS, samples_per_bit=5)
+    assert np.array_equal(t_lista, t_array)
+    assert np.array_equal(s_lista, s_array)
+
+
+# === MODULAÇÕES POR PORTADORA ===
+#
+# As portadoras usam a mesma grade de tempo dos codificadores de linha, k * bit_duration /
+# samples_per_bit, e cada símbolo é uma cópia do seu template. A versão original usava
+# np.linspace(0, N * bit_duration, N * samples_per_bit), que inclui o ponto final: o
+# passo era um pouco maior que bit_duration / samples_per_bit e a fase escorregava ao
+# longo do quadro. As amostras mudaram de forma visível (até ~0.3 no ASK e ~0.98 no
+# 8-QAM), não só por arredondamento; os testes abaixo fixam a grade nova.
+
+def ask_linspace(bits, bit_duration=1, samples_per_bit=100, freq=5):
+    """ASK original, com a grade do linspace."""
+    t = np.linspace(0, bit_duration * len(bits), len(bits) * samples_per_bit)
+    amplitude = np.repeat(np.where(np.asarray(bits) == 1, 1, 0.3), samples_per_bit)
+    return t, amplitude * np.sin(2 * np.pi * freq * t)
+
+
+def _grade(simbolos, bit_duration, samples_per_bit):
+    return np.arange(simbolos * samples_per_bit) * bit_duration / samples_per_bit
+
+
+def _simbolo(samples_per_bit, bit_duration):
+    """Instantes de um símbolo, a partir de zero."""
+    return _grade(1, bit_duration, samples_per_bit)
+
+
+def _trios(bits):
+    trios = np.zeros(-(-len(bits) // 3) * 3, dtype=int)
+    trios[:len(bits)] = bits
+    return trios.reshape(-1, 3) @ [4, 2, 1]
+
+
+@pytest.mark.parametrize("entrada", list(ENTRADAS), ids=list(ENTRADAS))
+@pytest.mark.parametrize("samples_per_bit", [1, 7, 100])
+@pytest.mark.parametrize("bit_duration", [1, 0.5])
+def test_ask_um_template_por_simbolo(entrada, samples_per_bit, bit_duration):
+    bits = np.asarray(ENTRADAS[entrada], dtype=int)
+    t, s = ask_modulation(bits, bit_duration, samples_per_bit)
+    assert np.array_equal(t, _grade(bits.size, bit_duration, samples_per_bit))
+    seno = np.sin(2 * np.pi * 5 * _simbolo(samples_per_bit, bit_duration))
+    esperado = np.where(bits[:, None] == 1, 1, 0.3) * seno
+    assert np.array_equal(s.reshape(-1, samples_per_bit), esperado.reshape(-1, samples_per_bit))
+
+
+@pytest.mark.parametrize("entrada", list(ENTRADAS), ids=list(ENTRADAS))
+@pytest.mark.parametrize("samples_per_bit", [1, 7, 100])
+def test_fsk_um_template_por_simbolo(entrada, samples_per_bit):
+    bits = np.asarray(ENTRADAS[entrada], dtype=int)
+    t, s = fsk_modulation(bits, samples_per_bit=samples_per_bit)
+    assert np.array_equal(t, _grade(bits.size, 1, samples_per_bit))
+    instantes = _simbolo(samples_per_bit, 1)
+    esperado = np.sin(2 * np.pi * np.where(bits[:, None] == 1, 10, 5) * instantes)
+    assert np.array_equal(s.reshape(-1, samples_per_bit), esperado.reshape(-1, samples_per_bit))
+
+
+@pytest.mark.parametrize("entrada", list(ENTRADAS), ids=list(ENTRADAS))
+@pytest.mark.parametrize("samples_per_bit", [1, 7, 100])
+def test_qam8_um_template_por_simbolo(entrada, samples_per_bit):
+    bits = ENTRADAS[entrada]
+    simbolos = _trios(bits)
+    t, s = qam8_modulation(bits, samples_per_bit=samples_per_bit)
+    # Um símbolo a cada 3 bits, o último completado com zeros
+    assert s.size == simbolos.size * samples_per_bit
+    assert np.array_equal(t, _grade(simbolos.size, 1, samples_per_bit))
+    fase = 2 * np.pi * 5 * _simbolo(samples_per_bit, 1)
+    I, Q = QAM8_CONSTELACAO[simbolos].T
+    esperado = I[:, None] * np.cos(fase) + Q[:, None] * np.sin(fase)
+    assert np.array_equal(s.reshape(-1, samples_per_bit), esperado.reshape(-1, samples_per_bit))
+
+
+@pytest.mark.parametrize("f0, f1", [(5, 10), (2.5, 7.25), (1.3, 3.7)])
+def test_fsk_fase_continua(f0, f1):
+    samples_per_bit = 64
+    t, s = fsk_modulation(_BITS, samples_per_bit=samples_per_bit, f0=f0, f1=f1,
+                          continuous_phase=True)
+    # A fase é a integral da frequência: cada símbolo continua a fase do anterior
+    frequencias = np.repeat(np.where(_BITS == 1, f1, f0), samples_per_bit)
+    fase = 2 * np.pi * np.concatenate(([0], np.cumsum(frequencias[:-1]))) / samples_per_bit
+    assert np.allclose(s, np.sin(fase), atol=1e-9)
+    # Sem saltos na fronteira: a diferença entre amostras vizinhas fica limitada pela
+    # maior variação possível em um passo da frequência mais alta
+    assert np.abs(np.diff(s)).max() <= 2 * np.pi * max(f0, f1) / samples_per_bit
+
+
+def test_fsk_fase_continua_igual_com_ciclos_inteiros():
+    # Com as frequências padrão cada símbolo tem um número inteiro de ciclos
+    _, s = fsk_modulation(_BITS, samples_per_bit=50)
+    _, s_continua = fsk_modulation(_BITS, samples_per_bit=50, continuous_phase=True)
+    assert np.allclose(s, s_continua, atol=1e-9)
+
+
+def test_grade_difere_da_linspace_original():
+    t, s = ask_modulation(_BITS)
+    t_original, s_original = ask_linspace(_BITS)
+    # Mesmo número de amostras, mas o último instante era N * bit_duration
+    assert t.size == t_original.size
+    assert t_original[-1] == _BITS.size
+    assert t[-1] == _BITS.size - 1 / 100
+    assert np.abs(s - s_original).max() > 0.25
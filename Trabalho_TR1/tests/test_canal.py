@@ -0,0 +1,140 @@
+# test_canal.py
+import numpy as np
+import pytest
+from Camada_enlace import introduzir_erro_por_taxa
+from canal import (
+    Canal,
+    ModeloGilbertElliott,
+    ModeloIID,
+    ModeloPadraoFixo,
+    injetar_erros,
+    posicoes_iid
+)
+
+MODELOS = {
+    "iid": ModeloIID(1e-3),
+    "gilbert_elliott": ModeloGilbertElliott(1e-3, 0.1, taxa_bom=1e-4, taxa_ruim=0.5),
+    "padrao_fixo": ModeloPadraoFixo([0, 3, 17], periodo=40),
+}
+
+N_BITS = 2_000_000
+
+
+def _bits_diferentes(a, b) -> np.ndarray:
+    """Posições dos bits diferentes entre dois quadros do mesmo tamanho."""
+    xor = np.frombuffer(bytes(a), np.uint8) ^ np.frombuffer(bytes(b), np.uint8)
+    return np.flatnonzero(np.unpackbits(xor))
+
+
+# === REPRODUTIBILIDADE ===
+
+@pytest.mark.parametrize("nome", list(MODELOS))
+def test_mesma_semente_mesmas_posicoes(nome):
+    modelo = MODELOS[nome]
+    a = modelo.posicoes(100_000, np.random.default_rng(7))
+    b = modelo.posicoes(100_000, np.random.default_rng(7))
+    assert np.array_equal(a, b)
+
+
+@pytest.mark.parametrize("nome", ["iid", "gilbert_elliott"])
+def test_sementes_diferentes_posicoes_diferentes(nome):
+    modelo = MODELOS[nome]
+    a = modelo.posicoes(100_000, np.random.default_rng(7))
+    b = modelo.posicoes(100_000, np.random.default_rng(8))
+    assert not np.array_equal(a, b)
+
+
+@pytest.mark.parametrize("nome", list(MODELOS))
+def test_posicoes_ordenadas_unicas_e_dentro_do_quadro(nome):
+    posicoes = MODELOS[nome].posicoes(10_001, np.random.default_rng(0))
+    assert np.all(np.diff(posicoes) > 0)
+    assert posicoes.size == 0 or (posicoes[0] >= 0 and posicoes[-1] < 10_001)
+
+
+# === TAXA EMPÍRICA ===
+
+@pytest.mark.parametrize("taxa", [1e-4, 1e-3, 0.05, 0.5])
+def test_taxa_iid(taxa):
+    esperado = N_BITS * taxa
+    invertidos = posicoes_iid(N_BITS, taxa, np.random.default_rng(1)).size
+    # Binomial: cinco desvios padrão
+    assert abs(invertidos - esperado) < 5 * np.sqrt(esperado * (1 - taxa))
+
+
+def test_taxa_gilbert_elliott():
+    modelo = MODELOS["gilbert_elliott"]
+    # Taxa média pela distribuição estacionária dos estados
+    ruim = modelo.p_bom_ruim / (modelo.p_bom_ruim + modelo.p_ruim_bom)
+    esperado = N_BITS * (ruim * modelo.taxa_ruim + (1 - ruim) * modelo.taxa_bom)
+    invertidos = np.mean([modelo.posicoes(N_BITS, np.random.default_rng(s)).size for s in range(5)])
+    assert abs(invertidos - esperado) < 0.1 * esperado
+
+
+def test_gilbert_elliott_erros_em_rajada():
+    # A mesma taxa média com erros independentes tem muito menos erros vizinhos
+    modelo = ModeloGilbertElliott(1e-3, 0.1, taxa_bom=0.0, taxa_ruim=0.5)
+    rajada = modelo.posicoes(N_BITS, np.random.default_rng(2))
+    iid = posicoes_iid(N_BITS, rajada.size / N_BITS, np.random.default_rng(2))
+    assert np.mean(np.diff(rajada) <= 4) > 5 * np.mean(np.diff(iid) <= 4)
+
+
+@pytest.mark.parametrize("taxa, esperado", [(0.0, 0), (1.0, 800)])
+def test_taxas_extremas(taxa, esperado):
+    assert posicoes_iid(800, taxa, np.random.default_rng(0)).size == esperado
+
+
+@pytest.mark.parametrize("taxa", [-0.1, 1.5])
+def test_taxa_invalida(taxa):
+    with pytest.raises(ValueError):
+        ModeloIID(taxa)
+    with pytest.raises(ValueError):
+        ModeloGilbertElliott(taxa, 0.1)
+
+
+# === PADRÃO FIXO ===
+
+def test_padrao_fixo_periodico():
+    posicoes = ModeloPadraoFixo([0, 3, 17], periodo=40).posicoes(100)
+    assert posicoes.tolist() == [0, 3, 17, 40, 43, 57, 80, 83, 97]
+    assert ModeloPadraoFixo([5, 200]).posicoes(100).tolist() == [5]
+    with pytest.raises(ValueError):
+        ModeloPadraoFixo([3, 40], periodo=40)
+
+
+# === INJEÇÃO NOS QUADROS ===
+
+@pytest.mark.parametrize("nome", list(MODELOS))
+def test_injetar_erros_inverte_exatamente_as_posicoes(nome):
+    dados = np.random.default_rng(3).bytes(5000)
+    quadro, posicoes = injetar_erros(dados, MODELOS[nome], 4)
+    assert isinstance(quadro, bytearray) and len(quadro) == len(dados)
+    assert np.array_equal(_bits_diferentes(quadro, dados), posicoes)
+    # Mesma semente, mesmo quadro
+    assert injetar_erros(dados, MODELOS[nome], 4)[0] == quadro
+
+
+def test_injetar_erros_bytearray_no_proprio_lugar():
+    dados = bytearray(100)
+    quadro, posicoes = injetar_erros(dados, ModeloPadraoFixo([9]))
+    assert quadro is dados and dados[1] == 0x40
+
+
+@pytest.mark.parametrize("tamanho", [0, 1, 7, 1500])
+@pytest.mark.parametrize("taxa", [0.0, 1e-3, 0.5, 1.0])
+def test_introduzir_erro_por_taxa_mantem_o_tamanho(tamanho, taxa):
+    dados = np.random.default_rng(5).bytes(tamanho)
+    quadro = introduzir_erro_por_taxa(dados, taxa, 6)
+    assert isinstance(quadro, bytes) and len(quadro) == tamanho
+    assert quadro == introduzir_erro_por_taxa(dados, taxa, 6)
+    if taxa == 0.0:
+        assert quadro == dados
+    if taxa == 1.0:
+        assert quadro == bytes(b ^ 0xFF for b in dados)
+
+
+def test_canal_acumula_os_totais():
+    canal = Canal(ModeloPadraoFixo([1, 2], periodo=8), semente=0)
+    for tamanho in (1, 10, 100):
+        canal.transmitir(bytes(tamanho))
+    assert canal.bits_transmitidos == 111 * 8
+    assert canal.bits_invertidos == 111 * 2
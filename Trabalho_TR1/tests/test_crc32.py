@@ -0,0 +1,95 @@
+# test_crc32.py
+import zlib
+import numpy as np
+import pytest
+from crc32 import (
+    LIMIAR_NUMPY,
+    Crc32,
+    calcular_crc32,
+    calcular_crc32_linhas,
+    calcular_crc32_manual,
+    calcular_crc32_numpy,
+    calcular_crc32_slicing8,
+    crc32_combine
+)
+
+# Todas as variantes são conferidas contra o zlib.crc32
+
+_rng = np.random.default_rng(0)
+
+TAMANHOS = [0, 1, 2, 3, 7, 8, 9, 15, 16, 17, 63, 64, 65, 255, 1000, 1031]
+TAMANHOS_NUMPY = TAMANHOS + [LIMIAR_NUMPY - 1, LIMIAR_NUMPY, LIMIAR_NUMPY + 1,
+                             LIMIAR_NUMPY + 7, 3 * LIMIAR_NUMPY + 13, 100_003]
+
+
+def _dados(tamanho):
+    return _rng.bytes(tamanho)
+
+
+@pytest.mark.parametrize("tamanho", TAMANHOS)
+def test_manual(tamanho):
+    dados = _dados(tamanho)
+    assert calcular_crc32_manual(dados) == zlib.crc32(dados)
+
+
+@pytest.mark.parametrize("tamanho", TAMANHOS_NUMPY)
+def test_slicing8(tamanho):
+    dados = _dados(tamanho)
+    assert calcular_crc32_slicing8(dados) == zlib.crc32(dados)
+
+
+@pytest.mark.parametrize("tamanho", TAMANHOS_NUMPY)
+def test_numpy(tamanho):
+    dados = _dados(tamanho)
+    assert calcular_crc32_numpy(dados) == zlib.crc32(dados)
+    assert calcular_crc32(dados) == zlib.crc32(dados)
+
+
+@pytest.mark.parametrize("faixas", [1, 2, 3, 7, 64, 100, 1000])
+def test_numpy_faixas_que_nao_dividem_os_dados(faixas):
+    dados = _dados(LIMIAR_NUMPY + 37)
+    assert calcular_crc32_numpy(dados, faixas=faixas) == zlib.crc32(dados)
+
+
+@pytest.mark.parametrize("variante", [calcular_crc32_slicing8, calcular_crc32_numpy, calcular_crc32])
+def test_continuacao_de_crc_anterior(variante):
+    anterior, dados = _dados(333), _dados(LIMIAR_NUMPY + 5)
+    assert variante(dados, zlib.crc32(anterior)) == zlib.crc32(anterior + dados)
+
+
+def test_linhas():
+    matriz = _rng.integers(0, 256, (13, 101), dtype=np.uint8)
+    esperado = [zlib.crc32(linha.tobytes()) for linha in matriz]
+    assert calcular_crc32_linhas(matriz).tolist() == esperado
+
+
+@pytest.mark.parametrize("tamanho", [0, 1, 17, 1000, LIMIAR_NUMPY + 3])
+def test_combine_em_pontos_aleatorios(tamanho):
+    dados = _dados(tamanho)
+    cortes = {0, tamanho} | set(_rng.integers(0, tamanho + 1, 8).tolist())
+    for corte in sorted(cortes):
+        a, b = dados[:corte], dados[corte:]
+        assert crc32_combine(zlib.crc32(a), zlib.crc32(b), len(b)) == zlib.crc32(dados)
+
+
+def test_incremental_em_pedacos():
+    dados = _dados(3 * LIMIAR_NUMPY + 11)
+    cortes = np.sort(_rng.integers(0, len(dados), 20))
+    crc = Crc32()
+    for pedaco in np.split(np.frombuffer(dados, dtype=np.uint8), cortes):
+        crc.update(pedaco.tobytes())
+    assert crc.valor == zlib.crc32(dados)
+    assert crc.tamanho == len(dados)
+    assert crc.digest() == zlib.crc32(dados).to_bytes(4, 'big')
+    assert crc.hexdigest() == f"{zlib.crc32(dados):08x}"
+
+
+def test_combinar_trechos_calculados_separadamente():
+    trechos = [_dados(n) for n in (0, 5, 1000, LIMIAR_NUMPY + 1, 3)]
+    crc = Crc32()
+    for trecho in trechos:
+        crc.combinar(Crc32(trecho))
+    assert crc.digest() == zlib.crc32(b"".join(trechos)).to_bytes(4, 'big')
+    copia = crc.copy().update(b"mais")
+    assert copia.valor == zlib.crc32(b"".join(trechos) + b"mais")
+    assert crc.valor == zlib.crc32(b"".join(trechos))
@@ -0,0 +1,184 @@
+# test_enquadramento.py
+import numpy as np
+import pytest
+from Camada_enlace import (
+    DesenquadradorBitStuffing,
+    DesenquadradorByteStuffing,
+    desenquadramento_bit_stuffing,
+    desenquadramento_byte_stuffing,
+    enquadramento_bit_stuffing,
+    enquadramento_byte_stuffing
+)
+
+FLAG = b'~'
+ESC = b'\x1B'
+
+# === IMPLEMENTAÇÕES DE REFERÊNCIA ===
+#
+# O stuffing original, byte a byte e bit a bit, para conferir as versões em bloco.
+
+def byte_stuffing_referencia(mensagem: bytes) -> bytes:
+    resultado = bytearray(FLAG)
+    for byte in mensagem:
+        if byte == FLAG[0] or byte == ESC[0]:
+            resultado.extend(ESC)
+        resultado.append(byte)
+    resultado.extend(FLAG)
+    return bytes(resultado)
+
+
+def remover_escapes_referencia(conteudo: bytes) -> bytes:
+    resultado = bytearray()
+    i = 0
+    while i < len(conteudo):
+        if conteudo[i:i + 1] == ESC:
+            i += 1
+        resultado.append(conteudo[i])
+        i += 1
+    return bytes(resultado)
+
+
+def bit_stuffing_referencia(mensagem: bytes) -> str:
+    """Bits do quadro (FLAG + conteúdo + FLAG), sem o preenchimento do último byte."""
+    stuffed = ''
+    cont = 0
+    for b in ''.join(f'{byte:08b}' for byte in mensagem):
+        stuffed += b
+        cont = cont + 1 if b == '1' else 0
+        if cont == 5:
+            stuffed += '0'
+            cont = 0
+    return '01111110' + stuffed + '01111110'
+
+
+def _bits(quadro: bytes) -> str:
+    return ''.join(f'{byte:08b}' for byte in quadro)
+
+
+_rng = np.random.default_rng(0)
+
+MENSAGENS = [
+    b"a",
+    b"~",
+    b"\x1B",
+    b"\x1B~\x1B\x1B~~",
+    b"\xFF" * 9,
+    b"\x7E\x7F\x3F\xFC\x1F\xF8",
+    bytes(range(256)),
+    _rng.choice(np.frombuffer(b"~\x1Bab\xFF", np.uint8), 200).tobytes(),
+    _rng.bytes(300),
+]
+
+
+# === BYTE STUFFING ===
+
+@pytest.mark.parametrize("mensagem", MENSAGENS + [b""])
+def test_byte_stuffing_igual_a_referencia(mensagem):
+    quadro = enquadramento_byte_stuffing(mensagem)
+    assert quadro == byte_stuffing_referencia(mensagem)
+    assert desenquadramento_byte_stuffing(quadro) == mensagem
+    assert remover_escapes_referencia(quadro[1:-1]) == mensagem
+
+
+@pytest.mark.parametrize("conteudo", [b"a\x1B", b"\x1B", b"\x1B\x1B\x1B", b"ab\x1B\x1B\x1B"])
+def test_byte_stuffing_esc_impar_no_fim(conteudo):
+    with pytest.raises(ValueError):
+        desenquadramento_byte_stuffing(FLAG + conteudo + FLAG)
+
+
+def test_byte_stuffing_esc_par_no_fim():
+    assert desenquadramento_byte_stuffing(FLAG + b"a\x1B\x1B" + FLAG) == b"a\x1B"
+
+
+def _fluxo_byte_stuffing():
+    return b"".join(enquadramento_byte_stuffing(m) for m in MENSAGENS)
+
+
+def test_desenquadrador_byte_stuffing_pedaco_unico():
+    lixo = b"antes da primeira flag"
+    assert DesenquadradorByteStuffing().alimentar(lixo + _fluxo_byte_stuffing()) == MENSAGENS
+
+
+def test_desenquadrador_byte_stuffing_dividido_em_cada_byte():
+    fluxo = _fluxo_byte_stuffing()
+    # Inclui divisões entre o ESC e o byte escapado e logo antes/depois de cada FLAG
+    assert fluxo.find(ESC + FLAG) >= 0 and fluxo.find(ESC + ESC) >= 0
+    for corte in range(len(fluxo) + 1):
+        desenquadrador = DesenquadradorByteStuffing()
+        quadros = desenquadrador.alimentar(fluxo[:corte]) + desenquadrador.alimentar(fluxo[corte:])
+        assert quadros == MENSAGENS, corte
+
+
+def test_desenquadrador_byte_stuffing_byte_a_byte():
+    desenquadrador = DesenquadradorByteStuffing()
+    quadros = []
+    for byte in _fluxo_byte_stuffing():
+        quadros += desenquadrador.alimentar(bytes([byte]))
+    assert quadros == MENSAGENS
+
+
+def test_desenquadrador_byte_stuffing_flag_escapada_nao_fecha_o_quadro():
+    # No fluxo, um número ímpar de ESC antes da FLAG a escapa: o quadro continua
+    fluxo = FLAG + b"ab" + ESC + ESC + ESC + FLAG + b"c" + FLAG
+    for corte in range(len(fluxo) + 1):
+        desenquadrador = DesenquadradorByteStuffing()
+        quadros = desenquadrador.alimentar(fluxo[:corte]) + desenquadrador.alimentar(fluxo[corte:])
+        assert quadros == [b"ab\x1B~c"], corte
+
+
+# === BIT STUFFING ===
+
+@pytest.mark.parametrize("mensagem", MENSAGENS + [b""])
+def test_bit_stuffing_igual_a_referencia(mensagem):
+    quadro = enquadramento_bit_stuffing(mensagem)
+    referencia = bit_stuffing_referencia(mensagem)
+    # Os bits do quadro seguidos de zeros até completar o último byte
+    assert len(quadro) == -(-len(referencia) // 8)
+    assert _bits(quadro) == referencia.ljust(len(quadro) * 8, '0')
+    assert desenquadramento_bit_stuffing(quadro) == mensagem
+
+
+def _fluxo_bit_stuffing():
+    return b"".join(enquadramento_bit_stuffing(m) for m in MENSAGENS)
+
+
+def test_desenquadrador_bit_stuffing_pedaco_unico():
+    assert DesenquadradorBitStuffing().alimentar(_fluxo_bit_stuffing()) == MENSAGENS
+
+
+def test_desenquadrador_bit_stuffing_dividido_em_cada_byte():
+    fluxo = _fluxo_bit_stuffing()
+    # As FLAGS não ficam alinhadas aos bytes, então vários cortes caem dentro delas
+    for corte in range(len(fluxo) + 1):
+        desenquadrador = DesenquadradorBitStuffing()
+        quadros = desenquadrador.alimentar(fluxo[:corte]) + desenquadrador.alimentar(fluxo[corte:])
+        assert quadros == MENSAGENS, corte
+
+
+def test_desenquadrador_bit_stuffing_em_tres_pedacos():
+    fluxo = _fluxo_bit_stuffing()
+    for corte in range(0, len(fluxo), 7):
+        desenquadrador = DesenquadradorBitStuffing()
+        quadros = []
+        for pedaco in (fluxo[:corte], fluxo[corte:corte + 1], fluxo[corte + 1:]):
+            quadros += desenquadrador.alimentar(pedaco)
+        assert quadros == MENSAGENS, corte
+
+
+def test_desenquadrador_bit_stuffing_byte_a_byte():
+    desenquadrador = DesenquadradorBitStuffing()
+    quadros = []
+    for byte in _fluxo_bit_stuffing():
+        quadros += desenquadrador.alimentar(bytes([byte]))
+    assert quadros == MENSAGENS
+    assert desenquadrador.descartados == 0
+
+
+def test_desenquadrador_bit_stuffing_descarta_quadro_sem_bytes_inteiros():
+    # Conteúdo de 9 bits entre duas FLAGS (sem seis uns seguidos, para não formar FLAG)
+    bits = '01111110' + '101010101' + '01111110'
+    corrompido = int(bits, 2).to_bytes(-(-len(bits) // 8), 'big')
+    fluxo = corrompido + enquadramento_bit_stuffing(b"ok")
+    desenquadrador = DesenquadradorBitStuffing()
+    assert desenquadrador.alimentar(fluxo) == [b"ok"]
+    assert desenquadrador.descartados == 1
@@ -0,0 +1,98 @@
+# test_paralelo.py
+import numpy as np
+import pytest
+from Camada_enlace import codificar_hamming, decodificar_hamming, obter_codec_hamming
+from Camada_fisica import DTYPE_COMPACTO, MODULACOES
+from crc32 import calcular_crc32
+from paralelo import (
+    PARTES_POR_PROCESSO,
+    codificar_hamming_paralelo,
+    criar_executor,
+    crc32_paralelo,
+    decodificar_hamming_paralelo,
+    dividir_em_partes,
+    modular_paralelo
+)
+
+# Os resultados paralelos são comparados byte a byte (e amostra a amostra) com as funções
+# em série. Com tamanho_minimo_parte=1 os dados são divididos em PARTES_POR_PROCESSO
+# partes por processo mesmo sendo pequenos, então as fronteiras entre partes são testadas.
+
+PROCESSOS = 2
+MINIMO = 1
+
+TAMANHOS = [0, 1, 2, 7, 333, 1001]
+
+
+@pytest.fixture(scope="module")
+def executor():
+    with criar_executor(PROCESSOS) as executor:
+        yield executor
+
+
+def _dados(tamanho, semente=0):
+    return np.random.default_rng(semente).bytes(tamanho)
+
+
+@pytest.mark.parametrize("unidade", [1, 3, 7, 26])
+def test_partes_pequenas_cobrem_os_dados(unidade):
+    total = 1001
+    partes = dividir_em_partes(total, unidade, PROCESSOS, MINIMO)
+    assert len(partes) == min(PROCESSOS * PARTES_POR_PROCESSO, total // unidade + 1)
+    assert partes[0][0] == 0 and partes[-1][1] == total
+    assert all(a[1] == b[0] for a, b in zip(partes, partes[1:]))
+    assert all(inicio % unidade == 0 for inicio, _ in partes)
+
+
+@pytest.mark.parametrize("tamanho", TAMANHOS)
+def test_crc32(executor, tamanho):
+    dados = _dados(tamanho)
+    assert crc32_paralelo(dados, PROCESSOS, executor, MINIMO) == calcular_crc32(dados)
+
+
+@pytest.mark.parametrize("m", [3, 4, 11, 26])
+@pytest.mark.parametrize("tamanho", TAMANHOS)
+def test_codificar_hamming(executor, m, tamanho):
+    dados = _dados(tamanho)
+    assert codificar_hamming_paralelo(dados, m, PROCESSOS, executor, MINIMO) == \
+        codificar_hamming(dados, m)
+
+
+@pytest.mark.parametrize("m", [3, 4, 11, 26])
+@pytest.mark.parametrize("tamanho", TAMANHOS)
+def test_decodificar_hamming_com_erros(executor, m, tamanho):
+    codigo = bytearray(codificar_hamming(_dados(tamanho), m))
+    # Inverte alguns bits espalhados pelo código, em partes diferentes
+    rng = np.random.default_rng(1)
+    for posicao in rng.choice(len(codigo) * 8, min(len(codigo), 5), replace=False):
+        codigo[posicao // 8] ^= 0x80 >> posicao % 8
+    codigo = bytes(codigo)
+    esperado = obter_codec_hamming(m).decodificar(codigo, retornar_corrigidos=True)
+    dados, corrigidos = decodificar_hamming_paralelo(codigo, m, PROCESSOS, executor, True, MINIMO)
+    assert dados == bytes(esperado[0])
+    assert corrigidos == esperado[1]
+    assert decodificar_hamming_paralelo(codigo, m, PROCESSOS, executor,
+                                        tamanho_minimo_parte=MINIMO) == decodificar_hamming(codigo, m)
+
+
+@pytest.mark.parametrize("tipo_mod", list(MODULACOES))
+@pytest.mark.parametrize("tamanho", TAMANHOS)
+@pytest.mark.parametrize("compacto", [False, True], ids=["float64", "compacto"])
+def test_modulacao(executor, tipo_mod, tamanho, compacto):
+    dados = _dados(tamanho, semente=2)
+    dtype = DTYPE_COMPACTO[tipo_mod] if compacto else None
+    esperado = MODULACOES[tipo_mod](np.unpackbits(np.frombuffer(dados, np.uint8)),
+                                    samples_per_bit=4, dtype=dtype, retornar_sinal=True).amostras
+    sinal = modular_paralelo(dados, tipo_mod, 4, dtype, PROCESSOS, executor, MINIMO)
+    assert sinal.amostras.dtype == esperado.dtype
+    assert np.array_equal(sinal.amostras, esperado)
+
+
+@pytest.mark.parametrize("byte", [0x00, 0x01, 0x07, 0xFF])
+def test_bipolar_polaridade_atravessa_as_partes(executor, byte):
+    # Partes com número par e ímpar de uns: a alternância do AMI continua entre elas
+    dados = bytes([byte]) * 300
+    esperado = MODULACOES["Bipolar"](np.unpackbits(np.frombuffer(dados, np.uint8)),
+                                     samples_per_bit=2, retornar_sinal=True).amostras
+    sinal = modular_paralelo(dados, "Bipolar", 2, None, PROCESSOS, executor, MINIMO)
+    assert np.array_equal(sinal.amostras, esperado)
@@ -0,0 +1,145 @@
+# test_paridade.py
+import numpy as np
+import pytest
+from paridade import (
+    PARIDADE_BYTE,
+    aplicar_paridade_2d,
+    paridade_linhas,
+    tamanho_payload_2d,
+    verificar_paridade_2d,
+    verificar_paridade_2d_faixas,
+    xor_faixas
+)
+
+_rng = np.random.default_rng(0)
+
+# Tamanhos múltiplos de 8 (sem preenchimento) e não múltiplos (com bits de preenchimento)
+TAMANHOS = [1, 5, 7, 8, 13, 16, 63, 100]
+
+
+def _dados(tamanho):
+    return _rng.bytes(tamanho)
+
+
+def _inverter(quadro: bytes, bit: int) -> bytes:
+    quadro = bytearray(quadro)
+    quadro[bit // 8] ^= 0x80 >> bit % 8
+    return bytes(quadro)
+
+
+# === MOTOR DE PARIDADE ===
+
+@pytest.mark.parametrize("tamanho", [0] + TAMANHOS)
+def test_paridade_linhas_igual_a_packbits(tamanho):
+    dados = np.frombuffer(_dados(tamanho), np.uint8)
+    assert np.array_equal(paridade_linhas(dados), np.packbits(PARIDADE_BYTE[dados]))
+
+
+def test_xor_faixas():
+    dados = np.frombuffer(_dados(50), np.uint8)
+    inicios = np.array([0, 0, 10, 49, 30, 7])
+    tamanhos = np.array([50, 0, 5, 1, 20, 1])
+    esperado = [np.bitwise_xor.reduce(dados[i:i + t]) if t else 0 for i, t in zip(inicios, tamanhos)]
+    assert xor_faixas(dados, inicios, tamanhos).tolist() == esperado
+
+
+# === PARIDADE BIDIMENSIONAL ===
+
+@pytest.mark.parametrize("tamanho", [0] + TAMANHOS)
+def test_layout_e_tamanho(tamanho):
+    dados = _dados(tamanho)
+    quadro = aplicar_paridade_2d(dados)
+    assert len(quadro) == tamanho + -(-tamanho // 8) + 1
+    assert tamanho_payload_2d(len(quadro)) == tamanho
+    assert verificar_paridade_2d(quadro) == (dados, False, False)
+
+
+@pytest.mark.parametrize("tamanho_quadro", [0, 2, 11, 20])
+def test_tamanho_invalido(tamanho_quadro):
+    assert tamanho_payload_2d(tamanho_quadro) == -1
+    with pytest.raises(ValueError):
+        verificar_paridade_2d(bytes(tamanho_quadro))
+
+
+@pytest.mark.parametrize("tamanho", TAMANHOS)
+def test_corrige_cada_bit_do_payload(tamanho):
+    dados = _dados(tamanho)
+    quadro = aplicar_paridade_2d(dados)
+    for bit in range(tamanho * 8):
+        assert verificar_paridade_2d(_inverter(quadro, bit)) == (dados, True, False), bit
+
+
+@pytest.mark.parametrize("tamanho", TAMANHOS)
+def test_bit_errado_na_paridade_das_linhas(tamanho):
+    dados = _dados(tamanho)
+    quadro = aplicar_paridade_2d(dados)
+    for linha in range(tamanho):
+        # O payload volta intacto
+        assert verificar_paridade_2d(_inverter(quadro, tamanho * 8 + linha)) == (dados, True, False)
+
+
+@pytest.mark.parametrize("tamanho", TAMANHOS)
+def test_bit_errado_na_paridade_das_colunas(tamanho):
+    dados = _dados(tamanho)
+    quadro = aplicar_paridade_2d(dados)
+    for coluna in range(8):
+        assert verificar_paridade_2d(_inverter(quadro, (len(quadro) - 1) * 8 + coluna)) == \
+            (dados, True, False)
+
+
+@pytest.mark.parametrize("tamanho", [1, 5, 7, 13, 63, 100])
+def test_bits_de_preenchimento_sao_ignorados(tamanho):
+    dados = _dados(tamanho)
+    quadro = aplicar_paridade_2d(dados)
+    ultimo_linhas = (tamanho + -(-tamanho // 8)) * 8
+    for bit in range(tamanho % 8, 8):
+        # Os bits depois da última linha no último byte das linhas não são conferidos
+        assert verificar_paridade_2d(_inverter(quadro, ultimo_linhas - 8 + bit)) == \
+            (dados, False, False)
+
+
+@pytest.mark.parametrize("tamanho", [8, 13, 100])
+def test_dois_bits_errados_sao_detectados(tamanho):
+    dados = _dados(tamanho)
+    quadro = aplicar_paridade_2d(dados)
+    rng = np.random.default_rng(tamanho)
+    for _ in range(200):
+        a, b = rng.choice(tamanho * 8, 2, replace=False)
+        _, corrigido, erro = verificar_paridade_2d(_inverter(_inverter(quadro, a), b))
+        assert erro and not corrigido
+
+
+# === VÁRIOS QUADROS DE UMA VEZ ===
+
+def _quadros_com_erros():
+    rng = np.random.default_rng(1)
+    quadros = []
+    for tamanho in [0, 1, 5, 8, 13, 16, 63, 100] * 4:
+        quadro = aplicar_paridade_2d(rng.bytes(tamanho))
+        # Nenhum, um ou dois bits errados, em qualquer parte do quadro (preenchimento incluído)
+        for bit in rng.choice(len(quadro) * 8, rng.integers(0, 3), replace=False):
+            quadro = _inverter(quadro, bit)
+        quadros.append(quadro)
+    # Tamanhos que nenhum payload produz
+    return quadros + [b"\x00\x01", bytes(11), b""]
+
+
+def test_faixas_igual_a_um_quadro_por_vez():
+    quadros = _quadros_com_erros()
+    rng = np.random.default_rng(2)
+    lixo = [rng.bytes(rng.integers(0, 4)) for _ in quadros]
+    # Os quadros ficam separados por bytes que não pertencem a nenhum deles
+    dados = b"".join(l + q for l, q in zip(lixo, quadros))
+    tamanhos = np.array([len(q) for q in quadros])
+    inicios = np.cumsum([len(l) for l in lixo]) + np.cumsum(tamanhos) - tamanhos
+
+    payloads, inicios_payload, tamanhos_payload, corrigidos, erros, invalidos = \
+        verificar_paridade_2d_faixas(dados, inicios, tamanhos)
+
+    for i, quadro in enumerate(quadros):
+        if tamanho_payload_2d(len(quadro)) < 0:
+            assert invalidos[i] and not corrigidos[i] and not erros[i] and tamanhos_payload[i] == 0
+            continue
+        payload = payloads[inicios_payload[i]:inicios_payload[i] + tamanhos_payload[i]].tobytes()
+        assert not invalidos[i]
+        assert (payload, bool(corrigidos[i]), bool(erros[i])) == verificar_paridade_2d(quadro), i
@@ -0,0 +1,39 @@
+# test_protocolo.py
+import socket
+import threading
+import pytest
+from protocolo import ConexaoReceptor
+
+
+def test_interromper_acorda_transmissao_esperando_resposta():
+    # Receptor que aceita a conexão e nunca responde
+    with socket.create_server(("127.0.0.1", 0)) as servidor:
+        conexao = ConexaoReceptor("127.0.0.1", servidor.getsockname()[1])
+        aceita, _ = servidor.accept()
+        erros = []
+
+        def transmitir():
+            try:
+                conexao.transmitir(b"quadro", "Contagem de caracteres", "Nenhum")
+            except (ConnectionError, OSError, ValueError) as e:
+                erros.append(e)
+
+        trabalho = threading.Thread(target=transmitir, daemon=True)
+        trabalho.start()
+        trabalho.join(0.2)
+        assert trabalho.is_alive()   # esperando a resposta
+
+        conexao.interromper()
+        trabalho.join(2.0)
+        aceita.close()
+        assert not trabalho.is_alive()
+        assert len(erros) == 1
+
+
+def test_interromper_conexao_ja_fechada():
+    with socket.create_server(("127.0.0.1", 0)) as servidor:
+        conexao = ConexaoReceptor("127.0.0.1", servidor.getsockname()[1])
+        conexao.close()
+        conexao.interromper()
+        with pytest.raises(OSError):
+            conexao.enviar(b"quadro", "Contagem de caracteres", "Nenhum")
@@ -0,0 +1,83 @@
+# test_receptor_lote.py
+import numpy as np
+import pytest
+from Camada_enlace import montar_quadro, obter_codec_hamming
+from receptor_socket import (
+    RESULTADO_LOTE,
+    STATUS_CORRIGIDO,
+    STATUS_ERRO_DETECTADO,
+    STATUS_OK,
+    STATUS_QUADRO_INVALIDO,
+    processar_recepcao_lote,
+    receber_quadro
+)
+
+# Cada quadro do lote é conferido contra receber_quadro chamado só com ele
+
+ENQUADRAMENTOS = ["Contagem", "Byte Stuffing", "Bit Stuffing"]
+CONFIGURACOES = [("Paridade", 4), ("CRC", 4), ("Paridade 2D", 4), ("Hamming", 4), ("Hamming", 11)]
+
+
+def _inverter(quadro: bytes, bits) -> bytes:
+    quadro = bytearray(quadro)
+    for bit in bits:
+        quadro[bit // 8] ^= 0x80 >> bit % 8
+    return bytes(quadro)
+
+
+def _quadros(enq_tipo, err_tipo, m_bits):
+    rng = np.random.default_rng(0)
+    mensagens = [b"", b"a", b"~\x1B~", b"\xFF" * 9] + [rng.bytes(rng.integers(1, 120)) for _ in range(30)]
+    # Muitos quadros do mesmo tamanho (o CRC deles é calculado como uma matriz)
+    mensagens += [rng.bytes(40) for _ in range(20)]
+    quadros = []
+    for mensagem in mensagens:
+        quadro = montar_quadro(mensagem, enq_tipo, err_tipo, m_bits)
+        # Intacto, com um bit errado ou com vários
+        erros = rng.choice([0, 1, 3], p=[0.4, 0.4, 0.2])
+        quadros.append(_inverter(quadro, rng.choice(len(quadro) * 8, erros, replace=False)))
+    # Malformados: vazios, truncados e com bytes a mais
+    quadro = montar_quadro(b"mensagem", enq_tipo, err_tipo, m_bits)
+    quadros += [b"", b"\x00", b"\x00\x01", quadro[:3], quadro[:-1], quadro + b"\x00", b"~\x1B~"]
+    rng.shuffle(quadros)
+    return quadros
+
+
+def _esperado(quadro, metadata):
+    """(status, mensagem) de um quadro recebido sozinho."""
+    try:
+        mensagem, status, erro_detectado = receber_quadro(quadro, metadata)
+    except ValueError:
+        return STATUS_QUADRO_INVALIDO, b""
+    if erro_detectado:
+        return STATUS_ERRO_DETECTADO, mensagem
+    if metadata["err_tipo"] == "Hamming":
+        _, corrigidos = obter_codec_hamming(metadata["m_bits"]).decodificar(quadro, retornar_corrigidos=True)
+        return (STATUS_CORRIGIDO if corrigidos else STATUS_OK), mensagem
+    return (STATUS_CORRIGIDO if "corrigidos" in status else STATUS_OK), mensagem
+
+
+@pytest.mark.parametrize("err_tipo, m_bits", CONFIGURACOES)
+@pytest.mark.parametrize("enq_tipo", ENQUADRAMENTOS)
+def test_lote_igual_a_um_quadro_por_vez(enq_tipo, err_tipo, m_bits):
+    metadata = {"enq_tipo": enq_tipo, "err_tipo": err_tipo, "m_bits": m_bits}
+    quadros = _quadros(enq_tipo, err_tipo, m_bits)
+    resultados, mensagens = processar_recepcao_lote(quadros, metadata)
+
+    assert resultados.dtype == RESULTADO_LOTE and resultados.size == len(quadros)
+    # As mensagens ficam em sequência, sem buracos nem sobreposição
+    assert resultados['inicio'][0] == 0 and resultados['fim'][-1] == len(mensagens)
+    assert np.array_equal(resultados['inicio'][1:], resultados['fim'][:-1])
+
+    for i, (quadro, (status, inicio, fim)) in enumerate(zip(quadros, resultados.tolist())):
+        assert (status, mensagens[inicio:fim]) == _esperado(quadro, metadata), i
+
+    # O lote tem quadros de todos os tipos
+    presentes = set(resultados['status'].tolist())
+    assert {STATUS_OK, STATUS_QUADRO_INVALIDO} <= presentes
+    assert presentes & {STATUS_CORRIGIDO, STATUS_ERRO_DETECTADO}
+
+
+def test_lote_vazio():
+    resultados, mensagens = processar_recepcao_lote([], {"enq_tipo": "Contagem", "err_tipo": "CRC"})
+    assert resultados.size == 0 and mensagens == b""
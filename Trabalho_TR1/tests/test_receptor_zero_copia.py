@@ -0,0 +1,106 @@
+# test_receptor_zero_copia.py
+import asyncio
+import threading
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+import pytest
+import receptor_socket
+from Camada_enlace import montar_quadro
+from protocolo import CABECALHO, EDC_IDS, ENQUADRAMENTO_IDS, desempacotar_cabecalho, empacotar_cabecalho
+from receptor_socket import LIMITE_NO_LACO, ProtocoloZeroCopia, decodifica_no_laco
+
+# (enquadramento, detecção/correção, m do Hamming, mensagem)
+QUADROS = [
+    ("Contagem", "CRC", 4, b"pequeno"),
+    ("Byte Stuffing", "Hamming", 11, b"hamming ~ \x1B " * 4000),
+    ("Contagem", "Paridade", 4, b"depois do hamming"),
+    ("Bit Stuffing", "Paridade 2D", 4, b"bit stuffing e paridade 2D"),
+    ("Byte Stuffing", "CRC", 4, b"grande" * (LIMITE_NO_LACO // 4)),
+    ("Byte Stuffing", "Paridade", 4, b"ultimo"),
+]
+
+
+def _mensagem(seq, enq_tipo, err_tipo, m_bits, mensagem):
+    quadro = montar_quadro(mensagem, enq_tipo, err_tipo, m_bits)
+    return empacotar_cabecalho(ENQUADRAMENTO_IDS[enq_tipo], EDC_IDS[err_tipo], m_bits, seq, len(quadro)) + quadro
+
+
+async def _servidor(executor):
+    return await asyncio.get_running_loop().create_server(
+        lambda: ProtocoloZeroCopia(executor), "127.0.0.1", 0)
+
+
+async def _trocar(porta, quadros, primeiro_seq=0):
+    """Envia os quadros de uma vez e retorna as respostas (seq, texto) na ordem recebida."""
+    reader, writer = await asyncio.open_connection("127.0.0.1", porta)
+    try:
+        writer.write(b"".join(_mensagem(primeiro_seq + i, *q) for i, q in enumerate(quadros)))
+        await writer.drain()
+        respostas = []
+        for _ in quadros:
+            cabecalho = desempacotar_cabecalho(await reader.readexactly(CABECALHO.size))
+            respostas.append((cabecalho.seq, (await reader.readexactly(cabecalho.tamanho)).decode('utf-8')))
+        return respostas
+    finally:
+        writer.close()
+
+
+def _esperado(quadros, primeiro_seq=0):
+    return [(primeiro_seq + i, q[3].decode('utf-8')) for i, q in enumerate(quadros)]
+
+
+def test_onde_cada_quadro_e_decodificado():
+    no_laco = [decodifica_no_laco(montar_quadro(m, e, d, b), desempacotar_cabecalho(_mensagem(0, e, d, b, m)[:CABECALHO.size]))
+               for e, d, b, m in QUADROS]
+    assert no_laco == [True, False, True, False, False, True]
+
+
+@pytest.mark.parametrize("tipo_executor", ["padrao", "threads", "processos"])
+def test_respostas_em_ordem(tipo_executor):
+    async def rodar(executor):
+        async with await _servidor(executor) as servidor:
+            porta = servidor.sockets[0].getsockname()[1]
+            return await _trocar(porta, QUADROS)
+
+    if tipo_executor == "padrao":
+        respostas = asyncio.run(rodar(None))
+    else:
+        tipo = ProcessPoolExecutor if tipo_executor == "processos" else ThreadPoolExecutor
+        with tipo(max_workers=1) as executor:
+            respostas = asyncio.run(rodar(executor))
+    assert respostas == _esperado(QUADROS)
+
+
+def test_quadro_no_executor_nao_trava_outras_conexoes(monkeypatch):
+    liberar = threading.Event()
+    threads = []
+    receber_quadro = receptor_socket.receber_quadro
+
+    def receber_quadro_lento(quadro, cabecalho):
+        threads.append(threading.current_thread())
+        liberar.wait(2)
+        return receber_quadro(quadro, cabecalho)
+
+    monkeypatch.setattr(receptor_socket, "receber_quadro", receber_quadro_lento)
+    pesado = [QUADROS[1], QUADROS[0]]
+    leves = [QUADROS[0], QUADROS[2], QUADROS[5]]
+
+    async def rodar():
+        async with await _servidor(None) as servidor:
+            porta = servidor.sockets[0].getsockname()[1]
+            tarefa_pesada = asyncio.create_task(_trocar(porta, pesado))
+            try:
+                while not threads:
+                    await asyncio.sleep(0.01)
+                # Com o Hamming parado no executor, outra conexão continua sendo atendida
+                respostas_leves = await asyncio.wait_for(_trocar(porta, leves, 10), 2)
+                assert not tarefa_pesada.done()
+                liberar.set()
+                return await asyncio.wait_for(tarefa_pesada, 5), respostas_leves
+            finally:
+                liberar.set()
+                tarefa_pesada.cancel()
+
+    respostas_pesadas, respostas_leves = asyncio.run(rodar())
+    assert respostas_leves == _esperado(leves, 10)
+    assert respostas_pesadas == _esperado(pesado)
+    assert threads[0] is not threading.main_thread()
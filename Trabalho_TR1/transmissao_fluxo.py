@@ -0,0 +1,265 @@
+# transmissao_fluxo.py
+import argparse
+import hashlib
+import json
+import os
+import resource
+import socket
+import time
+import numpy as np
+from Camada_enlace import montar_quadro
+from Camada_fisica import DTYPE_COMPACTO, MODULACOES
+from buffer_bits import bits_de
+from canal import ModeloIID, criar_gerador, injetar_erros
+from protocolo import (
+    empacotar_cabecalho,
+    enviar_quadro,
+    ids_configuracao,
+    receber_resposta
+)
+from sinal import GravadorSinal
+
+# === TRANSMISSÃO DE ARQUIVOS EM FLUXO ===
+#
+# Um arquivo (ou qualquer fonte de bytes) é dividido em segmentos e cada segmento passa
+# sozinho pela cadeia de transmissão: enquadramento, detecção/correção, erros do canal
+# e modulação. Só um segmento por vez fica em memória, de modo que o consumo não
+# depende do tamanho do arquivo.
+#
+# Na conexão, o transmissor negocia a sessão com metadados JSON {"fluxo": nome, ...} e
+# depois envia os quadros com o cabeçalho binário, sem esperar respostas; um quadro vazio
+# encerra o fluxo e o receptor responde com o resumo da remontagem em JSON.
+
+HOST = '127.0.0.1'
+PORT = 12345
+
+# Tamanho dos segmentos (a contagem de caracteres só aceita mensagens de até 254 bytes)
+TAMANHO_SEGMENTO = 16 * 1024
+TAMANHO_MAXIMO_CONTAGEM = 254
+
+# Bits modulados por vez (múltiplo de 3, para os símbolos do 8-QAM não se dividirem)
+BITS_POR_BLOCO = 3 * 8192
+
+
+def tamanho_segmento_padrao(enq_tipo: str) -> int:
+    return TAMANHO_MAXIMO_CONTAGEM if enq_tipo == "Contagem" else TAMANHO_SEGMENTO
+
+
+def segmentar(origem, tamanho: int):
+    """
+    Divide a origem em segmentos de no máximo `tamanho` bytes.
+    A origem pode ser o caminho de um arquivo, um arquivo aberto em modo binário,
+    bytes ou um iterável de pedaços de bytes de qualquer tamanho.
+    """
+    if isinstance(origem, (str, os.PathLike)):
+        with open(origem, 'rb') as arquivo:
+            yield from segmentar(arquivo, tamanho)
+        return
+    if isinstance(origem, (bytes, bytearray, memoryview)):
+        visao = memoryview(origem)
+        for inicio in range(0, len(visao), tamanho):
+            yield bytes(visao[inicio:inicio + tamanho])
+        return
+    if hasattr(origem, 'read'):
+        while segmento := origem.read(tamanho):
+            yield segmento
+        return
+
+    pendente = bytearray()
+    for pedaco in origem:
+        pendente += pedaco
+        inicio = 0
+        while len(pendente) - inicio >= tamanho:
+            yield bytes(pendente[inicio:inicio + tamanho])
+            inicio += tamanho
+        del pendente[:inicio]
+    if pendente:
+        yield bytes(pendente)
+
+
+def quadros_do_fluxo(origem, enq_tipo: str, err_tipo: str, m_bits: int = 4,
+                     taxa_erro: float = 0.0, semente=None, tamanho_segmento: int = None):
+    """
+    Gera (segmento, quadro transmitido) para cada segmento da origem: enquadramento,
+    detecção/correção e, com taxa_erro > 0, os erros do canal.
+    """
+    tamanho = tamanho_segmento or tamanho_segmento_padrao(enq_tipo)
+    modelo = ModeloIID(taxa_erro) if taxa_erro > 0 else None
+    rng = criar_gerador(semente)
+    for segmento in segmentar(origem, tamanho):
+        quadro = montar_quadro(segmento, enq_tipo, err_tipo, m_bits)
+        if modelo is not None:
+            quadro, _ = injetar_erros(quadro, modelo, rng)
+            quadro = bytes(quadro)
+        yield segmento, quadro
+
+
+def modular_fluxo(quadros, tipo_mod: str, samples_per_bit: int = 100, dtype=None):
+    """
+    Modula uma sequência de quadros como um único sinal contínuo, gerando as amostras
+    em blocos de BITS_POR_BLOCO bits (no dtype pedido; float64 por padrão).
+    """
+    modular = MODULACOES[tipo_mod]
+    invertido = False
+    for quadro in quadros:
+        bits = bits_de(quadro)
+        for inicio in range(0, bits.size, BITS_POR_BLOCO):
+            bloco = bits[inicio:inicio + BITS_POR_BLOCO]
+            sinal = modular(bloco, samples_per_bit=samples_per_bit, dtype=dtype,
+                            retornar_sinal=True).amostras
+            if tipo_mod == "Bipolar":
+                # A alternância do AMI continua do último '1' do bloco anterior
+                if invertido:
+                    sinal = -sinal
+                invertido ^= bool(np.count_nonzero(bloco) % 2)
+            yield sinal
+
+
+class RemontadorFluxo:
+    """
+    Junta, na ordem, os segmentos recebidos de um fluxo. Os bytes são gravados no
+    destino (um arquivo aberto, opcional) assim que chegam; só o resumo fica em memória.
+    """
+
+    def __init__(self, destino=None):
+        self.destino = destino
+        self.hash = hashlib.sha256()
+        self.quadros = 0
+        self.bytes = 0
+        self.erros_detectados = 0
+        self.invalidos = 0
+
+    def adicionar(self, segmento, erro_detectado: bool = False):
+        """Acrescenta um segmento (None = quadro inválido, cujo conteúdo se perdeu)."""
+        self.quadros += 1
+        if segmento is None:
+            self.invalidos += 1
+            return
+        self.erros_detectados += bool(erro_detectado)
+        self.bytes += len(segmento)
+        self.hash.update(segmento)
+        if self.destino is not None:
+            self.destino.write(segmento)
+
+    def resumo(self) -> dict:
+        return {"quadros": self.quadros, "bytes": self.bytes,
+                "erros_detectados": self.erros_detectados, "invalidos": self.invalidos,
+                "sha256": self.hash.hexdigest()}
+
+
+def enviar_fluxo(origem, host: str = HOST, port: int = PORT, enq_tipo: str = "Byte Stuffing",
+                 err_tipo: str = "CRC", m_bits: int = 4, taxa_erro: float = 0.0, semente=None,
+                 nome: str = None, tipo_mod: str = None, samples_per_bit: int = 100,
+                 tamanho_segmento: int = None, saida_sinal: str = None) -> dict:
+    """
+    Transmite a origem inteira ao receptor em uma sessão de fluxo.
+    Com tipo_mod, cada quadro também é modulado; as amostras são descartadas depois
+    de contadas ou, com saida_sinal, gravadas em um arquivo .npy (no dtype compacto
+    da modulação) que pode ser aberto com Signal.carregar sem ocupar a memória.
+
+    Returns:
+        resumo do receptor, acrescido de "integro" (hash igual ao da origem),
+        "duracao", "bytes_enviados" e "amostras".
+    """
+    m_bits = m_bits if err_tipo == "Hamming" else 0
+    ids = ids_configuracao(enq_tipo, err_tipo, m_bits)
+    if ids is None:
+        raise ValueError("Configuração sem id no cabeçalho binário.")
+    if nome is None and isinstance(origem, (str, os.PathLike)):
+        nome = os.path.basename(origem)
+
+    hash_origem = hashlib.sha256()
+    enviados = amostras = seq = 0
+    dtype = DTYPE_COMPACTO[tipo_mod] if tipo_mod is not None else None
+    gravador = None
+    if tipo_mod is not None and saida_sinal is not None:
+        gravador = GravadorSinal(saida_sinal, dtype, 1 / samples_per_bit)
+    inicio = time.perf_counter()
+    with socket.create_connection((host, port)) as sock:
+        metadata = {"fluxo": nome, "enq_tipo": enq_tipo, "err_tipo": err_tipo, "m_bits": m_bits}
+        enviar_quadro(sock, metadata, b"")
+        resposta = receber_resposta(sock)
+        if resposta.startswith("Erro"):
+            raise ConnectionError(resposta)
+
+        def enviar_quadros():
+            nonlocal enviados, seq
+            for segmento, quadro in quadros_do_fluxo(origem, enq_tipo, err_tipo, m_bits,
+                                                     taxa_erro, semente, tamanho_segmento):
+                hash_origem.update(segmento)
+                sock.sendall(empacotar_cabecalho(*ids, m_bits, seq, len(quadro)) + quadro)
+                enviados += len(quadro)
+                seq = (seq + 1) & 0xFFFFFFFF
+                yield quadro
+
+        if tipo_mod is None:
+            for _ in enviar_quadros():
+                pass
+        else:
+            # Um único modular_fluxo para o fluxo inteiro: cada quadro é modulado logo depois
+            # de enviado e o estado do AMI (Bipolar) continua de um quadro para o outro
+            for sinal in modular_fluxo(enviar_quadros(), tipo_mod, samples_per_bit, dtype):
+                amostras += sinal.size
+                if gravador is not None:
+                    gravador.escrever(sinal)
+        # Quadro vazio: fim do fluxo
+        sock.sendall(empacotar_cabecalho(*ids, m_bits, seq, 0))
+        resumo = json.loads(receber_resposta(sock))
+    if gravador is not None:
+        gravador.fechar()
+
+    resumo.update(integro=resumo["sha256"] == hash_origem.hexdigest(),
+                  duracao=time.perf_counter() - inicio, bytes_enviados=enviados, amostras=amostras)
+    return resumo
+
+
+def _aleatorio(megabytes: int, semente=0):
+    """Pedaços de 1 MB de bytes aleatórios, sem montar o total em memória."""
+    rng = np.random.default_rng(semente)
+    for _ in range(megabytes):
+        yield rng.bytes(1 << 20)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Transmite um arquivo grande em quadros.")
+    parser.add_argument("arquivo", nargs="?", help="arquivo a transmitir")
+    parser.add_argument("--aleatorio", type=int, metavar="MB",
+                        help="transmite MB megabytes aleatórios em vez de um arquivo")
+    parser.add_argument("--host", default=HOST)
+    parser.add_argument("--port", type=int, default=PORT)
+    parser.add_argument("--enq", default="Byte Stuffing", choices=["Contagem", "Byte Stuffing", "Bit Stuffing"])
+    parser.add_argument("--err", default="CRC", choices=["Paridade", "Paridade 2D", "CRC", "Hamming"])
+    parser.add_argument("--m", type=int, default=4, help="bits de dados do Hamming")
+    parser.add_argument("--taxa-erro", type=float, default=0.0)
+    parser.add_argument("--semente", type=int)
+    parser.add_argument("--modulacao", choices=list(MODULACOES), help="também modula cada quadro")
+    parser.add_argument("--samples-per-bit", type=int, default=100)
+    parser.add_argument("--segmento", type=int, help="bytes de dados por quadro")
+    parser.add_argument("--saida-sinal", metavar="ARQUIVO.npy",
+                        help="grava o sinal modulado em um .npy (requer --modulacao)")
+    args = parser.parse_args()
+    if (args.arquivo is None) == (args.aleatorio is None):
+        parser.error("informe um arquivo ou --aleatorio")
+    if args.saida_sinal and not args.modulacao:
+        parser.error("--saida-sinal requer --modulacao")
+
+    origem = args.arquivo if args.arquivo is not None else _aleatorio(args.aleatorio)
+    nome = None if args.arquivo is not None else f"aleatorio_{args.aleatorio}MB.bin"
+    r = enviar_fluxo(origem, args.host, args.port, args.enq, args.err, args.m, args.taxa_erro,
+                     args.semente, nome, args.modulacao, args.samples_per_bit, args.segmento,
+                     args.saida_sinal)
+
+    pico = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    print(f"{r['quadros']} quadros, {r['bytes']} bytes remontados em {r['duracao']:.2f} s "
+          f"({r['bytes'] / r['duracao'] / 1e6:.1f} MB/s)")
+    print(f"Erros detectados: {r['erros_detectados']}, quadros inválidos: {r['invalidos']}, "
+          f"íntegro: {'sim' if r['integro'] else 'não'}")
+    if args.modulacao:
+        print(f"Amostras moduladas: {r['amostras']}")
+    if args.saida_sinal:
+        print(f"Sinal gravado em {args.saida_sinal}")
+    print(f"Pico de memória do transmissor: {pico:.0f} MB")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,127 @@
+# transmissor.py
+import argparse
+import json
+import sys
+import time
+from collections import deque
+from Camada_enlace import ENQUADRAMENTOS, montar_quadro
+from Camada_fisica import DTYPE_COMPACTO, MODULACOES
+from buffer_bits import BitBuffer
+from canal import ModeloIID, criar_gerador, injetar_erros
+from protocolo import ConexaoReceptor
+
+# === TRANSMISSOR SEM INTERFACE GRÁFICA ===
+#
+# A mesma cadeia da interface (enquadramento, detecção/correção, erros do canal,
+# modulação e envio ao receptor), em linha de comando e sem GTK nem matplotlib:
+#
+#   python -m Trabalho_TR1 "mensagem" --enq "Byte Stuffing" --err CRC --taxa-erro 0.01
+#   seq 1000 | python -m Trabalho_TR1 --stdin --json
+#
+# Com várias mensagens, todas usam a mesma conexão e até EM_VOO quadros são enviados
+# antes de as respostas chegarem.
+
+HOST = '127.0.0.1'
+PORT = 12345
+
+EM_VOO = 32
+
+
+def preparar_quadro(dados: bytes, enq_tipo: str, err_tipo: str, m_bits: int = 4, modelo=None,
+                    rng=None, tipo_mod: str = None, samples_per_bit: int = 100) -> tuple:
+    """
+    Enquadramento, detecção/correção, erros do canal e (opcionalmente) modulação.
+    Retorna (quadro transmitido, estatísticas).
+    """
+    quadro = montar_quadro(dados, enq_tipo, err_tipo, m_bits)
+    estatisticas = {"bytes": len(dados), "bytes_quadro": len(quadro), "bits_invertidos": 0}
+    if modelo is not None:
+        quadro, posicoes = injetar_erros(quadro, modelo, rng)
+        quadro = bytes(quadro)
+        estatisticas["bits_invertidos"] = int(posicoes.size)
+    if tipo_mod is not None:
+        sinal = MODULACOES[tipo_mod](BitBuffer(quadro), samples_per_bit=samples_per_bit,
+                                     dtype=DTYPE_COMPACTO[tipo_mod], retornar_sinal=True)
+        estatisticas["amostras"] = len(sinal)
+    return quadro, estatisticas
+
+
+def _mensagens(args):
+    for mensagem in args.mensagens:
+        yield mensagem.encode('utf-8')
+    if args.stdin:
+        for linha in sys.stdin.buffer:
+            yield linha.rstrip(b"\r\n")
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m Trabalho_TR1",
+                                     description="Transmissor do simulador em linha de comando.")
+    parser.add_argument("mensagens", nargs="*", help="mensagens a transmitir")
+    parser.add_argument("--stdin", action="store_true", help="lê uma mensagem por linha da entrada")
+    parser.add_argument("--enq", default="Contagem", choices=list(ENQUADRAMENTOS))
+    parser.add_argument("--err", default="CRC", choices=["Paridade", "Paridade 2D", "CRC", "Hamming"])
+    parser.add_argument("--m", type=int, default=4, help="bits de dados do Hamming")
+    parser.add_argument("--taxa-erro", type=float, default=0.0, help="probabilidade de inverter cada bit")
+    parser.add_argument("--semente", type=int)
+    parser.add_argument("--modulacao", choices=list(MODULACOES), help="também modula cada quadro")
+    parser.add_argument("--samples-per-bit", type=int, default=100)
+    parser.add_argument("--host", default=HOST)
+    parser.add_argument("--port", type=int, default=PORT)
+    parser.add_argument("--sem-envio", action="store_true", help="não se conecta ao receptor")
+    parser.add_argument("--json", action="store_true", help="uma linha JSON por mensagem")
+    args = parser.parse_args(argv)
+    if not args.mensagens and not args.stdin:
+        parser.error("informe uma mensagem ou --stdin")
+
+    modelo = ModeloIID(args.taxa_erro) if args.taxa_erro > 0 else None
+    rng = criar_gerador(args.semente)
+    m_bits = args.m if args.err == "Hamming" else 0
+
+    def emitir(estatisticas, resposta=None):
+        if resposta is not None:
+            estatisticas["resposta"] = resposta
+        if args.json:
+            print(json.dumps(estatisticas, ensure_ascii=False))
+        else:
+            print(resposta if resposta is not None else
+                  f"{estatisticas['bytes_quadro']} bytes, {estatisticas['bits_invertidos']} bits invertidos")
+
+    conexao = None
+    try:
+        if not args.sem_envio:
+            conexao = ConexaoReceptor(args.host, args.port)
+        pendentes = deque()   # (estatísticas, instante do envio) de cada quadro sem resposta
+        for dados in _mensagens(args):
+            try:
+                quadro, estatisticas = preparar_quadro(dados, args.enq, args.err, args.m, modelo, rng,
+                                                       args.modulacao, args.samples_per_bit)
+            except ValueError as e:
+                print(f"Erro: {e}", file=sys.stderr)
+                continue
+            if conexao is None:
+                emitir(estatisticas)
+                continue
+            conexao.enviar(quadro, args.enq, args.err, m_bits)
+            pendentes.append((estatisticas, time.perf_counter()))
+            if len(pendentes) >= EM_VOO:
+                estatisticas, envio = pendentes.popleft()
+                resposta = conexao.receber()[1]
+                estatisticas["segundos"] = time.perf_counter() - envio
+                emitir(estatisticas, resposta)
+        while pendentes:
+            estatisticas, envio = pendentes.popleft()
+            resposta = conexao.receber()[1]
+            estatisticas["segundos"] = time.perf_counter() - envio
+            emitir(estatisticas, resposta)
+    except (ConnectionError, OSError) as e:
+        print(f"Erro de comunicação: {e}", file=sys.stderr)
+        return 1
+    finally:
+        if conexao is not None:
+            conexao.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,232 @@
+# varredura.py
+import argparse
+import csv
+import itertools
+import math
+import time
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+from Camada_enlace import montar_quadro
+from Camada_fisica import MODULACOES, DEMODULACOES, BITS_POR_SIMBOLO
+from canal import Canal, ModeloIID, canal_awgn
+from receptor_socket import processar_recepcao_lote, STATUS_ERRO_DETECTADO, STATUS_QUADRO_INVALIDO
+
+# === VARREDURA MONTE CARLO DE BER/FER ===
+#
+# Cada ponto da grade (enquadramento x detecção/correção x taxa de erro) é simulado
+# em um processo separado: payload aleatório -> montar_quadro -> canal -> recepção em lote.
+
+ENQUADRAMENTOS = ["Contagem", "Byte Stuffing", "Bit Stuffing"]
+EDCS = [("Paridade", 0), ("Paridade 2D", 0), ("CRC", 0), ("Hamming", 4), ("Hamming", 11)]
+TAXAS = [1e-4, 1e-3, 1e-2]
+
+# Quadros simulados entre duas verificações do critério de parada
+LOTE = 200
+
+# Quadros com erro necessários antes de aceitar o intervalo de confiança
+ERROS_MINIMOS = 20
+
+
+def intervalo_wilson(sucessos: int, total: int, z: float = 1.96) -> tuple:
+    """
+    Intervalo de confiança de Wilson para uma proporção (z=1.96 -> 95%).
+    """
+    if total == 0:
+        return 0.0, 1.0
+    p = sucessos / total
+    denominador = 1 + z * z / total
+    centro = (p + z * z / (2 * total)) / denominador
+    meia_largura = z * math.sqrt(p * (1 - p) / total + z * z / (4 * total * total)) / denominador
+    return max(0.0, centro - meia_largura), min(1.0, centro + meia_largura)
+
+
+def bits_diferentes(a: bytes, b: bytes) -> int:
+    """
+    Número de bits diferentes entre duas mensagens; bytes sobrando ou faltando contam inteiros.
+    """
+    n = min(len(a), len(b))
+    xor = np.bitwise_xor(np.frombuffer(a, np.uint8, n), np.frombuffer(b, np.uint8, n))
+    return int(np.unpackbits(xor).sum()) + 8 * abs(len(a) - len(b))
+
+
+def simular_ponto(enq_tipo: str, err_tipo: str, m_bits: int, taxa: float, semente,
+                  tamanho_payload: int = 32, quadros_max: int = 20000,
+                  quadros_min: int = 1000, alvo_ic: float = 0.1) -> dict:
+    """
+    Simula quadros de um ponto da grade até que a meia largura relativa do intervalo de
+    confiança do FER fique abaixo de alvo_ic (ou até quadros_max quadros).
+    """
+    rng = np.random.default_rng(semente)
+    canal = Canal(ModeloIID(taxa), rng)
+    metadata = {"enq_tipo": enq_tipo, "err_tipo": err_tipo, "m_bits": m_bits}
+
+    quadros = erros_quadro = nao_detectados = bits_errados = 0
+    inicio = time.perf_counter()
+    while quadros < quadros_max:
+        payloads = []
+        quadros_rx = []
+        for _ in range(LOTE):
+            payloads.append(rng.bytes(tamanho_payload))
+            quadro_rx, _ = canal.transmitir(montar_quadro(payloads[-1], enq_tipo, err_tipo, m_bits))
+            quadros_rx.append(bytes(quadro_rx))
+
+        resultados, mensagens = processar_recepcao_lote(quadros_rx, metadata)
+        # Quadro que não pôde ser desenquadrado também é um erro percebido pelo receptor
+        detectados = np.isin(resultados['status'], (STATUS_ERRO_DETECTADO, STATUS_QUADRO_INVALIDO))
+        for payload, (_, ini, fim), detectado in zip(payloads, resultados.tolist(), detectados.tolist()):
+            mensagem = mensagens[ini:fim]
+            if mensagem != payload:
+                erros_quadro += 1
+                nao_detectados += not detectado
+                bits_errados += bits_diferentes(mensagem, payload)
+        quadros += LOTE
+
+        if quadros >= quadros_min and erros_quadro >= ERROS_MINIMOS:
+            inferior, superior = intervalo_wilson(erros_quadro, quadros)
+            fer = erros_quadro / quadros
+            if (superior - inferior) / 2 <= alvo_ic * fer:
+                break
+    duracao = time.perf_counter() - inicio
+
+    inferior, superior = intervalo_wilson(erros_quadro, quadros)
+    bits = quadros * tamanho_payload * 8
+    return {
+        "enquadramento": enq_tipo,
+        "edc": err_tipo,
+        "m_bits": m_bits,
+        "taxa_erro": taxa,
+        "quadros": quadros,
+        "bits": bits,
+        "ber": bits_errados / bits,
+        "fer": erros_quadro / quadros,
+        "fer_ic_inf": inferior,
+        "fer_ic_sup": superior,
+        "taxa_nao_detectados": nao_detectados / quadros,
+        "quadros_por_segundo": quadros / duracao,
+    }
+
+
+def executar_varredura(enquadramentos=ENQUADRAMENTOS, edcs=EDCS, taxas=TAXAS, semente=0,
+                       processos: int = None, **opcoes) -> list:
+    """
+    Simula todos os pontos da grade em paralelo (ProcessPoolExecutor).
+    Cada ponto recebe uma semente própria derivada de `semente`, então o resultado
+    não depende da ordem em que os processos executam.
+    opcoes são repassadas a simular_ponto (tamanho_payload, quadros_max, ...).
+    """
+    grade = [(enq, err, m, taxa)
+             for enq, (err, m), taxa in itertools.product(enquadramentos, edcs, taxas)]
+    sementes = np.random.SeedSequence(semente).spawn(len(grade))
+    with ProcessPoolExecutor(max_workers=processos) as executor:
+        futuros = [executor.submit(simular_ponto, *ponto, semente_ponto, **opcoes)
+                   for ponto, semente_ponto in zip(grade, sementes)]
+        return [futuro.result() for futuro in futuros]
+
+
+# === VARREDURA DE Eb/N0 NA CAMADA FÍSICA ===
+
+def simular_modulacao(tipo_mod: str, eb_n0_db: float, semente, n_bits: int = 100_000,
+                      samples_per_bit: int = 16) -> dict:
+    """
+    Modula n_bits aleatórios, passa o sinal por um canal AWGN e demodula o quadro inteiro.
+    """
+    rng = np.random.default_rng(semente)
+    bits = rng.integers(0, 2, n_bits, dtype=np.uint8)
+    inicio = time.perf_counter()
+    _, sinal = MODULACOES[tipo_mod](bits, samples_per_bit=samples_per_bit)
+    ruidoso = canal_awgn(sinal, eb_n0_db, samples_per_bit / BITS_POR_SIMBOLO[tipo_mod], rng)
+    recebidos = DEMODULACOES[tipo_mod](ruidoso, samples_per_bit=samples_per_bit)[:n_bits]
+    duracao = time.perf_counter() - inicio
+    return {
+        "modulacao": tipo_mod,
+        "eb_n0_db": eb_n0_db,
+        "bits": n_bits,
+        "ber": float(np.mean(recebidos != bits)),
+        "bits_por_segundo": n_bits / duracao,
+    }
+
+
+def executar_varredura_eb_n0(modulacoes=list(MODULACOES), eb_n0s=(0, 2, 4, 6, 8, 10), semente=0,
+                             processos: int = None, **opcoes) -> list:
+    """
+    Simula cada par (modulação, Eb/N0) em paralelo, com sementes independentes.
+    opcoes são repassadas a simular_modulacao (n_bits, samples_per_bit).
+    """
+    grade = list(itertools.product(modulacoes, eb_n0s))
+    sementes = np.random.SeedSequence(semente).spawn(len(grade))
+    with ProcessPoolExecutor(max_workers=processos) as executor:
+        futuros = [executor.submit(simular_modulacao, *ponto, semente_ponto, **opcoes)
+                   for ponto, semente_ponto in zip(grade, sementes)]
+        return [futuro.result() for futuro in futuros]
+
+
+def salvar_resultados(resultados: list, caminho: str):
+    """
+    Salva os resultados em CSV ou, se o caminho terminar em .npz, como arrays NumPy
+    (uma coluna por campo).
+    """
+    campos = list(resultados[0]) if resultados else []
+    if caminho.endswith(".npz"):
+        np.savez(caminho, **{campo: np.array([r[campo] for r in resultados]) for campo in campos})
+    else:
+        with open(caminho, "w", newline="") as arquivo:
+            escritor = csv.DictWriter(arquivo, fieldnames=campos)
+            escritor.writeheader()
+            escritor.writerows(resultados)
+
+
+def _ler_edc(texto: str) -> tuple:
+    """Converte 'Paridade', 'Paridade 2D', 'CRC' ou 'Hamming:m' em (tipo, m_bits)."""
+    tipo, _, m = texto.partition(":")
+    return tipo, int(m) if m else (4 if tipo == "Hamming" else 0)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Varredura Monte Carlo de BER/FER.")
+    parser.add_argument("--enquadramentos", nargs="+", default=ENQUADRAMENTOS)
+    parser.add_argument("--edcs", nargs="+", default=[f"{t}:{m}" if t == "Hamming" else t for t, m in EDCS],
+                        help="Paridade, 'Paridade 2D', CRC ou Hamming:m")
+    parser.add_argument("--taxas", nargs="+", type=float, default=TAXAS)
+    parser.add_argument("--payload", type=int, default=32, help="bytes por quadro")
+    parser.add_argument("--quadros-max", type=int, default=20000)
+    parser.add_argument("--alvo-ic", type=float, default=0.1,
+                        help="meia largura relativa do IC 95%% do FER para parar")
+    parser.add_argument("--semente", type=int, default=0)
+    parser.add_argument("--processos", type=int, default=None)
+    parser.add_argument("--eb-n0", nargs="+", type=float, default=None,
+                        help="varre Eb/N0 (dB) na camada física em vez da camada de enlace")
+    parser.add_argument("--modulacoes", nargs="+", default=list(MODULACOES))
+    parser.add_argument("--bits", type=int, default=100_000, help="bits por ponto de Eb/N0")
+    parser.add_argument("--saida", default="varredura.csv", help="arquivo .csv ou .npz")
+    args = parser.parse_args()
+
+    if args.eb_n0 is not None:
+        resultados = executar_varredura_eb_n0(
+            args.modulacoes, args.eb_n0, semente=args.semente, processos=args.processos,
+            n_bits=args.bits)
+        print(f"{'Modulação':<10} {'Eb/N0 (dB)':>10} {'BER':>10} {'Bits/s':>12}")
+        for r in resultados:
+            print(f"{r['modulacao']:<10} {r['eb_n0_db']:>10.1f} {r['ber']:>10.2e} "
+                  f"{r['bits_por_segundo']:>12.0f}")
+        salvar_resultados(resultados, args.saida)
+        print(f"Resultados salvos em {args.saida}")
+        return
+
+    resultados = executar_varredura(
+        args.enquadramentos, [_ler_edc(e) for e in args.edcs], args.taxas,
+        semente=args.semente, processos=args.processos,
+        tamanho_payload=args.payload, quadros_max=args.quadros_max, alvo_ic=args.alvo_ic)
+
+    print(f"{'Enquadramento':<14} {'EDC':<12} {'Taxa':>8} {'Quadros':>8} {'BER':>10} "
+          f"{'FER':>10} {'Não det.':>10} {'Quadros/s':>10}")
+    for r in resultados:
+        edc = f"Hamming({r['m_bits']})" if r["edc"] == "Hamming" else r["edc"]
+        print(f"{r['enquadramento']:<14} {edc:<12} {r['taxa_erro']:>8.0e} {r['quadros']:>8} "
+              f"{r['ber']:>10.2e} {r['fer']:>10.2e} {r['taxa_nao_detectados']:>10.2e} "
+              f"{r['quadros_por_segundo']:>10.0f}")
+    salvar_resultados(resultados, args.saida)
+    print(f"Resultados salvos em {args.saida}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,243 @@
+# visualizador_onda.py
+import argparse
+import time
+import numpy as np
+
+# === VISUALIZAÇÃO DE SINAIS LONGOS (NÍVEIS DE DETALHE) ===
+#
+# Uma pirâmide guarda, para cada nível k, o mínimo e o máximo de cada bloco de 2^k
+# amostras. Para desenhar um trecho, escolhe-se o nível em que o trecho tem no máximo
+# um bloco por pixel e cada bloco vira um segmento vertical do mínimo ao máximo, de
+# modo que nenhum pico se perde e o número de pontos depende só da largura do gráfico.
+
+# Níveis são criados até restarem no máximo estes blocos
+BLOCOS_MINIMOS = 1024
+
+# Amostras lidas por vez ao montar o primeiro nível (sinais em np.memmap não são lidos inteiros)
+AMOSTRAS_POR_PARTE = 1 << 22
+
+# Sinais em disco começam a pirâmide em blocos de 2^NIVEL_INICIAL_MEMMAP amostras; os
+# níveis mais finos são calculados na hora, sobre o pequeno trecho visível
+NIVEL_INICIAL_MEMMAP = 4
+
+
+def _min_max_blocos(s, bloco: int) -> tuple:
+    """Mínimo e máximo de cada bloco de `bloco` amostras (o último pode ser menor)."""
+    n_blocos = -(-s.size // bloco)
+    minimos = np.empty(n_blocos, dtype=s.dtype)
+    maximos = np.empty(n_blocos, dtype=s.dtype)
+    passo = max(AMOSTRAS_POR_PARTE // bloco, 1) * bloco
+    for inicio in range(0, s.size, passo):
+        trecho = np.asarray(s[inicio:inicio + passo])
+        b = inicio // bloco
+        completos = trecho.size // bloco
+        if completos:
+            matriz = trecho[:completos * bloco].reshape(-1, bloco)
+            minimos[b:b + completos] = matriz.min(axis=1)
+            maximos[b:b + completos] = matriz.max(axis=1)
+        if trecho.size % bloco:
+            resto = trecho[completos * bloco:]
+            minimos[b + completos] = resto.min()
+            maximos[b + completos] = resto.max()
+    return minimos, maximos
+
+
+def _reduzir(minimos: np.ndarray, maximos: np.ndarray) -> tuple:
+    """Junta blocos vizinhos dois a dois (o último é repetido se sobrar)."""
+    if minimos.size % 2:
+        minimos = np.append(minimos, minimos[-1])
+        maximos = np.append(maximos, maximos[-1])
+    return minimos.reshape(-1, 2).min(axis=1), maximos.reshape(-1, 2).max(axis=1)
+
+
+class PiramideMinMax:
+    """
+    Pirâmide de mínimos/máximos de um sinal com amostras igualmente espaçadas.
+    Construída uma única vez; cada consulta custa O(pixels).
+
+    Os níveis abaixo de nivel_inicial não são guardados (são calculados na consulta),
+    o que reduz a memória da pirâmide de ~1x para ~2^(1 - nivel_inicial) vezes o sinal.
+    """
+
+    def __init__(self, t, s, nivel_inicial: int = 1):
+        t = np.asarray(t)
+        self._construir(s, float(t[0]) if t.size else 0.0,
+                        float(t[1] - t[0]) if t.size > 1 else 1.0, nivel_inicial)
+
+    @classmethod
+    def do_sinal(cls, sinal, nivel_inicial: int = None) -> "PiramideMinMax":
+        """Pirâmide de um Signal, sem montar o eixo de tempo."""
+        if nivel_inicial is None:
+            nivel_inicial = NIVEL_INICIAL_MEMMAP if isinstance(sinal.amostras, np.memmap) else 1
+        piramide = cls.__new__(cls)
+        piramide._construir(sinal.amostras, sinal.inicio, sinal.periodo_amostra, nivel_inicial)
+        return piramide
+
+    def _construir(self, s, t0: float, dt: float, nivel_inicial: int):
+        self.s = s if isinstance(s, np.ndarray) else np.asarray(s)
+        self.t0 = t0
+        self.dt = dt
+        self.nivel_inicial = max(nivel_inicial, 1)
+        # niveis[k - nivel_inicial] = (mínimos, máximos) dos blocos de 2^k amostras
+        self.niveis = []
+        if self.s.size > BLOCOS_MINIMOS:
+            minimos, maximos = _min_max_blocos(self.s, 1 << self.nivel_inicial)
+            self.niveis.append((minimos, maximos))
+            while minimos.size > BLOCOS_MINIMOS:
+                minimos, maximos = _reduzir(minimos, maximos)
+                self.niveis.append((minimos, maximos))
+
+    def __len__(self):
+        return self.s.size
+
+    @property
+    def limites_x(self) -> tuple:
+        return self.t0, self.t0 + self.dt * max(self.s.size - 1, 0)
+
+    @property
+    def limites_y(self) -> tuple:
+        if self.s.size == 0:
+            return -1.0, 1.0
+        if self.niveis:
+            minimos, maximos = self.niveis[-1]
+            return float(minimos.min()), float(maximos.max())
+        return float(self.s.min()), float(self.s.max())
+
+    @property
+    def nivel_maximo(self) -> int:
+        return self.nivel_inicial + len(self.niveis) - 1 if self.niveis else 0
+
+    def nivel_para(self, amostras: int, pixels: int) -> int:
+        """Menor nível em que `amostras` amostras ocupam no máximo um bloco por pixel."""
+        nivel = 0
+        while nivel < self.nivel_maximo and amostras > pixels << nivel:
+            nivel += 1
+        return nivel
+
+    def janela(self, x0: float, x1: float, pixels: int) -> tuple:
+        """
+        Pontos para desenhar o trecho [x0, x1] em uma área de `pixels` pixels de largura.
+
+        Returns:
+            (x, y, nível usado); no nível 0 os pontos são as próprias amostras.
+        """
+        n = self.s.size
+        i0 = max(int(np.floor((x0 - self.t0) / self.dt)), 0)
+        i1 = min(int(np.ceil((x1 - self.t0) / self.dt)) + 1, n)
+        if i1 <= i0:
+            return np.zeros(0), np.zeros(0), 0
+
+        # Até duas amostras por pixel o sinal é desenhado sem decimação
+        nivel = self.nivel_para(i1 - i0, max(int(pixels), 1) * 2)
+        if nivel == 0:
+            return self.t0 + self.dt * np.arange(i0, i1), self.s[i0:i1], 0
+
+        b0 = i0 >> nivel
+        b1 = -(-i1 >> nivel)
+        if nivel >= self.nivel_inicial:
+            minimos, maximos = self.niveis[nivel - self.nivel_inicial]
+            b1 = min(b1, minimos.size)
+            minimos, maximos = minimos[b0:b1], maximos[b0:b1]
+        else:
+            # Nível não guardado: calculado sobre o trecho visível
+            minimos, maximos = _min_max_blocos(self.s[b0 << nivel:b1 << nivel], 1 << nivel)
+            b1 = b0 + minimos.size
+        # Cada bloco vira um segmento vertical do mínimo ao máximo no início do bloco
+        x = np.repeat(self.t0 + self.dt * (np.arange(b0, b1) << nivel), 2)
+        y = np.empty(x.size, dtype=minimos.dtype)
+        y[0::2] = minimos
+        y[1::2] = maximos
+        return x, y, nivel
+
+
+class VisualizadorOnda:
+    """
+    Mantém uma linha do matplotlib sincronizada com a pirâmide: a cada zoom ou
+    deslocamento do eixo x, os pontos da linha são recalculados para o trecho visível.
+
+    degraus=True desenha as amostras em degraus (codificações de banda base) quando o
+    trecho visível é mostrado sem decimação.
+    """
+
+    def __init__(self, ax, linha=None):
+        self.ax = ax
+        self.linha = linha if linha is not None else ax.plot([], [])[0]
+        self.piramide = None
+        self.degraus = False
+        self.nivel = 0
+        ax.callbacks.connect('xlim_changed', self._atualizar)
+
+    def exibir(self, piramide: PiramideMinMax, degraus: bool = False):
+        """Mostra um novo sinal inteiro."""
+        self.piramide = piramide
+        self.degraus = degraus
+        y0, y1 = piramide.limites_y
+        margem = 0.1 * (y1 - y0 or 1.0)
+        self.ax.set_ylim(y0 - margem, y1 + margem)
+        # set_xlim dispara _atualizar
+        x0, x1 = piramide.limites_x
+        self.ax.set_xlim(x0, x1 if x1 > x0 else x0 + 1.0)
+
+    def _atualizar(self, ax):
+        if self.piramide is None:
+            return
+        x0, x1 = ax.get_xlim()
+        pixels = ax.get_window_extent().width
+        x, y, self.nivel = self.piramide.janela(x0, x1, pixels)
+        self.linha.set_drawstyle('steps-post' if self.degraus and self.nivel == 0 else 'default')
+        self.linha.set_data(x, y)
+
+
+def main():
+    from Camada_fisica import DTYPE_COMPACTO, MODULACOES
+    from buffer_bits import BitBuffer
+    from sinal import Signal
+
+    parser = argparse.ArgumentParser(description="Visualizador de sinais modulados longos.")
+    parser.add_argument("--modulacao", default="NRZ-Polar", choices=list(MODULACOES))
+    parser.add_argument("--bytes", type=int, default=12_500, help="tamanho do quadro aleatório")
+    parser.add_argument("--samples-per-bit", type=int, default=100)
+    parser.add_argument("--medir", action="store_true",
+                        help="só mede a construção da pirâmide e as consultas, sem janela")
+    parser.add_argument("--arquivo", metavar="SINAL.npy",
+                        help="abre um sinal gravado (mapeado do disco) em vez de modular")
+    args = parser.parse_args()
+
+    if args.arquivo:
+        sinal = Signal.carregar(args.arquivo, 1 / args.samples_per_bit)
+    else:
+        rng = np.random.default_rng(0)
+        bits = BitBuffer(rng.bytes(args.bytes))
+        sinal = MODULACOES[args.modulacao](bits, samples_per_bit=args.samples_per_bit,
+                                           dtype=DTYPE_COMPACTO[args.modulacao], retornar_sinal=True)
+
+    inicio = time.perf_counter()
+    piramide = PiramideMinMax.do_sinal(sinal)
+    construcao = time.perf_counter() - inicio
+    print(f"{len(sinal)} amostras {sinal.dtype}, {len(piramide.niveis)} níveis, "
+          f"pirâmide em {construcao * 1e3:.1f} ms")
+
+    if args.medir:
+        x0, x1 = piramide.limites_x
+        for fracao in (1.0, 0.1, 0.001, 0.00001):
+            largura = (x1 - x0) * fracao
+            inicio = time.perf_counter()
+            for i in range(100):
+                centro = x0 + (x1 - x0 - largura) * i / 100
+                x, _, nivel = piramide.janela(centro, centro + largura, 1600)
+            duracao = (time.perf_counter() - inicio) / 100
+            print(f"trecho {fracao:>8.5f} do sinal: nível {nivel:>2}, {x.size:>5} pontos, "
+                  f"{duracao * 1e6:.0f} us por consulta")
+        return
+
+    import matplotlib.pyplot as plt
+    figura, ax = plt.subplots(figsize=(10, 3))
+    ax.grid(True)
+    ax.set_title(f"Sinal modulado: {args.modulacao}")
+    visualizador = VisualizadorOnda(ax)
+    visualizador.exibir(piramide, degraus=args.modulacao in ("NRZ-Polar", "Manchester", "Bipolar"))
+    plt.show()
+
+
+if __name__ == "__main__":
+    main()